@@ -0,0 +1,103 @@
+"""Runs many scenario files across a process pool, writing each scenario's log to its own file.
+
+    python3 batchrunner.py SCENARIOS [SCENARIOS ...] [--output-dir DIR] [--workers N] [--cache-dir DIR]
+
+SCENARIOS may be directories or glob patterns. With --cache-dir, scenarios whose parsed topology and events
+were run before are copied from the result cache instead of being simulated again.
+"""
+import argparse
+import glob
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from devicesimulationmain import load_simulation
+from logsink import FileSink
+from resultcache import ResultCache, run_cached, DEFAULT_MAX_BYTES
+from scenariovalidator import check_scenario_file
+
+ScenarioResult = namedtuple('ScenarioResult', ['scenario_path', 'output_path', 'seconds', 'error', 'cached'],
+                            defaults=[False])
+
+def find_scenarios(patterns: list[str]) -> list[Path]:
+    """Expands directories and glob patterns into a sorted list of scenario files"""
+    scenario_paths = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            scenario_paths.extend(sorted(child for child in path.iterdir() if child.is_file()))
+        else:
+            scenario_paths.extend(sorted(Path(match) for match in glob.glob(pattern)) or [path])
+    return scenario_paths
+
+def run_scenario(scenario_path: Path, output_path: Path, cache_directory: Path = None,
+                 cache_bytes: int = DEFAULT_MAX_BYTES) -> ScenarioResult:
+    """Validates and runs one scenario into output_path, through the result cache when a directory is given,
+    catching failures so they can be reported"""
+    start = time.perf_counter()
+    error = None
+    cached = False
+    try:
+        if not scenario_path.is_file():
+            raise FileNotFoundError(f'no such scenario file: {scenario_path}')
+        check_scenario_file(scenario_path)
+        if cache_directory is not None:
+            with FileSink(output_path) as log_sink:
+                cached = run_cached(scenario_path, ResultCache(cache_directory, cache_bytes), log_sink)
+        else:
+            simulation = load_simulation(scenario_path)
+            with FileSink(output_path) as log_sink:
+                simulation.set_log_sink(log_sink)
+                simulation.run()
+    except Exception as exception:
+        error = f'{type(exception).__name__}: {exception}'
+    return ScenarioResult(scenario_path, output_path, time.perf_counter() - start, error, cached)
+
+def run_batch(scenario_paths: list[Path], output_directory: Path, workers: int = None, cache_directory: Path = None,
+              cache_bytes: int = DEFAULT_MAX_BYTES) -> list[ScenarioResult]:
+    """Runs every scenario across a pool of worker processes and returns the results in input order"""
+    output_paths = [output_directory / f'{scenario_path.stem}.log' for scenario_path in scenario_paths]
+    if len(set(output_paths)) != len(output_paths):
+        raise ValueError('scenario file names must be unique, since each log is named after its scenario')
+    output_directory.mkdir(parents=True, exist_ok=True)
+
+    results = [None] * len(scenario_paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_scenario, scenario_path, output_path, cache_directory, cache_bytes): index
+                   for index, (scenario_path, output_path) in enumerate(zip(scenario_paths, output_paths))}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as exception:
+                results[index] = ScenarioResult(scenario_paths[index], output_paths[index], 0.0,
+                                                f'{type(exception).__name__}: {exception}')
+    return results
+
+def main(argv: list[str] = None) -> int:
+    """Runs the batch from the command line and prints a per-scenario report"""
+    parser = argparse.ArgumentParser(description='Run many simulation scenarios in parallel.')
+    parser.add_argument('scenarios', nargs='+', help='scenario files, directories or glob patterns')
+    parser.add_argument('--output-dir', type=Path, default=Path('logs'), help='directory for the per-scenario logs')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache-dir', type=Path, default=None, help='result cache directory (default: no cache)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // 1024 ** 2,
+                        help='result cache size limit in MiB (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run_batch(find_scenarios(args.scenarios), args.output_dir, args.workers, args.cache_dir,
+                        args.cache_size * 1024 ** 2)
+    for result in results:
+        if result.error is None:
+            source = ' (cached)' if result.cached else ''
+            print(f'OK   {result.scenario_path} {result.seconds:.3f}s{source} -> {result.output_path}')
+        else:
+            print(f'FAIL {result.scenario_path} {result.seconds:.3f}s: {result.error}')
+
+    failures = sum(result.error is not None for result in results)
+    print(f'{len(results) - failures} succeeded, {failures} failed')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
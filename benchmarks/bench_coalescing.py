@@ -0,0 +1,56 @@
+"""Compares EventScheduler with CoalescingScheduler, which holds identical pending alert deliveries as one
+entry, checking that both write the same log and reporting the largest queue each one held.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_coalescing
+"""
+import time
+from logsink import CountingSink, MemorySink
+from benchmarks.generators import SHAPES, build_simulation
+
+
+def _time_run(scenario, coalesce: bool, repeat: int = 3) -> float:
+    """Gets the best time"""
+    timings = []
+    for _ in range(repeat):
+        simulation = build_simulation(scenario, CountingSink())
+        simulation.set_coalescing(coalesce)
+        start = time.perf_counter()
+        simulation.run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _largest_queue(scenario, coalesce: bool) -> (int, list[str]):
+    """Gets the largest number of queue entries seen between steps and the log, in a separate untimed run"""
+    log_sink = MemorySink()
+    simulation = build_simulation(scenario, log_sink)
+    simulation.set_coalescing(coalesce)
+    event_queue = simulation.get_event_queue()
+    largest = len(event_queue)
+    while event_queue and event_queue.peek_time() < scenario.simulation_length:
+        event_queue.pop().execute(event_queue, log_sink)
+        largest = max(largest, len(event_queue))
+    return largest, log_sink.get_lines()
+
+
+def main() -> None:
+    cases = [('dense_cycle', 1000, 7), ('dense_cycle', 200, 9), ('random', 1000, 40), ('ring', 1000, 5000)]
+    print(f'{"shape":>12} {"devices":>8} {"length":>7} {"plain (s)":>10} {"coalesced (s)":>14} {"speedup":>8} '
+          f'{"plain queue":>12} {"coalesced queue":>16}')
+    for shape, device_count, simulation_length in cases:
+        scenario = SHAPES[shape](device_count, simulation_length, alert_count=5, cancel_ratio=0.5,
+                                 description_count=2)
+        plain_queue, plain_log = _largest_queue(scenario, False)
+        coalesced_queue, coalesced_log = _largest_queue(scenario, True)
+        assert coalesced_log == plain_log, f'{shape}: logs differ'
+        del plain_log, coalesced_log
+        plain = _time_run(scenario, False)
+        coalesced = _time_run(scenario, True)
+        print(f'{shape:>12} {device_count:>8} {simulation_length:>7} {plain:>10.3f} {coalesced:>14.3f} '
+              f'{plain / coalesced:>7.2f}x {plain_queue:>12} {coalesced_queue:>16}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Compares loading a large topology from its text scenario and from the compiled binary file.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_compiled
+"""
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+from compiledscenario import compile_scenario, load_compiled_simulation
+from devicesimulationmain import load_simulation
+from benchmarks.generators import random_graph, write_scenario
+
+
+def _best_time(load, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    print(f'{"devices":>8} {"rules":>9} {"text (s)":>9} {"compiled (s)":>13} {"speedup":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        for device_count in [10000, 100000, 500000]:
+            scenario_path = Path(directory) / 'scenario.txt'
+            compiled_path = Path(directory) / 'scenario.bin'
+            write_scenario(random_graph(device_count, 100, degree=8, alert_count=10, cancel_ratio=0.5),
+                           scenario_path)
+            compile_scenario(scenario_path, compiled_path)
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                text = _best_time(lambda: load_simulation(scenario_path))
+            compiled = _best_time(lambda: load_compiled_simulation(compiled_path))
+            print(f'{device_count:>8} {device_count * 8:>9} {text:>9.3f} {compiled:>13.3f} {text / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""Compares run_simulation with running each description's events in its own worker, on random graphs with
+several independent descriptions.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_description
+"""
+import os
+from descriptionengine import run_description_simulation
+from devicesimulationmain import run_simulation
+from benchmarks.generators import random_graph
+from benchmarks.run import time_engine
+
+
+def main(device_count: int = 2000, simulation_length: int = 40) -> None:
+    scenario = random_graph(device_count, simulation_length, alert_count=16, cancel_ratio=0.5, description_count=8)
+    sequential = time_engine(scenario, run_simulation)
+    print(f'{os.cpu_count()} CPUs')
+    print(f'{"workers":>8} {"seconds":>8} {"speedup":>8}')
+    print(f'{"1":>8} {sequential:>8.3f} {"1.0x":>8}')
+    for workers in [2, 4, 8]:
+        seconds = time_engine(scenario, run_description_simulation, workers=workers)
+        print(f'{workers:>8} {seconds:>8.3f} {sequential / seconds:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Measures the memory held by in-flight events with the old __dict__ layout and the current __slots__ layout.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_event_memory [event_count]
+"""
+import sys
+import tracemalloc
+from device import Device
+from event import Event, PHASE_RECEIVE
+
+
+class _DictEvent:
+    """The Event layout before __slots__: a per-instance __dict__ and the phase kept as a string"""
+    def __init__(self, sender, receiver, event_type, description, time, phase):
+        self._sender = sender
+        self._receiver = receiver
+        self._event_type = event_type
+        self._description = description
+        self._time = time
+        self._phase = phase
+
+
+def _measure(make_event, event_count: int) -> int:
+    """Gets the bytes allocated while keeping event_count events alive"""
+    sender = Device(1, event_count)
+    receiver = Device(2, event_count)
+    tracemalloc.start()
+    events = [make_event(sender, receiver, 'ALERT', 'Trouble', time) for time in range(event_count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return allocated
+
+
+def main(event_count: int = 1000000) -> None:
+    layouts = [
+        ('dict', lambda sender, receiver, event_type, description, time:
+            _DictEvent(sender, receiver, event_type, description, time, 'R')),
+        ('slots', lambda sender, receiver, event_type, description, time:
+            Event(sender, receiver, event_type, description, time, PHASE_RECEIVE)),
+    ]
+    print(f'{event_count} in-flight events')
+    for name, make_event in layouts:
+        allocated = _measure(make_event, event_count)
+        print(f'{name:>6} {allocated / 2 ** 20:8.1f} MiB {allocated / event_count:6.1f} bytes/event')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
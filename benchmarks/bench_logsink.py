@@ -0,0 +1,41 @@
+"""Compares log sinks on the same run, with standard output pointed at os.devnull.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_logsink
+"""
+import contextlib
+import os
+import time
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+from logsink import StdoutSink, BufferedTextSink, NullSink, MemorySink
+
+
+def _build_chain(device_count: int) -> (int, list[Event]):
+    """Builds a chain of devices, giving a SENT and a RECEIVED line per hop"""
+    simulation_length = device_count + 10
+    devices = [Device(device_id, simulation_length) for device_id in range(device_count)]
+    for device, next_device in zip(devices, devices[1:]):
+        device.add_recipient(next_device, 1)
+    return simulation_length, [Event(None, devices[0], 'ALERT', 'Chain', 0, 'S')]
+
+
+def main(device_count: int = 200000) -> None:
+    sinks = [('print per line', StdoutSink), ('buffered', BufferedTextSink), ('null', NullSink),
+             ('memory', MemorySink)]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        timings = []
+        for name, sink_class in sinks:
+            simulation_length, event_list = _build_chain(device_count)
+            start = time.perf_counter()
+            run_simulation(simulation_length, event_list, sink_class())
+            timings.append((name, time.perf_counter() - start))
+
+    for name, seconds in timings:
+        print(f'{name:>16} {seconds:8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
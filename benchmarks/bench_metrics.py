@@ -0,0 +1,40 @@
+"""Compares a full log with the metrics-only run, which aggregates events instead of formatting them, and
+with a sink that only counts events.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_metrics
+"""
+import os
+import time
+from logsink import BufferedTextSink, CountingSink
+from metrics import MetricsSink
+from benchmarks.generators import SHAPES, build_simulation
+
+
+def _time_run(scenario, make_sink, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        with open(os.devnull, 'w') as devnull:
+            simulation = build_simulation(scenario, make_sink(devnull))
+            start = time.perf_counter()
+            simulation.run()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    cases = [('ring', 1000, 100000), ('random', 2000, 40), ('dense_cycle', 1000, 7)]
+    sinks = [('full log', lambda devnull: BufferedTextSink(devnull)), ('metrics', lambda devnull: MetricsSink()),
+             ('counting', lambda devnull: CountingSink())]
+    print(f'{"shape":>12} ' + ' '.join(f'{name + " (s)":>13}' for name, _ in sinks) + f' {"metrics speedup":>16}')
+    for shape, device_count, simulation_length in cases:
+        scenario = SHAPES[shape](device_count, simulation_length, alert_count=5, cancel_ratio=0.5,
+                                 description_count=2)
+        timings = [_time_run(scenario, make_sink) for _, make_sink in sinks]
+        print(f'{shape:>12} ' + ' '.join(f'{seconds:>13.3f}' for seconds in timings) +
+              f' {timings[0] / timings[1]:>15.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Compares run_simulation with the NumPy engine on dense cyclic alert-only graphs.
+
+Requires NumPy. Run from the repository root:
+
+    python3 -m benchmarks.bench_numpy_engine
+"""
+import os
+import random
+import time
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+from logsink import BufferedTextSink
+from numpyengine import run_numpy_simulation
+
+
+def _build_dense_cycle(device_count: int, degree: int, simulation_length: int, seed: int = 1) -> list[Event]:
+    """Builds devices that each forward to `degree` random others with delays of 1 to 3"""
+    generator = random.Random(seed)
+    devices = [Device(device_id, simulation_length) for device_id in range(device_count)]
+    for device in devices:
+        for receiver in generator.sample(devices, degree):
+            device.add_recipient(receiver, generator.randint(1, 3))
+    return [Event(None, devices[0], 'ALERT', 'Storm', 0, 'S'), Event(None, devices[1], 'ALERT', 'Flood', 1, 'S')]
+
+
+def main() -> None:
+    print(f'{"devices":>8} {"degree":>7} {"length":>7} {"object (s)":>11} {"numpy (s)":>10} {"speedup":>8}')
+    with open(os.devnull, 'w') as devnull:
+        for device_count, degree, simulation_length in [(50, 4, 12), (200, 8, 8), (1000, 16, 6), (5000, 32, 5)]:
+            timings = []
+            for runner in [run_simulation, run_numpy_simulation]:
+                event_list = _build_dense_cycle(device_count, degree, simulation_length)
+                start = time.perf_counter()
+                runner(simulation_length, event_list, BufferedTextSink(devnull))
+                timings.append(time.perf_counter() - start)
+            print(f'{device_count:>8} {degree:>7} {simulation_length:>7} {timings[0]:>11.3f} {timings[1]:>10.3f} '
+                  f'{timings[0] / timings[1]:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
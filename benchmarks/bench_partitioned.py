@@ -0,0 +1,28 @@
+"""Compares run_simulation with the partitioned engine on clustered graphs, where most traffic stays inside a
+partition and the bridges between clusters have a long delay.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_partitioned
+"""
+import os
+from devicesimulationmain import run_simulation
+from partitionedengine import run_partitioned_simulation
+from benchmarks.generators import clustered
+from benchmarks.run import time_engine
+
+
+def main(device_count: int = 4000, simulation_length: int = 5000) -> None:
+    scenario = clustered(device_count, simulation_length, cluster_count=8, alert_count=40, description_count=4,
+                         bridge_delay=100)
+    sequential = time_engine(scenario, run_simulation)
+    print(f'{os.cpu_count()} CPUs')
+    print(f'{"workers":>8} {"seconds":>8} {"speedup":>8}')
+    print(f'{"1":>8} {sequential:>8.3f} {"1.0x":>8}')
+    for workers in [2, 4, 8]:
+        seconds = time_engine(scenario, run_partitioned_simulation, workers=workers)
+        print(f'{workers:>8} {seconds:>8.3f} {sequential / seconds:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Checks that a run without a profiler costs the same as the loop before instrumentation existed, and shows
+what profiling costs when it is switched on.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_profiler
+"""
+import time
+from logsink import CountingSink
+from profiler import SimulationProfiler
+from benchmarks.generators import SHAPES, build_simulation
+
+
+def _run_uninstrumented(simulation) -> None:
+    """Simulation.run as it was before profilers"""
+    event_queue = simulation.get_event_queue()
+    log_sink = simulation.get_log_sink()
+    simulation_length = simulation.get_simulation_length()
+
+    while event_queue:
+        current_event = event_queue.pop()
+
+        if current_event.get_time() >= simulation_length:
+            break
+        current_event.execute(event_queue, log_sink)
+
+    log_sink.write_end(simulation_length)
+    log_sink.flush()
+
+
+def _time_run(scenario, mode: str, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        simulation = build_simulation(scenario, CountingSink())
+        if mode == 'profiled':
+            simulation.set_profiler(SimulationProfiler())
+        start = time.perf_counter()
+        if mode == 'uninstrumented':
+            _run_uninstrumented(simulation)
+        else:
+            simulation.run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    cases = [('ring', 1000, 100000), ('random', 2000, 40), ('dense_cycle', 1000, 7)]
+    print(f'{"shape":>12} {"uninstrumented (s)":>19} {"disabled (s)":>13} {"overhead":>9} {"profiled (s)":>13}')
+    for shape, device_count, simulation_length in cases:
+        scenario = SHAPES[shape](device_count, simulation_length, alert_count=5, cancel_ratio=0.2)
+        uninstrumented = _time_run(scenario, 'uninstrumented')
+        disabled = _time_run(scenario, 'disabled')
+        profiled = _time_run(scenario, 'profiled')
+        print(f'{shape:>12} {uninstrumented:>19.3f} {disabled:>13.3f} {disabled / uninstrumented - 1:>8.1%} '
+              f'{profiled:>13.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compares the heap scheduler with the old re-sort + pop(0) loop as the number of pending events grows.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_scheduler
+"""
+import contextlib
+import io
+import time
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+
+
+def _run_legacy(simulation_length: int, event_list: list[Event]) -> None:
+    """The run_simulation loop as it was before EventScheduler"""
+    event_queue = sorted(event_list, key=lambda e: e.get_time())
+
+    while event_queue:
+        event_queue.sort(key=lambda e: (e.get_time(), 0 if e.get_event_type() == 'ALERT' else 1))
+        current_event = event_queue.pop(0)
+
+        if current_event.get_time() >= simulation_length:
+            break
+        current_event.execute(event_queue)
+
+    print(f'@{simulation_length}: END')
+
+
+def _build_fan_out(event_count: int) -> (int, list[Event]):
+    """Builds a hub that fans an alert out to event_count devices, all of them pending at once"""
+    simulation_length = event_count + 10
+    hub = Device(0, simulation_length)
+    for device_id in range(1, event_count + 1):
+        hub.add_recipient(Device(device_id, simulation_length), device_id)
+    return simulation_length, [Event(None, hub, 'ALERT', 'Fanout', 0, 'S')]
+
+
+def _time_run(runner, event_count: int) -> float:
+    simulation_length, event_list = _build_fan_out(event_count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        runner(simulation_length, event_list)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f'{"events":>8} {"legacy (s)":>12} {"heap (s)":>10}')
+    for event_count in [500, 1000, 2000, 4000, 8000, 16000, 64000, 256000]:
+        legacy = f'{_time_run(_run_legacy, event_count):.3f}' if event_count <= 4000 else '-'
+        heap = _time_run(run_simulation, event_count)
+        print(f'{event_count:>8} {legacy:>12} {heap:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Synthetic scenario generators for benchmarking.
+
+Every generator returns a SyntheticScenario, which can be written out as a scenario file or built straight
+into a Simulation without going through the parser.
+"""
+import random
+from collections import namedtuple
+from pathlib import Path
+from logsink import LogSink
+from simulation import Simulation
+from topology import Topology
+
+#rules are (sender id, receiver id, delay); events are ('ALERT' or 'CANCEL', device id, description, time)
+SyntheticScenario = namedtuple('SyntheticScenario', ['simulation_length', 'device_ids', 'rules', 'events'])
+
+def _seed_events(generator: random.Random, origin_ids: list[int], device_ids: list[int], simulation_length: int,
+                 alert_count: int, cancel_ratio: float, description_count: int) -> list[tuple]:
+    """Picks alert origins and times, then cancels a share of the alerts somewhere later in the run"""
+    events = []
+    for _ in range(alert_count):
+        description = f'Event{generator.randrange(description_count)}'
+        time = generator.randrange(max(simulation_length // 4, 1))
+        events.append(('ALERT', generator.choice(origin_ids), description, time))
+        if generator.random() < cancel_ratio:
+            cancel_time = generator.randrange(time, max(simulation_length, time + 1))
+            events.append(('CANCEL', generator.choice(device_ids), description, cancel_time))
+    return events
+
+def _scenario(generator: random.Random, device_count: int, rules: list[tuple], simulation_length: int,
+              alert_count: int, cancel_ratio: float, description_count: int,
+              origin_ids: list[int] = None) -> SyntheticScenario:
+    device_ids = list(range(1, device_count + 1))
+    events = _seed_events(generator, origin_ids or device_ids, device_ids, simulation_length, alert_count,
+                          cancel_ratio, description_count)
+    return SyntheticScenario(simulation_length, device_ids, rules, events)
+
+def ring(device_count: int, simulation_length: int, alert_count: int = 1, cancel_ratio: float = 0.0,
+         description_count: int = 1, max_delay: int = 10, seed: int = 0) -> SyntheticScenario:
+    """Each device forwards to the next one, and the last forwards back to the first"""
+    generator = random.Random(seed)
+    rules = [(device_id, device_id % device_count + 1, generator.randint(1, max_delay))
+             for device_id in range(1, device_count + 1)]
+    return _scenario(generator, device_count, rules, simulation_length, alert_count, cancel_ratio, description_count)
+
+def star(device_count: int, simulation_length: int, alert_count: int = 1, cancel_ratio: float = 0.0,
+         description_count: int = 1, max_delay: int = 10, bidirectional: bool = False,
+         seed: int = 0) -> SyntheticScenario:
+    """Device 1 is a hub forwarding to every other device; with bidirectional the leaves also forward back.
+    Alerts start at the hub."""
+    generator = random.Random(seed)
+    rules = []
+    for device_id in range(2, device_count + 1):
+        rules.append((1, device_id, generator.randint(1, max_delay)))
+        if bidirectional:
+            rules.append((device_id, 1, generator.randint(1, max_delay)))
+    return _scenario(generator, device_count, rules, simulation_length, alert_count, cancel_ratio, description_count,
+                     origin_ids=[1])
+
+def random_graph(device_count: int, simulation_length: int, degree: int = 3, alert_count: int = 1,
+                 cancel_ratio: float = 0.0, description_count: int = 1, max_delay: int = 10,
+                 seed: int = 0) -> SyntheticScenario:
+    """Each device forwards to `degree` distinct random other devices"""
+    generator = random.Random(seed)
+    rules = []
+    for device_id in range(1, device_count + 1):
+        others = generator.sample(range(1, device_count), min(degree, device_count - 1))
+        for other in others:
+            receiver_id = other if other < device_id else other + 1
+            rules.append((device_id, receiver_id, generator.randint(1, max_delay)))
+    return _scenario(generator, device_count, rules, simulation_length, alert_count, cancel_ratio, description_count)
+
+def scale_free(device_count: int, simulation_length: int, edges_per_device: int = 2, alert_count: int = 1,
+               cancel_ratio: float = 0.0, description_count: int = 1, max_delay: int = 10,
+               seed: int = 0) -> SyntheticScenario:
+    """Preferential attachment: each new device links both ways with existing devices picked in proportion
+    to how many links they already have"""
+    generator = random.Random(seed)
+    rules = []
+    endpoints = [1]
+    for device_id in range(2, device_count + 1):
+        targets = {generator.choice(endpoints) for _ in range(edges_per_device)}
+        for target in sorted(targets):
+            rules.append((device_id, target, generator.randint(1, max_delay)))
+            rules.append((target, device_id, generator.randint(1, max_delay)))
+            endpoints.extend([device_id, target])
+    return _scenario(generator, device_count, rules, simulation_length, alert_count, cancel_ratio, description_count)
+
+def dense_cycle(device_count: int, simulation_length: int, degree: int = 8, alert_count: int = 1,
+                cancel_ratio: float = 0.0, description_count: int = 1, max_delay: int = 3,
+                seed: int = 0) -> SyntheticScenario:
+    """A random graph with many short cycles and small delays, where events multiply quickly"""
+    return random_graph(device_count, simulation_length, degree, alert_count, cancel_ratio, description_count,
+                        max_delay, seed)
+
+def clustered(device_count: int, simulation_length: int, cluster_count: int = 4, alert_count: int = 1,
+              cancel_ratio: float = 0.0, description_count: int = 1, max_delay: int = 10, bridge_delay: int = 50,
+              seed: int = 0) -> SyntheticScenario:
+    """Clusters of consecutive devices, each a ring, joined in a ring of clusters by one slow bridge each. Work stays
+    local, which suits the partitioned engine."""
+    generator = random.Random(seed)
+    rules = []
+    cluster_size = max(device_count // cluster_count, 1)
+    cluster_starts = list(range(1, device_count + 1, cluster_size))
+    for start in cluster_starts:
+        cluster_ids = list(range(start, min(start + cluster_size, device_count + 1)))
+        for position, device_id in enumerate(cluster_ids):
+            rules.append((device_id, cluster_ids[(position + 1) % len(cluster_ids)], generator.randint(1, max_delay)))
+    for start, next_start in zip(cluster_starts, cluster_starts[1:] + cluster_starts[:1]):
+        if start != next_start:
+            rules.append((start, next_start, bridge_delay))
+    return _scenario(generator, device_count, rules, simulation_length, alert_count, cancel_ratio, description_count)
+
+SHAPES = {
+    'ring': ring,
+    'star': star,
+    'random': random_graph,
+    'scale_free': scale_free,
+    'dense_cycle': dense_cycle,
+    'clustered': clustered,
+}
+
+def to_topology(scenario: SyntheticScenario) -> Topology:
+    """Feeds the scenario into a Topology, as the parser would"""
+    topology = Topology()
+    topology.set_simulation_length(scenario.simulation_length)
+    for device_id in scenario.device_ids:
+        topology.add_device(device_id)
+    for sender_id, receiver_id, delay in scenario.rules:
+        topology.add_rule(sender_id, receiver_id, delay)
+    for keyword, device_id, description, time in scenario.events:
+        topology.add_start_event(device_id, 'ALERT' if keyword == 'ALERT' else 'CANCELLATION', description, time)
+    return topology
+
+def build_simulation(scenario: SyntheticScenario, log_sink: LogSink = None) -> Simulation:
+    """Builds the scenario in memory as a Simulation with its start events scheduled"""
+    return to_topology(scenario).build_simulation(log_sink)
+
+def write_scenario(scenario: SyntheticScenario, file_path: Path) -> None:
+    """Writes the scenario in the input file format"""
+    with open(file_path, 'w') as file:
+        file.write(f'LENGTH {scenario.simulation_length}\n')
+        file.writelines(f'DEVICE {device_id}\n' for device_id in scenario.device_ids)
+        file.writelines(f'PROPAGATE {sender_id} {receiver_id} {delay}\n'
+                        for sender_id, receiver_id, delay in scenario.rules)
+        file.writelines(f'{keyword} {device_id} {description} {time}\n'
+                        for keyword, device_id, description, time in scenario.events)
@@ -0,0 +1,99 @@
+"""Times parse_input_file and run_simulation on synthetic scenarios and writes the results as JSON.
+
+Run from the repository root:
+
+    python3 -m benchmarks.run --output results.json
+    python3 -m benchmarks.run --shapes ring star --devices 1000 10000 --length 5000 --cancel-ratio 0.2
+
+Results record the git commit and Python version, so files from different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from devicesimulationmain import parse_input_file, run_simulation
+from logsink import BufferedTextSink, CountingSink
+from benchmarks.generators import SHAPES, SyntheticScenario, to_topology, write_scenario
+
+#Lengths that keep each shape's default run to a second or less
+DEFAULT_LENGTHS = {'ring': 20000, 'star': 200, 'random': 40, 'scale_free': 14, 'dense_cycle': 7, 'clustered': 1000}
+
+def _git_commit() -> str or None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def time_scenario(shape: str, device_count: int, simulation_length: int, alert_count: int, cancel_ratio: float,
+                  repeat: int, seed: int) -> dict:
+    """Generates one scenario and records the best parse and run times over `repeat` attempts"""
+    scenario = SHAPES[shape](device_count, simulation_length, alert_count=alert_count, cancel_ratio=cancel_ratio,
+                             seed=seed)
+    parse_seconds = []
+    run_seconds = []
+    with tempfile.TemporaryDirectory() as directory:
+        scenario_path = Path(directory) / f'{shape}.txt'
+        write_scenario(scenario, scenario_path)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parsed_length, _, event_list = parse_input_file(scenario_path)
+            parse_seconds.append(time.perf_counter() - start)
+
+            log_sink = CountingSink()
+            start = time.perf_counter()
+            run_simulation(parsed_length, event_list, log_sink)
+            run_seconds.append(time.perf_counter() - start)
+
+    return {
+        'shape': shape,
+        'devices': device_count,
+        'rules': len(scenario.rules),
+        'alerts': sum(keyword == 'ALERT' for keyword, *_ in scenario.events),
+        'cancels': sum(keyword == 'CANCEL' for keyword, *_ in scenario.events),
+        'length': simulation_length,
+        'seed': seed,
+        'log_lines': log_sink.get_event_count(),
+        'parse_seconds': min(parse_seconds),
+        'run_seconds': min(run_seconds),
+    }
+
+def time_engine(scenario: SyntheticScenario, run_engine, **options) -> float:
+    """Times a run writing the full log to os.devnull, since the process engines format every line either way"""
+    simulation_length, _, event_list = to_topology(scenario).build()
+    with open(os.devnull, 'w') as devnull:
+        start = time.perf_counter()
+        run_engine(simulation_length, event_list, BufferedTextSink(devnull), **options)
+        return time.perf_counter() - start
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark parsing and simulation on synthetic topologies.')
+    parser.add_argument('--shapes', nargs='+', choices=sorted(SHAPES), default=sorted(SHAPES))
+    parser.add_argument('--devices', nargs='+', type=int, default=[1000])
+    parser.add_argument('--length', type=int, default=None, help='simulation length (default: per shape)')
+    parser.add_argument('--alerts', type=int, default=5)
+    parser.add_argument('--cancel-ratio', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=None, help='JSON results file (default: standard output)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for shape in args.shapes:
+        for device_count in args.devices:
+            simulation_length = args.length if args.length is not None else DEFAULT_LENGTHS[shape]
+            results.append(time_scenario(shape, device_count, simulation_length, args.alerts, args.cancel_ratio,
+                                         args.repeat, args.seed))
+
+    report = json.dumps({'commit': _git_commit(), 'python': platform.python_version(), 'results': results}, indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Saves a paused simulation to a compact file and restores it, so long runs can be interrupted and extended.
+
+    simulation.run(until=5000000)
+    save_checkpoint(simulation, 'run.ckpt')
+    ...
+    load_checkpoint('run.ckpt', log_sink, simulation_length=20000000).run()
+
+A checkpoint holds the simulation length, the device graph as CSR arrays, every device's cancellation table
+and online state, and the pending queue, including topology changes, with its tie-break sequence numbers.
+Resuming writes exactly the lines an uninterrupted run would have written after the checkpoint.
+"""
+import gzip
+import json
+from pathlib import Path
+from device import Device
+from event import Event
+from logsink import LogSink
+from simulation import Simulation
+from topologychange import TopologyChange, CHANGE_TYPES
+
+CHECKPOINT_VERSION = 2
+#Version 1 checkpoints predate topology changes and load with none pending and every device online
+_READABLE_VERSIONS = (1, 2)
+_EVENT_TYPES = ('ALERT', 'CANCELLATION')
+
+def save_checkpoint(simulation: Simulation, file_path: Path) -> None:
+    """Writes the simulation's devices, cancellations and pending events to a gzip-compressed file"""
+    devices = simulation.get_devices()
+    index_by_device = {id(device): index for index, device in enumerate(devices)}
+    descriptions = {}
+
+    def description_index(description: str) -> int:
+        return descriptions.setdefault(description, len(descriptions))
+
+    def device_index(device: Device or None) -> int:
+        if device is None:
+            return -1
+        if id(device) not in index_by_device:
+            raise ValueError(f'device #{device.get_device_id()} does not belong to the simulation')
+        return index_by_device[id(device)]
+
+    offsets = [0]
+    receivers = []
+    delays = []
+    cancellations = []
+    for index, device in enumerate(devices):
+        for recipient, delay in device.get_recipients():
+            receivers.append(device_index(recipient))
+            delays.append(delay)
+        offsets.append(len(receivers))
+        for description, time in device.get_cancelled_descriptions():
+            cancellations.append([index, description_index(description), time])
+
+    event_queue = simulation.get_event_queue()
+    events = []
+    changes = []
+    for sequence, event in sorted(event_queue.get_sequenced_events(), key=lambda entry: entry[0]):
+        if isinstance(event, TopologyChange):
+            changes.append([sequence, event.get_time(), CHANGE_TYPES.index(event.get_event_type()),
+                            device_index(event.get_device()), device_index(event.get_receiver()), event.get_delay()])
+        else:
+            events.append([sequence, event.get_time(), device_index(event.get_sender()),
+                           device_index(event.get_receiver()), _EVENT_TYPES.index(event.get_event_type()),
+                           description_index(event.get_description()), event.get_phase()])
+
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'simulation_length': simulation.get_simulation_length(),
+        'device_ids': [device.get_device_id() for device in devices],
+        'offsets': offsets,
+        'receivers': receivers,
+        'delays': delays,
+        'descriptions': list(descriptions),
+        'cancellations': cancellations,
+        'next_sequence': event_queue.get_next_sequence(),
+        'events': events,
+        'changes': changes,
+        'offline': [index for index, device in enumerate(devices) if not device.is_online()],
+    }
+    with gzip.open(file_path, 'wt') as file:
+        json.dump(checkpoint, file, separators=(',', ':'))
+
+def load_checkpoint(file_path: Path, log_sink: LogSink = None, simulation_length: int = None) -> Simulation:
+    """Rebuilds a simulation from a checkpoint, optionally with a new simulation length to extend the run"""
+    with gzip.open(file_path, 'rt') as file:
+        checkpoint = json.load(file)
+    if checkpoint.get('version') not in _READABLE_VERSIONS:
+        raise ValueError(f'unsupported checkpoint version {checkpoint.get("version")!r}')
+
+    if simulation_length is None:
+        simulation_length = checkpoint['simulation_length']
+    simulation = Simulation(simulation_length, log_sink)
+    devices = [Device(device_id, simulation) for device_id in checkpoint['device_ids']]
+    offsets = checkpoint['offsets']
+    receivers = checkpoint['receivers']
+    delays = checkpoint['delays']
+    for index, device in enumerate(devices):
+        for edge in range(offsets[index], offsets[index + 1]):
+            device.add_recipient(devices[receivers[edge]], delays[edge])
+
+    descriptions = checkpoint['descriptions']
+    for index, description_index, time in checkpoint['cancellations']:
+        devices[index].add_cancelled_description(descriptions[description_index], time)
+    for index in checkpoint.get('offline', []):
+        devices[index].set_online(False)
+
+    sequenced_events = []
+    for sequence, time, sender_index, receiver_index, type_code, description_index, phase in checkpoint['events']:
+        sender = devices[sender_index] if sender_index >= 0 else None
+        sequenced_events.append((sequence, Event(sender, devices[receiver_index], _EVENT_TYPES[type_code],
+                                                 descriptions[description_index], time, phase)))
+    for sequence, time, type_code, device_index, receiver_index, delay in checkpoint.get('changes', []):
+        receiver = devices[receiver_index] if receiver_index >= 0 else None
+        sequenced_events.append((sequence, TopologyChange(CHANGE_TYPES[type_code], devices[device_index], receiver,
+                                                          delay, time)))
+    simulation.get_event_queue().restore(sequenced_events, checkpoint['next_sequence'])
+    return simulation
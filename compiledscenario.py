@@ -0,0 +1,171 @@
+"""Compiles a text scenario into a binary file that loads without any parsing.
+
+    python3 compiledscenario.py scenario.txt scenario.bin
+
+The file is a fixed header followed by little-endian int64 arrays:
+
+    header          magic, simulation length, device count, edge count, start event count, topology change count,
+                    description bytes
+    device_ids      one per device, in declaration order
+    offsets         device count + 1 edge offsets; a device's edges are offsets[i]:offsets[i + 1]
+    receivers       receiving device index per edge
+    delays          delay per edge
+    events          (device index, 0 for ALERT or 1 for CANCELLATION, description index, time) per start event
+    changes         (index in CHANGE_TYPES, device index, receiver index or -1, delay or 0, time) per topology change
+    descriptions    the descriptions as UTF-8, separated by newlines
+
+The loader memory-maps the file and reads the arrays straight out of it. The same compiled topology can be
+run with other ALERT and CANCEL lines by passing an events file; its timed topology changes are kept.
+"""
+import argparse
+import gc
+import mmap
+import struct
+import sys
+from pathlib import Path
+from device import Device
+from event import Event, PHASE_SEND
+from logsink import LogSink
+from scenarioreader import iter_scenario_records, LengthRecord, AlertRecord, CancelRecord
+from simulation import Simulation
+from topology import Topology
+from topologychange import TopologyChange, CHANGE_TYPES
+
+MAGIC = b'DSIMBIN2'
+_HEADER = struct.Struct('<8s6q')
+_EVENT_TYPES = ('ALERT', 'CANCELLATION')
+
+def compile_scenario(scenario_path: Path, compiled_path: Path) -> list[str]:
+    """Compiles a text scenario into the binary format, returning the problems found in it"""
+    topology = Topology()
+    with open(scenario_path, 'r') as file:
+        for record in iter_scenario_records(file):
+            topology.add_record(record)
+    simulation_length, devices, event_list = topology.build()
+
+    index_by_device = {id(device): index for index, device in enumerate(devices)}
+    offsets = [0]
+    receivers = []
+    delays = []
+    for device in devices:
+        for recipient, delay in device.get_recipients():
+            receivers.append(index_by_device[id(recipient)])
+            delays.append(delay)
+        offsets.append(len(receivers))
+
+    descriptions = {}
+    events = []
+    changes = []
+    start_event_count = 0
+    for event in event_list:
+        if isinstance(event, TopologyChange):
+            receiver = event.get_receiver()
+            changes.extend([CHANGE_TYPES.index(event.get_event_type()), index_by_device[id(event.get_device())],
+                            -1 if receiver is None else index_by_device[id(receiver)], event.get_delay() or 0,
+                            event.get_time()])
+            continue
+        start_event_count += 1
+        description_index = descriptions.setdefault(event.get_description(), len(descriptions))
+        events.extend([index_by_device[id(event.get_receiver())], _EVENT_TYPES.index(event.get_event_type()),
+                       description_index, event.get_time()])
+    description_bytes = '\n'.join(descriptions).encode('utf-8')
+
+    with open(compiled_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, simulation_length, len(devices), len(receivers), start_event_count,
+                                len(changes) // 5, len(description_bytes)))
+        for values in [[device.get_device_id() for device in devices], offsets, receivers, delays, events, changes]:
+            file.write(struct.pack(f'<{len(values)}q', *values))
+        file.write(description_bytes)
+    return topology.get_problems()
+
+def _read_events(events_path: Path, devices: list[Device]) -> (int or None, list[tuple]):
+    """Reads LENGTH, ALERT and CANCEL lines from a text file as (device index, event type, description, time)"""
+    index_by_id = {device.get_device_id(): index for index, device in enumerate(devices)}
+    simulation_length = None
+    events = []
+    with open(events_path, 'r') as file:
+        for record in iter_scenario_records(file):
+            if isinstance(record, LengthRecord):
+                simulation_length = record.simulation_length
+            elif isinstance(record, (AlertRecord, CancelRecord)):
+                keyword = 'ALERT' if isinstance(record, AlertRecord) else 'CANCEL'
+                if record.device_id not in index_by_id:
+                    print(f'UNKNOWN DEVICE #{record.device_id} IN {keyword} {record.device_id} {record.description} '
+                          f'{record.time}', file=sys.stderr)
+                    continue
+                events.append((index_by_id[record.device_id], 'ALERT' if keyword == 'ALERT' else 'CANCELLATION',
+                               sys.intern(record.description), record.time))
+    #Start events are grouped by device in declaration order, as Topology does
+    events.sort(key=lambda event: event[0])
+    return simulation_length, events
+
+def _read_int64s(view: memoryview, position: int, count: int) -> list[int]:
+    """Reads count little-endian int64 values; casting the view is faster but only right on a little-endian host"""
+    if sys.byteorder == 'little':
+        with view[position:position + 8 * count].cast('q') as array:
+            return array.tolist()
+    return list(struct.unpack_from(f'<{count}q', view, position))
+
+def load_compiled_simulation(compiled_path: Path, log_sink: LogSink = None, events_path: Path = None) -> Simulation:
+    """Loads a compiled scenario as a Simulation with its start events scheduled. With events_path, the ALERT
+    and CANCEL lines (and LENGTH, if present) of that text file replace the compiled ones."""
+    with open(compiled_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, simulation_length, device_count, edge_count, event_count, change_count, description_size = \
+            _HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            raise ValueError(f'{compiled_path} is not a compiled scenario')
+        with memoryview(mapped) as view:
+            position = _HEADER.size
+            arrays = []
+            for count in [device_count, device_count + 1, edge_count, edge_count, event_count * 4, change_count * 5]:
+                arrays.append(_read_int64s(view, position, count))
+                position += 8 * count
+            descriptions = [sys.intern(description) for description in
+                            bytes(view[position:position + description_size]).decode('utf-8').split('\n')]
+    device_ids, offsets, receivers, delays, event_values, change_values = arrays
+
+    simulation = Simulation(simulation_length, log_sink)
+    #Nothing built here is garbage, so the collector's passes over millions of new objects are wasted work
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        devices = [Device(device_id, simulation) for device_id in device_ids]
+        receiving_devices = list(map(devices.__getitem__, receivers))
+        for index, device in enumerate(devices):
+            start, end = offsets[index], offsets[index + 1]
+            device.add_recipients(zip(receiving_devices[start:end], delays[start:end]))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if events_path is None:
+        events = [(event_values[position], _EVENT_TYPES[event_values[position + 1]],
+                   descriptions[event_values[position + 2]], event_values[position + 3])
+                  for position in range(0, len(event_values), 4)]
+    else:
+        events_length, events = _read_events(events_path, devices)
+        if events_length is not None:
+            simulation.set_simulation_length(events_length)
+
+    for device_index, event_type, description, time in events:
+        simulation.schedule(Event(None, devices[device_index], event_type, description, time, PHASE_SEND))
+    for position in range(0, len(change_values), 5):
+        type_code, device_index, receiver_index, delay, time = change_values[position:position + 5]
+        change_type = CHANGE_TYPES[type_code]
+        simulation.schedule(TopologyChange(change_type, devices[device_index],
+                                           devices[receiver_index] if receiver_index >= 0 else None,
+                                           delay if change_type in ('LINK', 'DELAY') else None, time))
+    return simulation
+
+def main(argv: list[str] = None) -> None:
+    """Compiles the scenario named on the command line"""
+    parser = argparse.ArgumentParser(description='Compile a text scenario into the binary format.')
+    parser.add_argument('scenario', type=Path, help='text scenario file')
+    parser.add_argument('compiled', type=Path, help='binary file to write')
+    args = parser.parse_args(argv)
+
+    for problem in compile_scenario(args.scenario, args.compiled):
+        print(problem, file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Runs a simulation as independent sub-simulations, one group of descriptions each, across a process pool.
+
+Alerts and cancellations only interact through a device's cancellation table, which is keyed by description,
+so the start events of different descriptions never affect each other. Each worker runs the start events of
+some descriptions, together with every topology change, on its own copy of the device graph.
+
+The merged log matches run_simulation exactly, keying events by (time, priority, parent, edge) as described in
+engineutils. A child always has its parent in the same group, and a group pops a parent before its children,
+so merging the groups' pops by that key rebuilds the global order.
+"""
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from device import Device
+from engineutils import collect_devices, decode_event, encode_event, merge_pops, start_key
+from event import Event
+from logsink import LogSink, MemorySink, STDOUT_SINK
+from scheduler import EVENT_PRIORITIES
+from simulation import Simulation
+from topologychange import TopologyChange
+
+class _GroupQueue:
+    """Stands in for the EventScheduler, keying every child by its parent's pop index and the edge taken"""
+    def __init__(self, heap: list):
+        self._heap = heap
+        self._parent = 0
+        self._edge = 0
+
+    def start(self, parent: int) -> None:
+        """Starts taking the children of the event popped at the given index"""
+        self._parent = parent
+        self._edge = 0
+
+    def append(self, event: Event) -> None:
+        heapq.heappush(self._heap, (event.get_time(), EVENT_PRIORITIES[event.get_event_type()], self._parent,
+                                    self._edge, event))
+        self._edge += 1
+
+    push = append
+
+
+#Set once per worker process by _init_worker, so the device graph is sent once rather than with every group
+_setup = None
+
+def _init_worker(setup: tuple) -> None:
+    global _setup
+    _setup = setup
+
+def _run_group(keyed_events: list[tuple]) -> (list[tuple], list[str]):
+    """Runs one group of (start key, encoded event) pairs on a fresh copy of the device graph. Returns
+    (time, priority, parent, edge) for each SENT or RECEIVED step, where parent is the index of the parent step
+    in the group or the negative list position of a start event, and each step's log block."""
+    simulation_length, device_ids, edges, cancellations, offline = _setup
+    simulation = Simulation(simulation_length)
+    devices = [Device(device_id, simulation) for device_id in device_ids]
+    for index, recipients in enumerate(edges):
+        devices[index].add_recipients((devices[receiver], delay) for receiver, delay in recipients)
+    for index, description, time in cancellations:
+        devices[index].add_cancelled_description(description, time)
+    for index in offline:
+        devices[index].set_online(False)
+
+    heap = [key + (decode_event(payload, key[0], devices.__getitem__),) for key, payload in keyed_events]
+    heapq.heapify(heap)
+
+    event_queue = _GroupQueue(heap)
+    log_sink = MemorySink()
+    lines = log_sink.get_lines()
+    steps = []
+    blocks = []
+    while heap and heap[0][0] < simulation_length:
+        time, priority, parent, edge, event = heapq.heappop(heap)
+        #Topology changes run in every group but have no children and write nothing, so they are left out
+        if isinstance(event, TopologyChange):
+            event.execute(event_queue, log_sink)
+            continue
+        event_queue.start(len(steps))
+        steps.append((time, priority, parent, edge))
+        event.execute(event_queue, log_sink)
+        blocks.append('\n'.join(lines))
+        lines.clear()
+    return steps, blocks
+
+def _group_by_description(event_list: list, index_by_device: dict, workers: int) -> list[list[tuple]]:
+    """Splits the start events into at most workers groups of whole descriptions with similar numbers of start
+    events, adding every topology change to each group"""
+    by_description = {}
+    changes = []
+    for position, event in enumerate(event_list):
+        keyed_event = (start_key(event, position, len(event_list)), encode_event(event, index_by_device))
+        if isinstance(event, TopologyChange):
+            changes.append(keyed_event)
+        else:
+            by_description.setdefault(event.get_description(), []).append(keyed_event)
+
+    groups = [[] for _ in range(min(workers, len(by_description)))]
+    for events in sorted(by_description.values(), key=len, reverse=True):
+        min(groups, key=len).extend(events)
+    return [sorted(group + changes) for group in groups]
+
+def run_description_simulation(simulation_length: int, event_list: list, log_sink: LogSink = None,
+                               workers: int = None) -> None:
+    """Runs the start events of each description separately across worker processes and merges the logs,
+    falling back to run_simulation when there is a single worker or a single description"""
+    if log_sink is None:
+        log_sink = STDOUT_SINK
+    workers = workers or os.cpu_count() or 1
+    descriptions = {event.get_description() for event in event_list if not isinstance(event, TopologyChange)}
+    if workers <= 1 or len(descriptions) <= 1:
+        from devicesimulationmain import run_simulation
+        run_simulation(simulation_length, event_list, log_sink)
+        return
+
+    devices = collect_devices(event_list)
+    index_by_device = {device: index for index, device in enumerate(devices)}
+    setup = (simulation_length, [device.get_device_id() for device in devices],
+             [[(index_by_device[recipient], delay) for recipient, delay in device.get_recipients()]
+              for device in devices],
+             [(index, description, time) for index, device in enumerate(devices)
+              for description, time in device.get_cancelled_descriptions()],
+             [index for index, device in enumerate(devices) if not device.is_online()])
+    groups = _group_by_description(event_list, index_by_device, workers)
+
+    with ProcessPoolExecutor(max_workers=len(groups), initializer=_init_worker, initargs=(setup,)) as executor:
+        results = list(executor.map(_run_group, groups))
+
+    merge_pops([steps for steps, _ in results], [blocks for _, blocks in results], log_sink)
+    log_sink.write_end(simulation_length)
+    log_sink.flush()
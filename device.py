@@ -1,37 +1,104 @@
-from event import Event
+from typing import Iterable
+from event import Event, PHASE_SEND, PHASE_RECEIVE
+from logsink import LogSink
+from simulation import Simulation
 
 class Device:
-    simulation_length = 0
-    def __init__(self, device_id, simulation_length):
+    def __init__(self, device_id, simulation: Simulation or int):
+        """Creates a device in the given simulation; a bare simulation length gets a simulation of its own"""
+        if not isinstance(simulation, Simulation):
+            simulation = Simulation(simulation)
         self._device_id = device_id
-        self._recipients = []
-        self._cancelled_descriptions = []
-        Device.simulation_length = simulation_length
+        self._simulation = simulation
+        #Edges are kept by key in insertion order, with the keys of each receiver's edges alongside,
+        #so timed topology changes can add, remove or re-weight an edge without rebuilding the list
+        self._recipients = {}
+        self._edge_keys = {}
+        self._next_edge_key = 0
+        self._cancel_times = {}
+        self._online = True
+        simulation.add_device(self)
 
     def get_device_id(self) -> int:
         """Gets device id"""
         return self._device_id
 
+    def get_simulation(self) -> Simulation:
+        """Gets the simulation the device belongs to"""
+        return self._simulation
+
+    def get_simulation_length(self) -> int:
+        """Gets simulation length"""
+        return self._simulation.get_simulation_length()
+
     def get_recipients(self) -> list[tuple]:
-        """Gets recipients"""
-        return self._recipients
+        """Gets recipients as (receiver device, delay) pairs in the order they were added"""
+        return list(self._recipients.values())
+
+    def has_recipients(self) -> bool:
+        """Gets whether the device forwards to anyone, without copying its recipients"""
+        return bool(self._recipients)
+
+    def is_online(self) -> bool:
+        """Gets whether the device is receiving messages"""
+        return self._online
+
+    def set_online(self, online: bool) -> None:
+        """Takes the device offline or back online; an offline device drops every message delivered to it"""
+        self._online = online
 
     def get_cancelled_descriptions(self) -> list[tuple]:
-        """Gets cancelled descriptions"""
-        return self._cancelled_descriptions
+        """Gets cancelled descriptions as (description, cancel time) pairs"""
+        return list(self._cancel_times.items())
+
+    def get_cancel_time(self, description: str) -> int or None:
+        """Gets the earliest time the description was cancelled at this device, or None"""
+        return self._cancel_times.get(description)
+
+    def add_cancelled_description(self, description: str, time: int) -> None:
+        """Records a cancellation, keeping the earliest cancel time for the description"""
+        if description not in self._cancel_times or time < self._cancel_times[description]:
+            self._cancel_times[description] = time
 
     def add_recipient(self, receiver: 'Device', delay: int) -> None:
         """Adds recipients in tuple with receiver device and delay"""
-        self._recipients.append((receiver, delay))
+        edge_key = self._next_edge_key
+        self._next_edge_key += 1
+        self._recipients[edge_key] = (receiver, delay)
+        if receiver in self._edge_keys:
+            self._edge_keys[receiver].append(edge_key)
+        else:
+            self._edge_keys[receiver] = [edge_key]
+
+    def add_recipients(self, recipients: Iterable[tuple]) -> None:
+        """Adds several (receiver device, delay) pairs in order"""
+        for receiver, delay in recipients:
+            self.add_recipient(receiver, delay)
+
+    def remove_recipient(self, receiver: 'Device') -> int:
+        """Removes every edge to the receiver, returning how many were removed"""
+        edge_keys = self._edge_keys.pop(receiver, ())
+        for edge_key in edge_keys:
+            del self._recipients[edge_key]
+        return len(edge_keys)
 
-    def send_message(self, event: 'Event') -> list[Event]:
+    def set_recipient_delay(self, receiver: 'Device', delay: int) -> int:
+        """Changes the delay of every edge to the receiver in place, returning how many were changed"""
+        edge_keys = self._edge_keys.get(receiver, ())
+        for edge_key in edge_keys:
+            self._recipients[edge_key] = (receiver, delay)
+        return len(edge_keys)
+
+    def send_message(self, event: 'Event', log_sink: LogSink = None) -> list[Event]:
         """Takes event and sends message to the receiver devices recipients"""
+        if log_sink is None:
+            log_sink = self._simulation.get_log_sink()
         receiving_events = []
 
-        for recipient, delay in self.get_recipients():
+        for recipient, delay in self._recipients.values():
             new_event = Event(self, recipient, event.get_event_type(), event.get_description(),
-                              event.get_time(), 'S')
-            new_event.log()
+                              event.get_time(), PHASE_SEND)
+            new_event.log(log_sink)
 
             receiving_event = recipient.receive_message(new_event, delay)
             if receiving_event:
@@ -40,29 +107,32 @@ class Device:
 
     def receive_message(self, event: 'Event', delay: int) -> Event or None:
         """Receives message based on the previous event and the delay"""
-        if event.get_time() + delay < Device.simulation_length:
+        if event.get_time() + delay < self._simulation.get_simulation_length():
             new_event = Event(event.get_sender(), self, event.get_event_type(), event.get_description(),
-                              event.get_time() + delay, 'R')
+                              event.get_time() + delay, PHASE_RECEIVE)
             return new_event
         return None
 
-    def process_events(self, event: 'Event', event_queue: list) -> None:
-        """Processes events and calls send and receive message functions"""
-        if event.get_time() >= Device.simulation_length:
+    def process_events(self, event: 'Event', event_queue: list = None, log_sink: LogSink = None) -> None:
+        """Processes events and calls send and receive message functions, queueing into the device's simulation
+        unless another event_queue is given"""
+        if event.get_time() >= self._simulation.get_simulation_length():
             return
+        if event_queue is None:
+            event_queue = self._simulation.get_event_queue()
 
         if event.get_event_type() == "CANCELLATION":
-            if event.get_description() not in [desc for desc, _ in self.get_cancelled_descriptions()]:
-                receiving_events = self.send_message(event)
+            if event.get_description() not in self._cancel_times:
+                receiving_events = self.send_message(event, log_sink)
                 for temp_event in receiving_events:
                     event_queue.append(temp_event)
-                self.get_cancelled_descriptions().append((event.get_description(), event.get_time()))
+                self._cancel_times[event.get_description()] = event.get_time()
             return
 
-        for description, cancel_time in self.get_cancelled_descriptions():
-            if event.get_description() == description and event.get_time() >= cancel_time + 1:
-                return
+        cancel_time = self._cancel_times.get(event.get_description())
+        if cancel_time is not None and event.get_time() >= cancel_time + 1:
+            return
 
-        receiving_events = self.send_message(event)
+        receiving_events = self.send_message(event, log_sink)
         for temp_event in receiving_events:
             event_queue.append(temp_event)
\ No newline at end of file
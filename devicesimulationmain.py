@@ -1,93 +1,176 @@
+import argparse
+import importlib
+import sys
 from pathlib import Path
 from device import Device
-from event import Event
+from logsink import LogSink, BufferedTextSink, CountingSink, FileSink
+from scenarioreader import iter_scenario_records
+from scenariovalidator import check_scenario_file, ScenarioError
+from simulation import Simulation
+from topology import Topology
 
 def _read_input_file_path() -> Path:
     """Reads the input file path from the standard input"""
     return Path(input())
 
+def _read_topology(file_path: Path) -> Topology:
+    """Streams the scenario file into a Topology, raising FileNotFoundError if it does not exist and
+    ScenarioSyntaxError at its first malformed line"""
+    topology = Topology()
+    with open(file_path, 'r') as file:
+        for record in iter_scenario_records(file):
+            topology.add_record(record)
+    return topology
+
+def _report_problems(topology: Topology) -> None:
+    """Prints the problems found while building the topology to standard error"""
+    for problem in topology.get_problems():
+        print(problem, file=sys.stderr)
+
 def parse_input_file(file_path: Path) -> (int, list[Device], list[dict]):
     """Parses the file and returns simulation length, list of devices, and actions"""
-    try:
-        with open(file_path, 'r') as file:
-            file_contents = file.readlines()
-    except:
-        print('FILE NOT FOUND')
-        quit()
-
-    important_lines = []
-    for line in file_contents:
-        if line and line[0] not in ['', ' ', '\n', '#']:
-            important_lines.append(line.strip())
-
-    simulation_length = 0
-    device_list = []
-    propagation_rules = []
-    event_list = []
-
-    for line in important_lines:
-        if line.startswith('LENGTH'):
-            simulation_length = int(line[7:])
-        elif line.startswith('DEVICE'):
-            device_list.append(int(line[7:]))
-        elif line.startswith('PROPAGATE'):
-            sender, receiver, delay = line[10:].split()
-            propagation_rules.append({
-                'sender': int(sender),
-                'receiver': int(receiver),
-                'delay': int(delay)
-            })
-        elif line.startswith('ALERT'):
-            beginning_device, description, time = line[6:].split()
-            event_list.append((int(beginning_device), description, int(time), 'ALERT'))
-
-        elif line.startswith('CANCEL'):
-            beginning_device, description, time = line[7:].split()
-            event_list.append((int(beginning_device), description, int(time), 'CANCELLATION'))
-
-
-    #Creates a list of Device objects and adds corresponding recipient devices
-    device_with_classes_list = []
-
-    for device in device_list:
-        device_with_classes_list.append(Device(device, simulation_length))
-
-    for rule in propagation_rules:
-        for device in device_with_classes_list:
-            if rule['sender'] == device.get_device_id():
-                for other_device in device_with_classes_list:
-                    if other_device.get_device_id() == rule['receiver']:
-                        device.add_recipient(other_device, rule['delay'])
-
-    #Creates a list of Event objects
-    event_with_classes_list = []
-    for device in device_with_classes_list:
-        for event in event_list:
-            if event[0] == device.get_device_id():
-                start_event = Event(None, device, event[3], event[1], event[2], 'S')
-                event_with_classes_list.append(start_event)
-
-    return simulation_length, device_with_classes_list, event_with_classes_list
-
-def run_simulation(simulation_length, event_list) -> None:
-    """Runs simulation using a while loop to go until it ends"""
-    event_queue = sorted(event_list, key=lambda e: e.get_time())
-
-    while event_queue:
-        event_queue.sort(key=lambda e: (e.get_time(), 0 if e.get_event_type() == 'ALERT' else 1))
-        current_event = event_queue.pop(0)
-
-        if current_event.get_time() >= simulation_length:
-            break
-        current_event.execute(event_queue)
-
-    print(f'@{simulation_length}: END')
-
-def main() -> None:
-    """Runs the simulation program in its entirety"""
-    input_file_path = _read_input_file_path()
-    simulation_length, device_list, event_list = parse_input_file(input_file_path)
-    run_simulation(simulation_length, event_list)
+    topology = _read_topology(file_path)
+    simulation_length, device_list, event_list = topology.build()
+    _report_problems(topology)
+
+    return simulation_length, device_list, event_list
+
+def load_simulation(file_path: Path, log_sink: LogSink = None) -> Simulation:
+    """Parses the file into a Simulation with its start events scheduled"""
+    topology = _read_topology(file_path)
+    simulation = topology.build_simulation(log_sink)
+    _report_problems(topology)
+
+    return simulation
+
+def run_simulation(simulation_length, event_list, log_sink: LogSink = None,
+                   profiler: 'SimulationProfiler' = None, coalesce: bool = False) -> None:
+    """Runs simulation using a while loop to go until it ends, logging to standard output by default and
+    recording into the profiler when one is given. With coalesce, identical pending alert deliveries are
+    processed once, writing the same log."""
+    simulation = Simulation(simulation_length, log_sink, profiler, coalesce)
+    for event in event_list:
+        simulation.schedule(event)
+    simulation.run()
+
+#Engines other than the sequential one are imported only when selected, so NumPy and the process pools
+#cost nothing at startup
+ENGINES = {
+    'sequential': None,
+    'numpy': ('numpyengine', 'run_numpy_simulation'),
+    'partitioned': ('partitionedengine', 'run_partitioned_simulation'),
+    'description': ('descriptionengine', 'run_description_simulation'),
+}
+_PARALLEL_ENGINES = ('partitioned', 'description')
+
+def _run_scenario(file_path: Path, log_sink: LogSink, engine: str = 'sequential', workers: int = None,
+                  profiler: 'SimulationProfiler' = None, coalesce: bool = False) -> None:
+    """Runs one scenario with the named engine; only the sequential engine takes a profiler or coalesces"""
+    if ENGINES[engine] is None:
+        simulation = load_simulation(file_path, log_sink)
+        simulation.set_profiler(profiler)
+        simulation.set_coalescing(coalesce)
+        simulation.run()
+        return
+    module_name, function_name = ENGINES[engine]
+    run_engine = getattr(importlib.import_module(module_name), function_name)
+    simulation_length, _, event_list = parse_input_file(file_path)
+    if engine in _PARALLEL_ENGINES:
+        run_engine(simulation_length, event_list, log_sink, workers=workers)
+    else:
+        run_engine(simulation_length, event_list, log_sink)
+
+def main(argv: list[str] = None) -> int:
+    """Runs the simulation program in its entirety, reading the scenario path from standard input when none
+    is given, and refusing to run if any scenario fails validation"""
+    parser = argparse.ArgumentParser(description='Run device network simulations.')
+    parser.add_argument('scenarios', nargs='*', type=Path,
+                        help='scenario files (default: read one path from standard input)')
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help='log file, or directory of per-scenario logs when there are several scenarios '
+                             '(default: standard output)')
+    parser.add_argument('--engine', choices=list(ENGINES), default='sequential', help='engine to run with')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for the partitioned and description engines (default: CPU count)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a profile of each run to standard error (sequential engine only)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='print only the number of SENT and RECEIVED lines instead of the log')
+    parser.add_argument('--metrics', choices=['table', 'json'], default=None,
+                        help='print summary statistics instead of the log (sequential engine only)')
+    parser.add_argument('--coalesce', action='store_true',
+                        help='process identical pending alert deliveries once; the log is unchanged '
+                             '(sequential engine only)')
+    parser.add_argument('--check-only', action='store_true', help='validate the scenarios without running them')
+    args = parser.parse_args(argv)
+    if args.profile and args.engine != 'sequential':
+        parser.error('--profile only works with the sequential engine')
+    if args.coalesce and args.engine != 'sequential':
+        parser.error('--coalesce only works with the sequential engine')
+    if args.metrics and args.engine != 'sequential':
+        parser.error('--metrics only works with the sequential engine')
+    if args.quiet and args.metrics:
+        parser.error('--quiet and --metrics cannot be combined')
+    if (args.quiet or args.metrics) and args.output is not None:
+        parser.error('--quiet and --metrics write no log, so they cannot be combined with --output')
+    #Optional engines are imported here, so a missing dependency is reported before any scenario is read
+    if ENGINES[args.engine] is not None:
+        try:
+            importlib.import_module(ENGINES[args.engine][0])
+        except ImportError as error:
+            parser.error(f'the {args.engine} engine needs {error.name or error}, which could not be imported')
+
+    scenario_paths = args.scenarios or [_read_input_file_path()]
+    output_paths = [args.output] * len(scenario_paths)
+    if args.output is not None and len(scenario_paths) > 1:
+        output_paths = [args.output / f'{scenario_path.stem}.log' for scenario_path in scenario_paths]
+        if len(set(output_paths)) != len(output_paths):
+            parser.error('scenario file names must be unique, since each log is named after its scenario')
+
+    #Every scenario is checked before any of them runs
+    for scenario_path in scenario_paths:
+        try:
+            check_scenario_file(scenario_path)
+        except FileNotFoundError:
+            print('FILE NOT FOUND' if len(scenario_paths) == 1 else f'{scenario_path}: FILE NOT FOUND')
+            return 1
+        except ScenarioError as error:
+            prefix = '' if len(scenario_paths) == 1 else f'{scenario_path}: '
+            for problem in str(error).split('\n'):
+                print(prefix + problem, file=sys.stderr)
+            return 1
+    if args.check_only:
+        return 0
+    if args.output is not None and len(scenario_paths) > 1:
+        args.output.mkdir(parents=True, exist_ok=True)
+
+    for scenario_path, output_path in zip(scenario_paths, output_paths):
+        profiler = None
+        if args.profile:
+            from profiler import SimulationProfiler
+            profiler = SimulationProfiler()
+        if args.quiet:
+            log_sink = CountingSink()
+        elif args.metrics:
+            from metrics import MetricsSink
+            log_sink = MetricsSink()
+        elif output_path is not None:
+            log_sink = FileSink(output_path)
+        else:
+            log_sink = BufferedTextSink(sys.stdout)
+
+        with log_sink:
+            _run_scenario(scenario_path, log_sink, args.engine, args.workers, profiler, args.coalesce)
+        if args.quiet:
+            print(f'{scenario_path}: {log_sink.get_event_count()} events')
+        elif args.metrics == 'json':
+            import json
+            print(json.dumps({'scenario': str(scenario_path), **log_sink.to_dict()}))
+        elif args.metrics:
+            print(f'{scenario_path}:\n{log_sink.summary()}')
+        if profiler is not None:
+            print(f'{scenario_path}:\n{profiler.summary()}', file=sys.stderr)
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Helpers shared by the engines that split a run across processes and merge the logs back.
+
+EventScheduler breaks ties in insertion order, which is the same as ordering by (the parent event's position in
+the global pop order, edge taken), with start events first in list order. The engines key every pending event
+by (time, priority, parent, edge): a start event at list position p of n gets parent p - n and edge 0, so it
+sorts before every child, and a child gets its parent's pop index and the index of the edge it was sent on.
+Merging the workers' pops by that key, with parents resolved to global positions, rebuilds the global order.
+"""
+import heapq
+import sys
+from typing import Callable
+from device import Device
+from event import Event
+from logsink import LogSink
+from scheduler import EVENT_PRIORITIES
+from topologychange import TopologyChange
+
+def collect_devices(event_list: list) -> list[Device]:
+    """Gets every device reachable from the start events and topology changes, in declaration order when they
+    all belong to one simulation and in discovery order otherwise"""
+    found = {}
+    stack = []
+    for event in event_list:
+        if isinstance(event, TopologyChange):
+            stack.extend(device for device in (event.get_device(), event.get_receiver()) if device is not None)
+        else:
+            stack.append(event.get_receiver())
+    while stack:
+        device = stack.pop()
+        if device in found:
+            continue
+        found[device] = None
+        stack.extend(recipient for recipient, _ in reversed(device.get_recipients()))
+
+    simulations = {device.get_simulation() for device in found}
+    if len(simulations) == 1:
+        return [device for device in simulations.pop().get_devices() if device in found]
+    return list(found)
+
+def start_key(event: Event or TopologyChange, position: int, event_count: int) -> tuple:
+    """Gets the (time, priority, parent, edge) key of the start event or topology change at the list position"""
+    return event.get_time(), EVENT_PRIORITIES.get(event.get_event_type(), -1), position - event_count, 0
+
+def encode_event(event: Event or TopologyChange, index_by_device: dict) -> tuple:
+    """Encodes an event or topology change, without its time, as plain values that can be sent to another
+    process"""
+    if isinstance(event, TopologyChange):
+        receiver = event.get_receiver()
+        return ('C', event.get_event_type(), index_by_device[event.get_device()],
+                -1 if receiver is None else index_by_device[receiver], event.get_delay())
+    sender = event.get_sender()
+    return ('E', -1 if sender is None else index_by_device[sender], index_by_device[event.get_receiver()],
+            event.get_event_type(), event.get_description(), event.get_phase())
+
+def decode_event(payload: tuple, time: int, device: Callable[[int], Device]) -> Event or TopologyChange:
+    """Rebuilds an encoded event at the given time, getting devices by index from device"""
+    if payload[0] == 'C':
+        _, change_type, device_index, receiver_index, delay = payload
+        return TopologyChange(change_type, device(device_index), device(receiver_index) if receiver_index >= 0
+                              else None, delay, time)
+    _, sender_index, receiver_index, event_type, description, phase = payload
+    return Event(device(sender_index) if sender_index >= 0 else None, device(receiver_index), event_type,
+                 sys.intern(description), time, phase)
+
+def merge_pops(pops: list[list[tuple]], blocks: list[list[str]], log_sink: LogSink, prior_count: int = 0,
+               batch_size: int = 4096) -> list[list[int]]:
+    """Merges the workers' (time, priority, parent, edge) pops into the global order, writing their log blocks
+    in batches. A parent at or past prior_count is the index, offset by prior_count, of an earlier pop of the
+    same worker; anything lower is a global position already. Returns the global position of every pop."""
+    ranks = [[0] * len(worker_pops) for worker_pops in pops]
+    heads = []
+    positions = [0] * len(pops)
+
+    def push_head(worker: int) -> None:
+        position = positions[worker]
+        if position < len(pops[worker]):
+            time, priority, parent, edge = pops[worker][position]
+            #A parent of the same worker comes earlier in its pops, so it has been merged and ranked already
+            if parent >= prior_count:
+                parent = ranks[worker][parent - prior_count]
+            heapq.heappush(heads, (time, priority, parent, edge, worker))
+
+    for worker in range(len(pops)):
+        push_head(worker)
+    rank = prior_count
+    text = []
+    while heads:
+        worker = heapq.heappop(heads)[-1]
+        position = positions[worker]
+        ranks[worker][position] = rank
+        rank += 1
+        if blocks[worker][position]:
+            text.append(blocks[worker][position])
+            if len(text) >= batch_size:
+                log_sink.write_block('\n'.join(text))
+                text = []
+        positions[worker] += 1
+        push_head(worker)
+    if text:
+        log_sink.write_block('\n'.join(text))
+    return ranks
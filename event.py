@@ -1,11 +1,22 @@
+from logsink import LogSink
+
+#Phases are stored as small ints; get_phase still reports them as 'S' and 'R'
+PHASE_SEND = 0
+PHASE_RECEIVE = 1
+_PHASE_CODES = {'S': PHASE_SEND, 'R': PHASE_RECEIVE}
+_PHASE_NAMES = ('S', 'R')
+
 class Event:
-    def __init__(self, sender: 'Device', receiver: 'Device', event_type: str, description: str, time: int, phase: str):
+    __slots__ = ('_sender', '_receiver', '_event_type', '_description', '_time', '_phase')
+
+    def __init__(self, sender: 'Device', receiver: 'Device', event_type: str, description: str, time: int,
+                 phase: str or int):
         self._sender = sender
         self._receiver = receiver
         self._event_type = event_type
         self._description = description
         self._time = time
-        self._phase = phase
+        self._phase = _PHASE_CODES.get(phase, phase)
 
     def get_sender(self) -> 'Device':
         """Gets sender device"""
@@ -29,18 +40,30 @@ class Event:
 
     def get_phase(self) -> str:
         """Gets phase"""
-        return self._phase
-
-    def log(self) -> None:
-        """Logs devices by printing them according to the correct format"""
-        if self.get_phase() == 'R':
-            print(f'@{self.get_time()}: #{self.get_receiver().get_device_id()} RECEIVED {self.get_event_type()} FROM #{self.get_sender().get_device_id()}: {self.get_description()}')
-        elif self.get_phase() == 'S':
-            print(f'@{self.get_time()}: #{self.get_sender().get_device_id()} SENT {self.get_event_type()} TO #{self.get_receiver().get_device_id()}: {self.get_description()}')
-
-    def execute(self, event_queue: list['Event']) -> None:
-        """Executes for the given event_queue by logging or processing"""
-        if self.get_phase() == 'R':
-            self.log()
+        return _PHASE_NAMES[self._phase]
+
+    def format_log_line(self) -> str:
+        """Formats the SENT or RECEIVED log line for the event"""
+        if self._phase == PHASE_RECEIVE:
+            return f'@{self.get_time()}: #{self.get_receiver().get_device_id()} RECEIVED {self.get_event_type()} FROM #{self.get_sender().get_device_id()}: {self.get_description()}'
+        return f'@{self.get_time()}: #{self.get_sender().get_device_id()} SENT {self.get_event_type()} TO #{self.get_receiver().get_device_id()}: {self.get_description()}'
+
+    def log(self, log_sink: LogSink = None) -> None:
+        """Logs the event through the log sink, defaulting to the sink of the receiver's simulation"""
+        if log_sink is None:
+            log_sink = self.get_receiver().get_simulation().get_log_sink()
+        log_sink.write_event(self)
+
+    def execute(self, event_queue: list['Event'] = None, log_sink: LogSink = None) -> None:
+        """Executes for the given event_queue by logging or processing, unless the receiver is offline"""
+        if self._receiver is not None and not self._receiver.is_online():
+            return
+        if self._phase == PHASE_RECEIVE:
+            self.log(log_sink)
         if self.get_receiver():
-            self.get_receiver().process_events(self, event_queue)
\ No newline at end of file
+            if self._sender is None:
+                #A start event: the device takes the message without a RECEIVED line, so sinks are told separately
+                if log_sink is None:
+                    log_sink = self.get_receiver().get_simulation().get_log_sink()
+                log_sink.write_start(self)
+            self.get_receiver().process_events(self, event_queue, log_sink)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+from typing import TextIO
+
+class LogSink:
+    """Destination for simulation log lines; subclasses decide where the lines go"""
+    def __enter__(self) -> 'LogSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write_event(self, event: 'Event') -> None:
+        """Writes the SENT or RECEIVED line for an event"""
+        self.write(event.format_log_line())
+
+    def write_start(self, event: 'Event') -> None:
+        """Notes a start event taken by its device; it has no log line, so nothing is written"""
+
+    def write_end(self, simulation_length: int) -> None:
+        """Writes the END line"""
+        self.write(f'@{simulation_length}: END')
+
+    def write(self, line: str) -> None:
+        """Writes one log line without its trailing newline"""
+        raise NotImplementedError
+
+    def write_block(self, text: str) -> None:
+        """Writes several newline-separated lines at once, without the trailing newline"""
+        for line in text.split('\n'):
+            self.write(line)
+
+    def flush(self) -> None:
+        """Pushes any buffered lines to their destination"""
+
+    def close(self) -> None:
+        """Flushes and releases the destination"""
+        self.flush()
+
+
+class StdoutSink(LogSink):
+    """Prints every line to the current standard output as soon as it is written"""
+    def write(self, line: str) -> None:
+        print(line)
+
+    def write_block(self, text: str) -> None:
+        print(text)
+
+
+class BufferedTextSink(LogSink):
+    """Collects lines and writes them to a text stream in batches of flush_size lines"""
+    def __init__(self, stream: TextIO = None, flush_size: int = 4096):
+        self._stream = stream
+        self._flush_size = flush_size
+        self._lines = []
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self._flush_size:
+            self.flush()
+
+    #A block counts as a single entry towards flush_size
+    write_block = write
+
+    def flush(self) -> None:
+        stream = self._stream if self._stream is not None else sys.stdout
+        if self._lines:
+            self._lines.append('')
+            stream.write('\n'.join(self._lines))
+            self._lines = []
+        stream.flush()
+
+
+class FileSink(BufferedTextSink):
+    """Writes the log to a file, replacing any previous contents"""
+    def __init__(self, file_path: Path, flush_size: int = 4096):
+        super().__init__(open(file_path, 'w'), flush_size)
+
+    def close(self) -> None:
+        self.flush()
+        self._stream.close()
+
+
+class NullSink(LogSink):
+    """Discards everything, skipping the line formatting as well"""
+    def write_event(self, event: 'Event') -> None:
+        pass
+
+    def write_end(self, simulation_length: int) -> None:
+        pass
+
+    def write(self, line: str) -> None:
+        pass
+
+    def write_block(self, text: str) -> None:
+        pass
+
+
+class CountingSink(LogSink):
+    """Counts SENT and RECEIVED lines without formatting them"""
+    def __init__(self):
+        self._event_count = 0
+
+    def get_event_count(self) -> int:
+        """Gets the number of SENT and RECEIVED lines written so far"""
+        return self._event_count
+
+    def write_event(self, event: 'Event') -> None:
+        self._event_count += 1
+
+    def write_end(self, simulation_length: int) -> None:
+        pass
+
+    def write(self, line: str) -> None:
+        pass
+
+    def write_block(self, text: str) -> None:
+        self._event_count += text.count('\n') + 1
+
+
+class MemorySink(LogSink):
+    """Keeps every line in memory"""
+    def __init__(self):
+        self._lines = []
+
+    def get_lines(self) -> list[str]:
+        """Gets the lines written so far"""
+        return self._lines
+
+    def getvalue(self) -> str:
+        """Gets the log as the text that would have been printed"""
+        return ''.join(line + '\n' for line in self._lines)
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+
+
+STDOUT_SINK = StdoutSink()
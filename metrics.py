@@ -0,0 +1,132 @@
+"""Summary statistics for a run in place of its log.
+
+    metrics = MetricsSink()
+    run_simulation(simulation_length, event_list, metrics)
+    print(metrics.summary())
+
+Devices hand every SENT and RECEIVED event to their log sink as they send and receive, and every start event
+as they take it, so a MetricsSink sees what a log would show plus the ALERT and CANCEL lines of the scenario,
+but keeps counts and first times instead of formatting lines. Events reach it in time order, so the first time
+it sees something is also the earliest. A device has a message from the first time it starts or receives it;
+receiving a message it already has is a duplicate receipt.
+"""
+import json
+from pathlib import Path
+from event import PHASE_SEND
+from logsink import LogSink
+
+class MetricsSink(LogSink):
+    """Records messages per type, each device's first alert, duplicate receipts and how long every cancellation
+    took to reach the devices its alert reached"""
+    def __init__(self):
+        self._messages = {'ALERT': 0, 'CANCELLATION': 0}
+        #event type -> description -> {device: first time it sent or received the message}
+        self._first_times = {'ALERT': {}, 'CANCELLATION': {}}
+        self._duplicate_receipts = {}
+        self._simulation_length = None
+
+    def write_event(self, event: 'Event') -> None:
+        #Runs once per message, so it reads the event's slots directly and keeps to a few dictionary lookups.
+        #A device only sends what it started or received, and both are recorded already.
+        if event._phase == PHASE_SEND:
+            self._messages[event._event_type] += 1
+            return
+        by_description = self._first_times[event._event_type]
+        devices = by_description.get(event._description)
+        if devices is None:
+            devices = by_description[event._description] = {}
+        device = event._receiver
+        if device in devices:
+            self._duplicate_receipts[device] = self._duplicate_receipts.get(device, 0) + 1
+        else:
+            devices[device] = event._time
+
+    def write_start(self, event: 'Event') -> None:
+        devices = self._first_times[event._event_type].setdefault(event._description, {})
+        devices.setdefault(event._receiver, event._time)
+
+    def write_end(self, simulation_length: int) -> None:
+        self._simulation_length = simulation_length
+
+    def write(self, line: str) -> None:
+        #Formatted lines carry nothing to aggregate, so engines that only write blocks leave the metrics empty
+        pass
+
+    def get_message_counts(self) -> dict[str, int]:
+        """Gets the number of messages sent per event type"""
+        return dict(self._messages)
+
+    def _get_first_alert_times(self) -> dict:
+        """Gets {device: time} for the first alert of any description each device sent or received"""
+        first_alert_times = {}
+        for devices in self._first_times['ALERT'].values():
+            for device, time in devices.items():
+                if time < first_alert_times.get(device, time + 1):
+                    first_alert_times[device] = time
+        return first_alert_times
+
+    def get_first_alert_times(self) -> dict:
+        """Gets {device id: time} for the first alert of any description each device sent or received"""
+        return {device.get_device_id(): time for device, time in self._get_first_alert_times().items()}
+
+    def get_duplicate_receipts(self) -> dict:
+        """Gets {device id: count} of messages received with a type and description the device already had"""
+        return {device.get_device_id(): count for device, count in self._duplicate_receipts.items()}
+
+    def get_cancellation_coverage(self) -> dict[str, dict]:
+        """Gets, per cancelled description, when its cancellation started, how many of the devices its alert
+        reached had the cancellation by the end, and when the last of them got it (None if some never did).
+        Descriptions no device was alerted about have nothing to withdraw and are left out."""
+        coverage = {}
+        for description, cancel_times in self._first_times['CANCELLATION'].items():
+            alerted = self._first_times['ALERT'].get(description)
+            if not alerted:
+                continue
+            covered_times = [cancel_times[device] for device in alerted if device in cancel_times]
+            complete = len(covered_times) == len(alerted)
+            start = min(cancel_times.values())
+            coverage[description] = {
+                'start': start,
+                'covered': len(covered_times),
+                'alerted': len(alerted),
+                'complete': max(covered_times, default=start) if complete else None,
+            }
+        return coverage
+
+    def to_dict(self) -> dict:
+        """Gets every aggregate as JSON-ready data"""
+        first_alert_times = self.get_first_alert_times()
+        duplicate_receipts = self.get_duplicate_receipts()
+        device_ids = sorted(first_alert_times.keys() | duplicate_receipts.keys(), key=str)
+        return {
+            'simulation_length': self._simulation_length,
+            'messages': self.get_message_counts(),
+            'duplicate_receipts': sum(duplicate_receipts.values()),
+            'cancellation_coverage': self.get_cancellation_coverage(),
+            'devices': {str(device_id): {'first_alert': first_alert_times.get(device_id),
+                                         'duplicate_receipts': duplicate_receipts.get(device_id, 0)}
+                        for device_id in device_ids},
+        }
+
+    def write_json(self, file_path: Path) -> None:
+        """Writes every aggregate to a JSON file"""
+        Path(file_path).write_text(json.dumps(self.to_dict(), indent=2) + '\n')
+
+    def summary(self, top: int = 5) -> str:
+        """Formats a compact table of the aggregates with the devices receiving the most duplicates first"""
+        first_alert_times = sorted(self._get_first_alert_times().values())
+        lines = ['messages: ' + ', '.join(f'{event_type} {count}' for event_type, count in self._messages.items())]
+        if first_alert_times:
+            lines.append(f'first alert: {len(first_alert_times)} devices, earliest {first_alert_times[0]}, '
+                         f'median {first_alert_times[len(first_alert_times) // 2]}, latest {first_alert_times[-1]}')
+        lines.append(f'duplicate receipts: {sum(self._duplicate_receipts.values())}')
+        for device, count in sorted(self._duplicate_receipts.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f'  #{device.get_device_id()}: {count}')
+        coverage = self.get_cancellation_coverage()
+        if coverage:
+            lines.append(f'{"cancellation":<16} {"start":>8} {"complete":>9} {"covered":>15}')
+            for description, row in sorted(coverage.items()):
+                complete = '-' if row['complete'] is None else row['complete']
+                lines.append(f'{description:<16} {row["start"]:>8} {complete:>9} '
+                             f'{row["covered"]:>7} of {row["alerted"]}')
+        return '\n'.join(lines)
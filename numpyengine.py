@@ -0,0 +1,124 @@
+"""Vectorized propagation engine for scenarios that only contain alerts.
+
+Without cancellations nothing a device does depends on what it saw before, so the log is fully determined
+by the PROPAGATE graph: every walk from an alert's origin whose cumulative delay stays under the simulation
+length. This engine stores the graph as CSR arrays and expands all events pending at the same time in one
+batch with NumPy. It needs NumPy, so import it only when the engine is selected.
+"""
+import heapq
+import numpy as np
+from device import Device
+from engineutils import collect_devices
+from event import Event
+from logsink import LogSink, STDOUT_SINK
+
+def build_csr(devices: list[Device]) -> (np.ndarray, np.ndarray, np.ndarray):
+    """Builds (edge offsets, receiver indexes, delays) arrays from the devices' recipient lists"""
+    index_by_device = {device: index for index, device in enumerate(devices)}
+    offsets = np.zeros(len(devices) + 1, dtype=np.int64)
+    receivers = []
+    delays = []
+    for index, device in enumerate(devices):
+        for recipient, delay in device.get_recipients():
+            receivers.append(index_by_device[recipient])
+            delays.append(delay)
+        offsets[index + 1] = len(receivers)
+    return offsets, np.array(receivers, dtype=np.int64), np.array(delays, dtype=np.int64)
+
+def _escape(device_id) -> str:
+    return str(device_id).replace('{', '{{').replace('}', '}}')
+
+def _build_templates(devices: list[Device], offsets: np.ndarray, receivers: np.ndarray) -> (list[str], list[str]):
+    """Builds str.format templates taking (time, description) for each device's SENT lines and for each edge's
+    RECEIVED line followed by the receiver's SENT lines"""
+    device_ids = [_escape(device.get_device_id()) for device in devices]
+    send_templates = []
+    for index, device_id in enumerate(device_ids):
+        send_templates.append('\n'.join(f'@{{0}}: #{device_id} SENT ALERT TO #{device_ids[receiver]}: {{1}}'
+                                        for receiver in receivers[offsets[index]:offsets[index + 1]].tolist()))
+
+    receive_templates = []
+    for index, device_id in enumerate(device_ids):
+        for receiver in receivers[offsets[index]:offsets[index + 1]].tolist():
+            line = f'@{{0}}: #{device_ids[receiver]} RECEIVED ALERT FROM #{device_id}: {{1}}'
+            receive_templates.append(f'{line}\n{send_templates[receiver]}' if send_templates[receiver] else line)
+    return send_templates, receive_templates
+
+def run_numpy_simulation(simulation_length: int, event_list: list[Event], log_sink: LogSink = None) -> None:
+    """Runs an alert-only simulation with batched NumPy frontier expansion, falling back to run_simulation
+    whenever a cancellation is present"""
+    if any(event.get_event_type() != 'ALERT' for event in event_list):
+        from devicesimulationmain import run_simulation
+        run_simulation(simulation_length, event_list, log_sink)
+        return
+    if log_sink is None:
+        log_sink = STDOUT_SINK
+
+    devices = collect_devices(event_list)
+    index_by_device = {device: index for index, device in enumerate(devices)}
+    offsets, receivers, delays = build_csr(devices)
+    send_templates, receive_templates = _build_templates(devices, offsets, receivers)
+    descriptions = list({event.get_description(): None for event in event_list})
+    description_indexes = {description: index for index, description in enumerate(descriptions)}
+
+    #Pending events are bucketed by time as chunks of parallel arrays:
+    #(device, description, parent pop rank, edge taken or -1 for a start event)
+    #Sorting a bucket by (parent pop rank, edge) reproduces EventScheduler's insertion-order tie-break.
+    buckets = {}
+    start_count = len(event_list)
+    for position, event in enumerate(event_list):
+        buckets.setdefault(event.get_time(), []).append((
+            np.array([index_by_device[event.get_receiver()]], dtype=np.int64),
+            np.array([description_indexes[event.get_description()]], dtype=np.int64),
+            np.array([position - start_count], dtype=np.int64),
+            np.array([-1], dtype=np.int64)))
+    times = list(buckets)
+    heapq.heapify(times)
+    popped_count = 0
+
+    while times:
+        time = heapq.heappop(times)
+        if time >= simulation_length:
+            break
+        chunks = buckets.pop(time)
+        nodes, event_descriptions, parents, edges = (np.concatenate(column) for column in zip(*chunks))
+        order = np.lexsort((edges, parents))
+        nodes, event_descriptions, edges = nodes[order], event_descriptions[order], edges[order]
+        ranks = np.arange(popped_count, popped_count + len(nodes), dtype=np.int64)
+        popped_count += len(nodes)
+
+        blocks = [(receive_templates[edge] if edge >= 0 else send_templates[node]).format(time, descriptions[description])
+                  for node, description, edge in zip(nodes.tolist(), event_descriptions.tolist(), edges.tolist())]
+        text = '\n'.join(block for block in blocks if block)
+        if text:
+            log_sink.write_block(text)
+
+        #Expands every popped event into one child per outgoing edge, keeping edge order within a parent
+        counts = offsets[nodes + 1] - offsets[nodes]
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        first_child = np.cumsum(counts) - counts
+        parent_positions = np.repeat(np.arange(len(nodes), dtype=np.int64), counts)
+        child_edges = offsets[nodes][parent_positions] + np.arange(total, dtype=np.int64) - first_child[parent_positions]
+        child_times = time + delays[child_edges]
+
+        alive = child_times < simulation_length
+        child_edges, child_times, parent_positions = child_edges[alive], child_times[alive], parent_positions[alive]
+        child_nodes = receivers[child_edges]
+        child_descriptions = event_descriptions[parent_positions]
+        child_parents = ranks[parent_positions]
+
+        by_time = np.argsort(child_times, kind='stable')
+        child_times = child_times[by_time]
+        distinct_times, boundaries = np.unique(child_times, return_index=True)
+        columns = (child_nodes[by_time], child_descriptions[by_time], child_parents[by_time], child_edges[by_time])
+        for child_time, start, end in zip(distinct_times.tolist(), boundaries.tolist(),
+                                          boundaries[1:].tolist() + [len(child_times)]):
+            if child_time not in buckets:
+                buckets[child_time] = []
+                heapq.heappush(times, child_time)
+            buckets[child_time].append(tuple(column[start:end] for column in columns))
+
+    log_sink.write_end(simulation_length)
+    log_sink.flush()
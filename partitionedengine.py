@@ -0,0 +1,202 @@
+"""Runs one simulation across several worker processes, each owning a partition of the device graph.
+
+Every worker keeps its own devices and a local queue. The run advances in conservative windows: a window
+starts at the earliest pending time T and ends at T + lookahead, where the lookahead is the smallest delay on
+any edge between partitions. A message crossing partitions inside a window therefore lands in a later window,
+so workers only exchange messages between windows.
+
+The merged log matches run_simulation exactly, keying events by (time, priority, parent, edge) as described
+in engineutils. An event whose parent ran in the current window always has a parent in the same partition, so
+a worker orders those by the parent's local position; after each window the coordinator merges the workers'
+pops into the global order and sends every worker the global positions of its pops.
+"""
+import heapq
+import os
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from device import Device
+from engineutils import collect_devices, decode_event, encode_event, merge_pops, start_key
+from event import Event
+from logsink import LogSink, MemorySink, STDOUT_SINK
+from scheduler import EVENT_PRIORITIES
+from simulation import Simulation
+from topologychange import TopologyChange
+
+def _lookahead(devices: list[Device], index_by_device: dict, partition_of: list[int],
+               event_list: list) -> int or None:
+    """Gets the smallest delay of any edge between partitions, now or after a LINK or DELAY, or None if none"""
+    delays = [delay for index, device in enumerate(devices) for recipient, delay in device.get_recipients()
+              if partition_of[index_by_device[recipient]] != partition_of[index]]
+    delays.extend(change.get_delay() for change in event_list
+                  if isinstance(change, TopologyChange) and change.get_event_type() in ('LINK', 'DELAY')
+                  and partition_of[index_by_device[change.get_device()]]
+                  != partition_of[index_by_device[change.get_receiver()]])
+    return min(delays, default=None)
+
+def _destination(payload: tuple) -> int:
+    """Gets the index of the device whose partition runs the encoded event"""
+    return payload[2]
+
+
+class _Partition:
+    """One worker's share of the simulation: its devices, their state and its pending events"""
+    def __init__(self, simulation_length: int, device_ids: list, edges: dict, cancellations: list,
+                 offline: list[int]):
+        self._simulation = Simulation(simulation_length)
+        self._device_ids = device_ids
+        self._devices = {}
+        self._index_by_device = {}
+        for index, recipients in edges.items():
+            self._device(index).add_recipients((self._device(receiver), delay) for receiver, delay in recipients)
+        self._local_devices = {self._devices[index] for index in edges}
+        for index, description, time in cancellations:
+            self._device(index).add_cancelled_description(description, time)
+        for index in offline:
+            self._device(index).set_online(False)
+        self._heap = []
+        self._outbound = []
+        self._last_prior_count = 0
+        self._parent = 0
+        self._edge = 0
+
+    def _device(self, index: int) -> Device:
+        """Gets the device at the index, creating it on first use; devices of other partitions get no edges"""
+        device = self._devices.get(index)
+        if device is None:
+            device = Device(self._device_ids[index], self._simulation)
+            self._devices[index] = device
+            self._index_by_device[device] = index
+        return device
+
+    def append(self, event: Event) -> None:
+        """Takes a child of the event being executed, keyed by its parent's position and the edge taken"""
+        entry = (event.get_time(), EVENT_PRIORITIES[event.get_event_type()], self._parent, self._edge)
+        self._edge += 1
+        if event.get_receiver() in self._local_devices:
+            heapq.heappush(self._heap, entry + (event,))
+        else:
+            self._outbound.append(entry + (encode_event(event, self._index_by_device),))
+
+    def run_window(self, stop_time: int, prior_count: int, ranks: list[int], inbound: list[tuple]) -> tuple:
+        """Resolves the previous window's pops to their global ranks, takes the inbound events and runs every local
+        event before stop_time, returning (pop keys, log block per pop, outbound events, next pending time)"""
+        if ranks:
+            #Provisional parents were prior count + local pop index; the mapping keeps their order, and so the heap
+            base = self._last_prior_count
+            self._heap = [(time, priority, ranks[parent - base] if parent >= base else parent, edge, event)
+                          for time, priority, parent, edge, event in self._heap]
+        for time, priority, parent, edge, payload in inbound:
+            heapq.heappush(self._heap, (time, priority, parent, edge, decode_event(payload, time, self._device)))
+
+        heap = self._heap
+        self._outbound = []
+        log_sink = MemorySink()
+        lines = log_sink.get_lines()
+        pops = []
+        blocks = []
+        while heap and heap[0][0] < stop_time:
+            time, priority, parent, edge, event = heapq.heappop(heap)
+            self._parent = prior_count + len(pops)
+            self._edge = 0
+            pops.append((time, priority, parent, edge))
+            event.execute(self, log_sink)
+            blocks.append('\n'.join(lines))
+            lines.clear()
+        self._last_prior_count = prior_count
+        return pops, blocks, self._outbound, heap[0][0] if heap else None
+
+
+def _worker_main(connection: Connection, setup: tuple) -> None:
+    """Serves run_window requests for one partition until told to stop"""
+    partition = _Partition(*setup)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        connection.send(partition.run_window(*message))
+    connection.close()
+
+def run_partitioned_simulation(simulation_length: int, event_list: list, log_sink: LogSink = None,
+                               workers: int = None) -> None:
+    """Runs the simulation across worker processes, one partition of the device graph each, falling back to
+    run_simulation when there is a single worker or an edge between partitions has no delay"""
+    if log_sink is None:
+        log_sink = STDOUT_SINK
+    workers = workers or os.cpu_count() or 1
+    devices = collect_devices(event_list)
+    index_by_device = {device: index for index, device in enumerate(devices)}
+    #Contiguous runs of devices in declaration order, which keeps clusters that are declared together in one
+    #partition
+    partition_of = [index * workers // max(len(devices), 1) for index in range(len(devices))]
+    lookahead = _lookahead(devices, index_by_device, partition_of, event_list)
+    if workers <= 1 or (lookahead is not None and lookahead <= 0):
+        from devicesimulationmain import run_simulation
+        run_simulation(simulation_length, event_list, log_sink)
+        return
+    if lookahead is None:
+        lookahead = simulation_length
+
+    edges = [{} for _ in range(workers)]
+    cancellations = [[] for _ in range(workers)]
+    offline = [[] for _ in range(workers)]
+    for index, device in enumerate(devices):
+        partition = partition_of[index]
+        edges[partition][index] = [(index_by_device[recipient], delay) for recipient, delay in device.get_recipients()]
+        cancellations[partition].extend((index, description, time)
+                                        for description, time in device.get_cancelled_descriptions())
+        if not device.is_online():
+            offline[partition].append(index)
+
+    inbound = [[] for _ in range(workers)]
+    next_times = [None] * workers
+    for position, event in enumerate(event_list):
+        payload = encode_event(event, index_by_device)
+        inbound[partition_of[_destination(payload)]].append(start_key(event, position, len(event_list)) + (payload,))
+
+    device_ids = [device.get_device_id() for device in devices]
+    connections = []
+    processes = []
+    try:
+        for partition in range(workers):
+            parent_connection, child_connection = Pipe()
+            process = Process(target=_worker_main, daemon=True, args=(child_connection, (
+                simulation_length, device_ids, edges[partition], cancellations[partition], offline[partition])))
+            process.start()
+            child_connection.close()
+            connections.append(parent_connection)
+            processes.append(process)
+
+        prior_count = 0
+        ranks = [[] for _ in range(workers)]
+        while True:
+            pending_times = [time for time in next_times if time is not None]
+            pending_times.extend(entry[0] for entries in inbound for entry in entries)
+            if not pending_times or min(pending_times) >= simulation_length:
+                break
+            stop_time = min(min(pending_times) + lookahead, simulation_length)
+            for partition, connection in enumerate(connections):
+                connection.send((stop_time, prior_count, ranks[partition], inbound[partition]))
+            results = [connection.recv() for connection in connections]
+
+            pops = [result[0] for result in results]
+            window_start = prior_count
+            ranks = merge_pops(pops, [result[1] for result in results], log_sink, window_start)
+            prior_count = window_start + sum(len(partition_pops) for partition_pops in pops)
+
+            inbound = [[] for _ in range(workers)]
+            for partition, (_, _, outbound, next_time) in enumerate(results):
+                next_times[partition] = next_time
+                partition_ranks = ranks[partition]
+                for time, priority, parent, edge, payload in outbound:
+                    if parent >= window_start:
+                        parent = partition_ranks[parent - window_start]
+                    inbound[partition_of[_destination(payload)]].append((time, priority, parent, edge, payload))
+    finally:
+        for connection in connections:
+            connection.send(None)
+            connection.close()
+        for process in processes:
+            process.join()
+
+    log_sink.write_end(simulation_length)
+    log_sink.flush()
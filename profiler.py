@@ -0,0 +1,192 @@
+"""Opt-in instrumentation for a simulation run.
+
+A Simulation given a SimulationProfiler hands its run loop to the profiler, which records queue depth,
+events per simulated tick, per-device counters and where the time went. Without a profiler the plain loop
+in Simulation.run is used, so switching it off costs nothing.
+"""
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from event import Event
+from logsink import LogSink
+from scheduler import EventScheduler
+from topologychange import TopologyChange
+
+class _TimedSink(LogSink):
+    """Forwards to another sink, counting SENT and RECEIVED lines per device and timing every call"""
+    def __init__(self, log_sink: LogSink, profiler: 'SimulationProfiler'):
+        self._log_sink = log_sink
+        self._profiler = profiler
+
+    def write_event(self, event: Event) -> None:
+        profiler = self._profiler
+        if event.get_phase() == 'R':
+            profiler._received[event.get_receiver().get_device_id()] += 1
+        else:
+            profiler._sent[event.get_sender().get_device_id()] += 1
+        start = time.perf_counter()
+        self._log_sink.write_event(event)
+        profiler._logging_seconds += time.perf_counter() - start
+
+    def write_start(self, event: Event) -> None:
+        start = time.perf_counter()
+        self._log_sink.write_start(event)
+        self._profiler._logging_seconds += time.perf_counter() - start
+
+    def write_end(self, simulation_length: int) -> None:
+        start = time.perf_counter()
+        self._log_sink.write_end(simulation_length)
+        self._profiler._logging_seconds += time.perf_counter() - start
+
+    def write(self, line: str) -> None:
+        start = time.perf_counter()
+        self._log_sink.write(line)
+        self._profiler._logging_seconds += time.perf_counter() - start
+
+    def write_block(self, text: str) -> None:
+        start = time.perf_counter()
+        self._log_sink.write_block(text)
+        self._profiler._logging_seconds += time.perf_counter() - start
+
+    def flush(self) -> None:
+        start = time.perf_counter()
+        self._log_sink.flush()
+        self._profiler._logging_seconds += time.perf_counter() - start
+
+
+class _TimedQueue:
+    """Stands in for the EventScheduler while events execute, timing every push"""
+    def __init__(self, event_queue: EventScheduler, profiler: 'SimulationProfiler'):
+        self._event_queue = event_queue
+        self._profiler = profiler
+
+    def __len__(self) -> int:
+        return len(self._event_queue)
+
+    def push(self, event: Event) -> None:
+        start = time.perf_counter()
+        self._event_queue.push(event)
+        self._profiler._scheduling_seconds += time.perf_counter() - start
+
+    append = push
+
+
+class SimulationProfiler:
+    """Records per-step queue size, events per simulated tick, per-device sent/received/suppressed counters,
+    messages dropped by offline devices and the time spent scheduling, processing and logging"""
+    def __init__(self):
+        self._queue_sizes = []
+        self._events_per_tick = Counter()
+        self._sent = Counter()
+        self._received = Counter()
+        self._suppressed = Counter()
+        self._dropped_offline = Counter()
+        self._scheduling_seconds = 0.0
+        self._processing_seconds = 0.0
+        self._logging_seconds = 0.0
+        self._total_seconds = 0.0
+
+    def get_queue_sizes(self) -> list[int]:
+        """Gets the number of pending events left after each step"""
+        return self._queue_sizes
+
+    def get_events_per_tick(self) -> dict[int, int]:
+        """Gets the number of events executed at each simulated time"""
+        return dict(self._events_per_tick)
+
+    def get_device_counters(self) -> dict:
+        """Gets {device id: {'sent': n, 'received': n, 'suppressed': n, 'dropped_offline': n}} for every device
+        that saw traffic"""
+        device_ids = (self._sent.keys() | self._received.keys() | self._suppressed.keys()
+                      | self._dropped_offline.keys())
+        return {device_id: {'sent': self._sent[device_id], 'received': self._received[device_id],
+                            'suppressed': self._suppressed[device_id],
+                            'dropped_offline': self._dropped_offline[device_id]}
+                for device_id in sorted(device_ids, key=str)}
+
+    def get_timings(self) -> dict[str, float]:
+        """Gets the seconds spent scheduling, processing and logging, and for the whole run"""
+        return {'scheduling': self._scheduling_seconds, 'processing': self._processing_seconds,
+                'logging': self._logging_seconds, 'total': self._total_seconds}
+
+    def run(self, simulation: 'Simulation', until: int = None) -> None:
+        """Runs the simulation's pending events as Simulation.run would, recording as it goes.
+        With until, stops before that time without writing END."""
+        simulation_length = simulation.get_simulation_length()
+        stop_time = simulation_length if until is None else until
+        event_queue = simulation.get_event_queue()
+        timed_queue = _TimedQueue(event_queue, self)
+        log_sink = _TimedSink(simulation.get_log_sink(), self)
+        perf_counter = time.perf_counter
+        run_start = perf_counter()
+
+        while event_queue and event_queue.peek_time() < stop_time:
+            start = perf_counter()
+            current_event = event_queue.pop()
+            self._scheduling_seconds += perf_counter() - start
+
+            event_time = current_event.get_time()
+            #Topology changes are timed like events but are not delivered to a device. Anything else is an event or,
+            #when coalescing, one copy of a coalesced delivery, counted like the event it stands for
+            receiver = None if isinstance(current_event, TopologyChange) else current_event.get_receiver()
+            sent_before = self._sent[receiver.get_device_id()] if receiver is not None else 0
+            #Taken before executing, since a topology change can only run as an event of its own
+            online = receiver is None or receiver.is_online()
+            scheduling_before = self._scheduling_seconds
+            logging_before = self._logging_seconds
+
+            start = perf_counter()
+            current_event.execute(timed_queue, log_sink)
+            self._processing_seconds += (perf_counter() - start - (self._scheduling_seconds - scheduling_before)
+                                         - (self._logging_seconds - logging_before))
+
+            #An offline device drops the event unseen; otherwise a device with recipients that sent nothing had the
+            #event stopped by a cancellation
+            if receiver is not None:
+                if not online:
+                    self._dropped_offline[receiver.get_device_id()] += 1
+                elif receiver.has_recipients() and self._sent[receiver.get_device_id()] == sent_before:
+                    self._suppressed[receiver.get_device_id()] += 1
+            self._events_per_tick[event_time] += 1
+            self._queue_sizes.append(len(event_queue))
+
+        if until is None:
+            log_sink.write_end(simulation_length)
+        log_sink.flush()
+        self._total_seconds += perf_counter() - run_start
+
+    def to_dict(self, top: int = None) -> dict:
+        """Gets everything recorded as JSON-ready data; with top, only the busiest senders are listed"""
+        device_counters = self.get_device_counters()
+        if top is not None:
+            busiest = sorted(device_counters, key=lambda device_id: -device_counters[device_id]['sent'])[:top]
+            device_counters = {device_id: device_counters[device_id] for device_id in busiest}
+        events = sum(self._events_per_tick.values())
+        return {
+            'events': events,
+            'events_per_second': events / self._total_seconds if self._total_seconds else 0.0,
+            'max_queue_size': max(self._queue_sizes, default=0),
+            'queue_sizes': self._queue_sizes,
+            'events_per_tick': {str(tick): count for tick, count in sorted(self._events_per_tick.items())},
+            'devices': {str(device_id): counters for device_id, counters in device_counters.items()},
+            'seconds': self.get_timings(),
+        }
+
+    def write_json(self, file_path: Path) -> None:
+        """Writes everything recorded to a JSON file"""
+        Path(file_path).write_text(json.dumps(self.to_dict(), indent=2) + '\n')
+
+    def summary(self, top: int = 5) -> str:
+        """Formats a short report with the busiest devices first"""
+        report = self.to_dict(top)
+        ticks = len(self._events_per_tick)
+        lines = [f'events: {report["events"]} over {ticks} ticks '
+                 f'({report["events"] / ticks if ticks else 0:.1f} per tick, {report["events_per_second"]:.0f}/s)',
+                 f'queue size: max {report["max_queue_size"]}',
+                 'seconds: ' + ', '.join(f'{name} {seconds:.3f}' for name, seconds in report['seconds'].items()),
+                 f'top {top} devices by sent:']
+        for device_id, counters in report['devices'].items():
+            lines.append(f'  #{device_id}: sent {counters["sent"]}, received {counters["received"]}, '
+                         f'suppressed {counters["suppressed"]}, dropped offline {counters["dropped_offline"]}')
+        return '\n'.join(lines)
@@ -0,0 +1,254 @@
+"""Caches simulation logs on local disk, keyed by a hash of everything that decides the log.
+
+    cache = ResultCache('~/.cache/device-simulation', max_bytes=2 ** 30)
+    run_cached(scenario_path, cache, log_sink)
+
+The key is a SHA-256 over a canonical form of the simulation length, every device's edges in order and the
+start events and topology changes in the order they will run. Comments, blank lines and the order of DEVICE
+lines leave it unchanged, while anything that can change the log changes it. Each entry is a gzip file
+holding the log, one line per line, followed by the SHA-256 of those lines without a newline. An entry whose
+log no longer matches is deleted and treated as a miss. Entries are evicted least recently used first once
+the cache grows past max_bytes.
+
+Logs are streamed both ways: a run writes its log to the caller's sink and into the new entry at once, and a
+hit is opened once, checked in one pass over the entry and written out in a second, so no whole log is held
+in memory.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+from device import Device
+from devicesimulationmain import parse_input_file, run_simulation
+from logsink import LogSink, MemorySink, NullSink, STDOUT_SINK
+from scheduler import EVENT_PRIORITIES
+from topologychange import TopologyChange
+
+#Bump when a change to the engine changes the log of an existing scenario, so old entries stop matching
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 1024 ** 3
+_SUFFIX = '.log.gz'
+#Lines per write to the sink or the gzip file
+_BATCH_SIZE = 4096
+
+def scenario_key(simulation_length: int, devices: list[Device], event_list: list) -> str:
+    """Gets the cache key for a parsed scenario, as parse_input_file returns it"""
+    canonical_devices = []
+    for device in sorted(devices, key=lambda device: device.get_device_id()):
+        edges = [[recipient.get_device_id(), delay] for recipient, delay in device.get_recipients()]
+        canonical_devices.append([device.get_device_id(), edges,
+                                  sorted(device.get_cancelled_descriptions()), device.is_online()])
+    #Only the order among events with the same time and priority can change the pop order
+    canonical_events = []
+    for event in sorted(event_list, key=lambda event: (event.get_time(),
+                                                       EVENT_PRIORITIES.get(event.get_event_type(), -1))):
+        if isinstance(event, TopologyChange):
+            receiver = event.get_receiver()
+            canonical_events.append(['C', event.get_event_type(), event.get_device().get_device_id(),
+                                     None if receiver is None else receiver.get_device_id(), event.get_delay(),
+                                     event.get_time()])
+        else:
+            canonical_events.append(['E', event.get_receiver().get_device_id(), event.get_event_type(),
+                                     event.get_description(), event.get_time()])
+    canonical = json.dumps([CACHE_FORMAT, simulation_length, canonical_devices, canonical_events],
+                           separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """A directory of compressed logs named by scenario key, kept under max_bytes"""
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._directory = Path(directory).expanduser()
+        self._max_bytes = max_bytes
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def get_directory(self) -> Path:
+        """Gets the cache directory"""
+        return self._directory
+
+    def get_size(self) -> int:
+        """Gets the bytes taken by every entry"""
+        return sum(size for _, _, size in self._entries())
+
+    def _entry_path(self, key: str) -> Path:
+        return self._directory / f'{key}{_SUFFIX}'
+
+    def _entries(self) -> list[tuple]:
+        """Gets (last used time, path, size) for every entry"""
+        entries = []
+        for path in self._directory.glob(f'*{_SUFFIX}'):
+            try:
+                status = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, path, status.st_size))
+        return entries
+
+    @staticmethod
+    def _is_valid(file: BinaryIO) -> bool:
+        """Checks the open entry's lines against the hash that ends it, reading it a line at a time"""
+        log_hash = hashlib.sha256()
+        stored_hash = b''
+        for line in file:
+            if line.endswith(b'\n'):
+                log_hash.update(line)
+            else:
+                stored_hash = line
+        return log_hash.hexdigest().encode('ascii') == stored_hash
+
+    def write_to(self, key: str, log_sink: LogSink) -> bool:
+        """Writes the cached log for the key to the sink in blocks. Returns False, writing nothing, when the
+        entry is missing or fails verification."""
+        path = self._entry_path(key)
+        #The entry is opened once, so eviction by another process between the two passes cannot remove it
+        try:
+            file = gzip.open(path, 'rb')
+        except OSError:
+            return False
+        with file:
+            try:
+                valid = self._is_valid(file)
+            except (OSError, EOFError, zlib.error):
+                valid = False
+            if not valid:
+                self._discard(path)
+                return False
+            #The modification time is the entry's last use, which is what eviction goes by
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            file.seek(0)
+            lines = []
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                lines.append(line)
+                if len(lines) >= _BATCH_SIZE:
+                    log_sink.write_block(b''.join(lines)[:-1].decode('utf-8'))
+                    lines = []
+            if lines:
+                log_sink.write_block(b''.join(lines)[:-1].decode('utf-8'))
+        return True
+
+    def get(self, key: str) -> str or None:
+        """Gets the cached log for the key, or None when it is missing or fails verification"""
+        memory_sink = MemorySink()
+        if not self.write_to(key, memory_sink):
+            return None
+        return '\n'.join(memory_sink.get_lines())
+
+    def open_entry(self, key: str, log_sink: LogSink = None) -> '_EntryWriter':
+        """Gets a sink that passes every line on to log_sink while writing it into a new entry for the key.
+        The entry replaces any old one on commit() and is dropped by discard()."""
+        return _EntryWriter(self, key, NullSink() if log_sink is None else log_sink)
+
+    def put(self, key: str, log: str) -> None:
+        """Stores the log under the key, then evicts the least recently used entries while over max_bytes"""
+        entry_writer = self.open_entry(key)
+        try:
+            entry_writer.write_block(log)
+        except BaseException:
+            entry_writer.discard()
+            raise
+        entry_writer.commit()
+
+    def evict(self) -> None:
+        """Deletes the least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self._max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    def _discard(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _EntryWriter(LogSink):
+    """Passes every line on to another sink and writes it, hashed and compressed, to a temporary file in the
+    cache directory that is renamed into place on commit, so a reader never sees half an entry"""
+    def __init__(self, cache: ResultCache, key: str, log_sink: LogSink):
+        self._cache = cache
+        self._key = key
+        self._log_sink = log_sink
+        self._log_hash = hashlib.sha256()
+        self._lines = []
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache.get_directory(), suffix='.tmp')
+        self._temporary_path = Path(temporary_path)
+        self._raw_file = os.fdopen(file_descriptor, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb')
+
+    def write(self, line: str) -> None:
+        self._log_sink.write(line)
+        self._lines.append(line)
+        if len(self._lines) >= _BATCH_SIZE:
+            self._store()
+
+    def write_block(self, text: str) -> None:
+        self._log_sink.write_block(text)
+        self._lines.append(text)
+        self._store()
+
+    def flush(self) -> None:
+        self._log_sink.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _store(self) -> None:
+        if self._lines:
+            self._lines.append('')
+            data = '\n'.join(self._lines).encode('utf-8')
+            self._log_hash.update(data)
+            self._file.write(data)
+            self._lines = []
+
+    def commit(self) -> None:
+        """Finishes the entry, moves it into place and evicts while the cache is over its limit"""
+        try:
+            self._store()
+            self._file.write(self._log_hash.hexdigest().encode('ascii'))
+            self._file.close()
+            self._raw_file.close()
+            os.replace(self._temporary_path, self._cache._entry_path(self._key))
+        except BaseException:
+            self.discard()
+            raise
+        self._cache.evict()
+
+    def discard(self) -> None:
+        """Drops the unfinished entry"""
+        self._file.close()
+        self._raw_file.close()
+        self._cache._discard(self._temporary_path)
+
+
+def run_cached(file_path: Path, cache: ResultCache, log_sink: LogSink = None) -> bool:
+    """Writes the scenario's log to the sink from the cache, or runs it and caches the log.
+    Returns whether the log came from the cache."""
+    if log_sink is None:
+        log_sink = STDOUT_SINK
+    simulation_length, devices, event_list = parse_input_file(file_path)
+    key = scenario_key(simulation_length, devices, event_list)
+    if cache.write_to(key, log_sink):
+        log_sink.flush()
+        return True
+    #The log goes to the sink and the new entry as it is written, rather than being collected first
+    entry_writer = cache.open_entry(key, log_sink)
+    try:
+        run_simulation(simulation_length, event_list, entry_writer)
+    except BaseException:
+        entry_writer.discard()
+        raise
+    entry_writer.commit()
+    return False
@@ -0,0 +1,67 @@
+from collections import namedtuple
+from typing import Iterator, TextIO
+
+LengthRecord = namedtuple('LengthRecord', ['simulation_length', 'line_number'])
+DeviceRecord = namedtuple('DeviceRecord', ['device_id', 'line_number'])
+PropagateRecord = namedtuple('PropagateRecord', ['sender_id', 'receiver_id', 'delay', 'line_number'])
+AlertRecord = namedtuple('AlertRecord', ['device_id', 'description', 'time', 'line_number'])
+CancelRecord = namedtuple('CancelRecord', ['device_id', 'description', 'time', 'line_number'])
+#A timed topology change; receiver_id and delay are None where the change type has none
+ChangeRecord = namedtuple('ChangeRecord', ['change_type', 'device_id', 'receiver_id', 'delay', 'time', 'line_number'])
+
+
+class ScenarioSyntaxError(ValueError):
+    """A scenario line that does not match the format of its keyword"""
+    def __init__(self, line_number: int, line: str):
+        super().__init__(f'line {line_number}: MALFORMED LINE: {line}')
+        self.line_number = line_number
+        self.line = line
+
+
+def parse_scenario_line(line: str, line_number: int) -> tuple or None:
+    """Parses one scenario line into a typed record; blank lines, comments and unknown keywords give None"""
+    if line[0] in [' ', '\n', '#']:
+        return None
+    line = line.strip()
+    #A line of tabs or form feeds is blank too, but only shows it once stripped
+    if not line:
+        return None
+    #Keywords are matched as whole tokens, so LINKS or DEVICE_DOWNX are unknown rather than taken for LINK
+    keyword, *fields = line.split()
+
+    try:
+        if keyword == 'LENGTH':
+            simulation_length, = fields
+            return LengthRecord(int(simulation_length), line_number)
+        elif keyword == 'DEVICE':
+            device, = fields
+            return DeviceRecord(int(device), line_number)
+        elif keyword == 'PROPAGATE':
+            sender, receiver, delay = fields
+            return PropagateRecord(int(sender), int(receiver), int(delay), line_number)
+        elif keyword == 'ALERT':
+            beginning_device, description, time = fields
+            return AlertRecord(int(beginning_device), description, int(time), line_number)
+        elif keyword == 'CANCEL':
+            beginning_device, description, time = fields
+            return CancelRecord(int(beginning_device), description, int(time), line_number)
+        elif keyword in ('LINK', 'DELAY'):
+            sender, receiver, delay, time = fields
+            return ChangeRecord(keyword, int(sender), int(receiver), int(delay), int(time), line_number)
+        elif keyword == 'UNLINK':
+            sender, receiver, time = fields
+            return ChangeRecord(keyword, int(sender), int(receiver), None, int(time), line_number)
+        elif keyword in ('DEVICE_DOWN', 'DEVICE_UP'):
+            device, time = fields
+            return ChangeRecord(keyword, int(device), None, None, int(time), line_number)
+    except ValueError:
+        raise ScenarioSyntaxError(line_number, line) from None
+    return None
+
+def iter_scenario_records(file: TextIO) -> Iterator[tuple]:
+    """Yields one typed record per scenario line, reading the file a line at a time and raising
+    ScenarioSyntaxError at the first malformed line"""
+    for line_number, line in enumerate(file, start=1):
+        record = parse_scenario_line(line, line_number)
+        if record is not None:
+            yield record
@@ -0,0 +1,144 @@
+"""Checks a scenario file in one pass before anything is built or run, collecting every problem with its line.
+
+    python3 scenariovalidator.py scenario.txt
+
+Reports malformed lines, unknown keywords, a missing or repeated LENGTH, duplicate devices, references to
+devices that are never declared, negative delays and times, and start events or topology changes at or after
+LENGTH, which would never run. Devices may be declared after the lines that use them, so references to devices
+not declared yet are kept until the end of the file; LENGTH may come late too, so times seen before it are kept
+until it is read.
+"""
+import argparse
+import sys
+from collections import namedtuple
+from pathlib import Path
+from typing import TextIO
+from scenarioreader import (parse_scenario_line, ScenarioSyntaxError, LengthRecord, DeviceRecord, PropagateRecord,
+                            AlertRecord, CancelRecord, ChangeRecord)
+
+#line_number is None for problems with the file as a whole
+ScenarioProblem = namedtuple('ScenarioProblem', ['line_number', 'message'])
+
+def format_problem(problem: ScenarioProblem) -> str:
+    """Formats a problem as 'line N: MESSAGE'"""
+    if problem.line_number is None:
+        return problem.message
+    return f'line {problem.line_number}: {problem.message}'
+
+
+class ScenarioError(Exception):
+    """Raised for a scenario that fails validation, carrying every problem found"""
+    def __init__(self, problems: list[ScenarioProblem]):
+        super().__init__('\n'.join(format_problem(problem) for problem in problems))
+        self.problems = problems
+
+
+def validate_scenario(file: TextIO) -> list[ScenarioProblem]:
+    """Reads the scenario once and returns its problems in line order"""
+    problems = []
+    simulation_length = None
+    length_line_number = None
+    device_lines = {}
+    #(line number, device id, line) for devices not declared when they were referenced
+    forward_references = []
+    #(line number, time, line) for times read before LENGTH
+    early_times = []
+
+    def reference(line_number: int, device_id: int, line: str) -> None:
+        if device_id not in device_lines:
+            forward_references.append((line_number, device_id, line))
+
+    def check_time(line_number: int, time: int, line: str) -> None:
+        if time < 0:
+            problems.append(ScenarioProblem(line_number, f'NEGATIVE TIME IN {line}'))
+        elif simulation_length is None:
+            early_times.append((line_number, time, line))
+        elif time >= simulation_length:
+            problems.append(ScenarioProblem(line_number, f'{line} IS AT OR AFTER LENGTH {simulation_length}'))
+
+    def check_delay(line_number: int, delay: int, line: str) -> None:
+        if delay < 0:
+            problems.append(ScenarioProblem(line_number, f'NEGATIVE DELAY IN {line}'))
+
+    for line_number, line in enumerate(file, start=1):
+        try:
+            record = parse_scenario_line(line, line_number)
+        except ScenarioSyntaxError as error:
+            problems.append(ScenarioProblem(line_number, f'MALFORMED LINE: {error.line}'))
+            continue
+        if record is None:
+            if line[0] not in [' ', '\n', '#'] and line.strip():
+                problems.append(ScenarioProblem(line_number, f'UNKNOWN KEYWORD: {line.strip()}'))
+            continue
+        line = line.strip()
+
+        if isinstance(record, LengthRecord):
+            if simulation_length is not None:
+                problems.append(ScenarioProblem(line_number, f'LENGTH ALREADY SET ON LINE {length_line_number}'))
+            if record.simulation_length < 0:
+                problems.append(ScenarioProblem(line_number, f'NEGATIVE LENGTH IN {line}'))
+            simulation_length = record.simulation_length
+            length_line_number = line_number
+            for early_line_number, time, early_line in early_times:
+                check_time(early_line_number, time, early_line)
+            early_times = []
+        elif isinstance(record, DeviceRecord):
+            if record.device_id in device_lines:
+                first_line_number = device_lines[record.device_id]
+                problems.append(ScenarioProblem(line_number, f'DUPLICATE DEVICE #{record.device_id} '
+                                                             f'(FIRST DECLARED ON LINE {first_line_number})'))
+            else:
+                device_lines[record.device_id] = line_number
+        elif isinstance(record, PropagateRecord):
+            reference(line_number, record.sender_id, line)
+            reference(line_number, record.receiver_id, line)
+            check_delay(line_number, record.delay, line)
+        elif isinstance(record, (AlertRecord, CancelRecord)):
+            reference(line_number, record.device_id, line)
+            check_time(line_number, record.time, line)
+        elif isinstance(record, ChangeRecord):
+            reference(line_number, record.device_id, line)
+            if record.receiver_id is not None:
+                reference(line_number, record.receiver_id, line)
+            if record.delay is not None:
+                check_delay(line_number, record.delay, line)
+            check_time(line_number, record.time, line)
+
+    for line_number, device_id, line in forward_references:
+        if device_id not in device_lines:
+            problems.append(ScenarioProblem(line_number, f'UNKNOWN DEVICE #{device_id} IN {line}'))
+    problems.sort(key=lambda problem: problem.line_number)
+    if simulation_length is None:
+        problems.append(ScenarioProblem(None, 'MISSING LENGTH'))
+    return problems
+
+def validate_scenario_file(file_path: Path) -> list[ScenarioProblem]:
+    """Validates the scenario file, raising FileNotFoundError if it does not exist"""
+    with open(file_path, 'r') as file:
+        return validate_scenario(file)
+
+def check_scenario_file(file_path: Path) -> None:
+    """Raises ScenarioError if the scenario file has any problem"""
+    problems = validate_scenario_file(file_path)
+    if problems:
+        raise ScenarioError(problems)
+
+def main(argv: list[str] = None) -> int:
+    """Validates the scenarios named on the command line, printing their problems"""
+    parser = argparse.ArgumentParser(description='Check scenario files without running them.')
+    parser.add_argument('scenarios', nargs='+', type=Path, help='scenario files')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for scenario_path in args.scenarios:
+        try:
+            problems = validate_scenario_file(scenario_path)
+        except FileNotFoundError:
+            problems = [ScenarioProblem(None, 'FILE NOT FOUND')]
+        for problem in problems:
+            print(f'{scenario_path}: {format_problem(problem)}', file=sys.stderr)
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
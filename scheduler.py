@@ -0,0 +1,184 @@
+import heapq
+from event import Event, PHASE_SEND
+from logsink import LogSink
+
+#Orders events due at the same time; any other type is a topology change, which goes first so that messages
+#due at that time already see the new graph
+EVENT_PRIORITIES = {'ALERT': 0, 'CANCELLATION': 1}
+
+class EventScheduler:
+    """Priority queue of pending events ordered by time, topology changes before ALERT before CANCELLATION,
+    then insertion order"""
+    def __init__(self, events: list[Event] = ()):
+        self._heap = []
+        self._sequence = 0
+        for event in events:
+            self.push(event)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, event: Event) -> None:
+        """Pushes event onto the queue"""
+        heapq.heappush(self._heap, (event.get_time(), EVENT_PRIORITIES.get(event.get_event_type(), -1),
+                                    self._sequence, event))
+        self._sequence += 1
+
+    # Lets the scheduler stand in wherever a plain list was used as the event queue
+    append = push
+
+    def pop(self) -> Event:
+        """Removes and returns the next event to execute"""
+        return heapq.heappop(self._heap)[-1]
+
+    def peek_time(self) -> int:
+        """Gets the time of the next event without removing it"""
+        return self._heap[0][0]
+
+    def get_sequenced_events(self) -> list[tuple[int, Event]]:
+        """Gets the pending events with their insertion sequence numbers, in no particular order"""
+        return [(sequence, event) for _, _, sequence, event in self._heap]
+
+    def get_next_sequence(self) -> int:
+        """Gets the sequence number the next pushed event will get"""
+        return self._sequence
+
+    def restore(self, sequenced_events: list[tuple[int, Event]], next_sequence: int) -> None:
+        """Replaces the pending events with ones taken from get_sequenced_events, keeping their tie-break order"""
+        self._heap = [(event.get_time(), EVENT_PRIORITIES.get(event.get_event_type(), -1), sequence, event)
+                      for sequence, event in sequenced_events]
+        heapq.heapify(self._heap)
+        self._sequence = next_sequence
+
+
+class _Deliveries:
+    """Pending copies of one ALERT delivery: same receiver, description and time, each with its own sequence
+    number. The first copy to run is executed as usual and what it writes and queues is recorded; the others
+    replay that record with their own RECEIVED line."""
+    __slots__ = ('_time', '_key', '_events', '_sequences', '_popped', '_written', '_children')
+
+    def __init__(self, event: Event, key: tuple):
+        self._time = event._time
+        self._key = key
+        #Sequence numbers only grow, so copies are appended in pop order
+        self._events = []
+        self._sequences = []
+        self._popped = 0
+        self._written = None
+        self._children = []
+
+    def get_time(self) -> int:
+        """Gets time"""
+        return self._time
+
+    def get_receiver(self) -> 'Device':
+        """Gets the receiver every copy is delivered to"""
+        return self._events[0].get_receiver()
+
+    def execute(self, event_queue: 'EventScheduler', log_sink: LogSink) -> None:
+        """Executes the copy popped last"""
+        event = self._events[self._popped - 1]
+        if self._written is None:
+            recorder = _Recorder(event_queue, log_sink, self._children)
+            event.execute(recorder, recorder)
+            self._written = recorder.written
+            return
+        #Nothing written means the receiver was offline, which it still is for every later copy
+        if self._written:
+            log_sink.write_event(event)
+            for sent_event in self._written[1:]:
+                log_sink.write_event(sent_event)
+            for child in self._children:
+                event_queue.push(child)
+
+
+class _Recorder:
+    """Stands in for both the queue and the log sink while the first copy of a delivery runs, passing
+    everything on and keeping what went by"""
+    __slots__ = ('_event_queue', '_log_sink', '_children', 'written')
+
+    def __init__(self, event_queue: 'EventScheduler', log_sink: LogSink, children: list[Event]):
+        self._event_queue = event_queue
+        self._log_sink = log_sink
+        self._children = children
+        self.written = []
+
+    def push(self, event: Event) -> None:
+        self._children.append(event)
+        self._event_queue.push(event)
+
+    append = push
+
+    def write_event(self, event: Event) -> None:
+        self.written.append(event)
+        self._log_sink.write_event(event)
+
+
+class CoalescingScheduler(EventScheduler):
+    """EventScheduler that holds identical pending ALERT deliveries as one entry and runs the device's
+    processing once for all of them.
+
+    In graphs with many cycles the same alert reaches a device at the same time along many paths. Every copy
+    still writes its RECEIVED line, and the SENT lines and children of the first copy, at the position its own
+    sequence number gives it, so the log is unchanged. Replaying is safe because nothing that decides how a
+    device handles an alert can change between copies due at the same time: topology changes at that time run
+    before every alert, cancellations after, and handling an alert changes no state. Cancellations are not
+    coalesced, since the first one received changes what the others do.
+    """
+    def __init__(self, events: list[Event] = ()):
+        #(receiver, description, time) -> _Deliveries with copies still to pop
+        self._pending = {}
+        super().__init__(events)
+
+    def push(self, event: Event) -> None:
+        """Pushes event onto the queue, adding it to the pending copies of the same delivery if there are any"""
+        #Runs once per delivery, so it reads the event's slots directly
+        if type(event) is not Event or event._phase == PHASE_SEND or event._event_type != 'ALERT':
+            super().push(event)
+            return
+        key = (event._receiver, event._description, event._time)
+        deliveries = self._pending.get(key)
+        if deliveries is None:
+            deliveries = self._pending[key] = _Deliveries(event, key)
+            heapq.heappush(self._heap, (event._time, EVENT_PRIORITIES['ALERT'], self._sequence, deliveries))
+        deliveries._events.append(event)
+        deliveries._sequences.append(self._sequence)
+        self._sequence += 1
+
+    append = push
+
+    def pop(self) -> Event or _Deliveries:
+        """Removes and returns the next event to execute; a coalesced delivery is returned once per copy and
+        runs the copy whose turn it is"""
+        time, priority, _, event = heapq.heappop(self._heap)
+        if type(event) is _Deliveries:
+            event._popped += 1
+            if event._popped < len(event._sequences):
+                heapq.heappush(self._heap, (time, priority, event._sequences[event._popped], event))
+            else:
+                #Copies queued from now on, by alerts at this same time, start a new entry
+                del self._pending[event._key]
+        return event
+
+    def get_sequenced_events(self) -> list[tuple[int, Event]]:
+        """Gets the pending events with their insertion sequence numbers, one per copy, in no particular order"""
+        sequenced_events = []
+        for _, _, sequence, event in self._heap:
+            if type(event) is _Deliveries:
+                sequenced_events.extend(zip(event._sequences[event._popped:], event._events[event._popped:]))
+            else:
+                sequenced_events.append((sequence, event))
+        return sequenced_events
+
+    def get_copy_count(self) -> int:
+        """Gets the number of pending events counting every copy, which is what EventScheduler would hold"""
+        return len(self.get_sequenced_events())
+
+    def restore(self, sequenced_events: list[tuple[int, Event]], next_sequence: int) -> None:
+        """Replaces the pending events with ones taken from get_sequenced_events, keeping their tie-break order"""
+        self._heap = []
+        self._pending = {}
+        for sequence, event in sorted(sequenced_events, key=lambda entry: entry[0]):
+            self._sequence = sequence
+            self.push(event)
+        self._sequence = next_sequence
@@ -0,0 +1,105 @@
+import sys
+from event import Event
+from logsink import LogSink, STDOUT_SINK
+from scheduler import EventScheduler, CoalescingScheduler
+
+class Simulation:
+    """Owns the state of one simulation: its length, devices, pending events, log sink and optional profiler"""
+    def __init__(self, simulation_length: int, log_sink: LogSink = None, profiler: 'SimulationProfiler' = None,
+                 coalesce: bool = False):
+        self._simulation_length = simulation_length
+        self._devices = []
+        self._event_queue = CoalescingScheduler() if coalesce else EventScheduler()
+        self._log_sink = STDOUT_SINK if log_sink is None else log_sink
+        self._profiler = profiler
+
+    def get_simulation_length(self) -> int:
+        """Gets simulation length"""
+        return self._simulation_length
+
+    def set_simulation_length(self, simulation_length: int) -> None:
+        """Sets simulation length, such as to extend a run resumed from a checkpoint"""
+        self._simulation_length = simulation_length
+
+    def get_devices(self) -> list['Device']:
+        """Gets the devices in creation order"""
+        return self._devices
+
+    def get_event_queue(self) -> EventScheduler:
+        """Gets the queue of pending events"""
+        return self._event_queue
+
+    def is_coalescing(self) -> bool:
+        """Gets whether identical pending alert deliveries are held and processed once"""
+        return isinstance(self._event_queue, CoalescingScheduler)
+
+    def set_coalescing(self, coalesce: bool) -> None:
+        """Switches between EventScheduler and CoalescingScheduler, moving any pending events across"""
+        if coalesce == self.is_coalescing():
+            return
+        event_queue = CoalescingScheduler() if coalesce else EventScheduler()
+        event_queue.restore(self._event_queue.get_sequenced_events(), self._event_queue.get_next_sequence())
+        self._event_queue = event_queue
+
+    def get_log_sink(self) -> LogSink:
+        """Gets log sink"""
+        return self._log_sink
+
+    def set_log_sink(self, log_sink: LogSink) -> None:
+        """Sets log sink"""
+        self._log_sink = log_sink
+
+    def get_profiler(self) -> 'SimulationProfiler' or None:
+        """Gets the profiler, or None when the run is not instrumented"""
+        return self._profiler
+
+    def set_profiler(self, profiler: 'SimulationProfiler' or None) -> None:
+        """Sets the profiler that runs and records the simulation; None turns instrumentation off"""
+        self._profiler = profiler
+
+    def add_device(self, device: 'Device') -> None:
+        """Adds a device; called by Device when it is created for this simulation"""
+        self._devices.append(device)
+
+    def schedule(self, event: Event) -> None:
+        """Adds an event to the pending queue"""
+        self._event_queue.push(event)
+
+    def run(self, until: int = None) -> None:
+        """Executes pending events in order until none are left before the end of the simulation.
+        With until, stops before that time without writing END, so the run can be continued or checkpointed"""
+        if until is not None:
+            self._run_until(min(until, self._simulation_length))
+            return
+        if self._profiler is not None:
+            self._profiler.run(self)
+            return
+        event_queue = self._event_queue
+        log_sink = self._log_sink
+
+        while event_queue:
+            current_event = event_queue.pop()
+
+            if current_event.get_time() >= self._simulation_length:
+                break
+            current_event.execute(event_queue, log_sink)
+
+        log_sink.write_end(self._simulation_length)
+        log_sink.flush()
+
+    def _run_until(self, stop_time: int) -> None:
+        simulation_length = self._simulation_length
+        #Devices drop events landing at or after the simulation length. Lifting it while the prefix runs keeps
+        #those events pending, so the length can still be extended later; they sort after everything before it.
+        self._simulation_length = sys.maxsize
+        try:
+            if self._profiler is not None:
+                self._profiler.run(self, stop_time)
+                return
+            event_queue = self._event_queue
+            log_sink = self._log_sink
+            while event_queue and event_queue.peek_time() < stop_time:
+                event_queue.pop().execute(event_queue, log_sink)
+            log_sink.flush()
+        finally:
+            self._simulation_length = simulation_length
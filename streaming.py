@@ -0,0 +1,86 @@
+"""Runs a simulation as a stream of structured log records instead of printed lines.
+
+    for record in iter_records(simulation):
+        ...
+
+    async for record in aiter_records(simulation):
+        ...
+
+Both forms only advance the simulation when the consumer asks for the next record, so a slow consumer holds the
+run back rather than letting records pile up. The async form also hands control back to the event loop every
+yield_every events, so a long run cannot starve other tasks.
+"""
+import asyncio
+from collections import namedtuple
+from typing import AsyncIterator, Iterator
+from logsink import LogSink
+from simulation import Simulation
+
+LogRecord = namedtuple('LogRecord', ['time', 'phase', 'sender_id', 'receiver_id', 'event_type', 'description'])
+
+def format_record(record: LogRecord) -> str:
+    """Formats a record as the SENT or RECEIVED log line"""
+    if record.phase == 'R':
+        return (f'@{record.time}: #{record.receiver_id} RECEIVED {record.event_type} FROM #{record.sender_id}: '
+                f'{record.description}')
+    return (f'@{record.time}: #{record.sender_id} SENT {record.event_type} TO #{record.receiver_id}: '
+            f'{record.description}')
+
+class _RecordCollector(LogSink):
+    """Turns the events a step logs into records instead of lines"""
+    def __init__(self):
+        self._records = []
+
+    def get_records(self) -> list[LogRecord]:
+        """Gets the records collected since the list was last cleared"""
+        return self._records
+
+    def write_event(self, event: 'Event') -> None:
+        self._records.append(LogRecord(event.get_time(), event.get_phase(), event.get_sender().get_device_id(),
+                                       event.get_receiver().get_device_id(), event.get_event_type(),
+                                       event.get_description()))
+
+    def write_end(self, simulation_length: int) -> None:
+        pass
+
+    def write(self, line: str) -> None:
+        pass
+
+def _iter_steps(simulation: Simulation) -> Iterator[list[LogRecord]]:
+    """Executes pending events as Simulation.run would, yielding the records of each one, possibly none"""
+    simulation_length = simulation.get_simulation_length()
+    event_queue = simulation.get_event_queue()
+    collector = _RecordCollector()
+    records = collector.get_records()
+
+    while event_queue:
+        current_event = event_queue.pop()
+
+        if current_event.get_time() >= simulation_length:
+            break
+        current_event.execute(event_queue, collector)
+        yield records
+        records.clear()
+
+def iter_records(simulation: Simulation) -> Iterator[LogRecord]:
+    """Runs the simulation, yielding a record for every SENT and RECEIVED line as it happens"""
+    for records in _iter_steps(simulation):
+        yield from records
+
+async def aiter_records(simulation: Simulation, yield_every: int = 1000) -> AsyncIterator[LogRecord]:
+    """Runs the simulation, yielding a record for every SENT and RECEIVED line as it happens and letting other
+    tasks run after every yield_every events"""
+    for step, records in enumerate(_iter_steps(simulation), start=1):
+        for record in records:
+            yield record
+        if step % yield_every == 0:
+            await asyncio.sleep(0)
+
+def write_records(simulation: Simulation, log_sink: LogSink = None) -> None:
+    """Runs the simulation through iter_records into a log sink, giving the same log as Simulation.run"""
+    if log_sink is None:
+        log_sink = simulation.get_log_sink()
+    for record in iter_records(simulation):
+        log_sink.write(format_record(record))
+    log_sink.write_end(simulation.get_simulation_length())
+    log_sink.flush()
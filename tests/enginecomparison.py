@@ -0,0 +1,44 @@
+"""Shared checks for the engines that have to reproduce run_simulation's log line for line"""
+import unittest
+import io
+from typing import Callable
+from devicesimulationmain import run_simulation
+from logsink import MemorySink
+from scenarioreader import iter_scenario_records
+from topology import Topology
+from benchmarks.generators import SHAPES, to_topology
+
+#Loops, a cancellation and every kind of topology change, some of them at the same time as deliveries
+TOPOLOGY_CHANGE_SCENARIO = ('LENGTH 280\nDEVICE 1\nDEVICE 2\nDEVICE 3\nDEVICE 4\n'
+                            'PROPAGATE 1 2 5\nPROPAGATE 2 1 5\nPROPAGATE 2 3 20\nPROPAGATE 3 4 5\nPROPAGATE 4 3 5\n'
+                            'PROPAGATE 4 1 30\nALERT 1 Loop 0\nALERT 3 Other 0\nCANCEL 2 Loop 150\n'
+                            'DEVICE_DOWN 4 100\nDEVICE_UP 4 200\nDELAY 2 3 25 120\nUNLINK 3 4 260\nLINK 1 4 40 230\n')
+
+def scenario_topology(scenario: str) -> Topology:
+    """Reads the scenario text into a Topology"""
+    topology = Topology()
+    for record in iter_scenario_records(io.StringIO(scenario)):
+        topology.add_record(record)
+    return topology
+
+
+class EngineComparisonTest(unittest.TestCase):
+    """Base for the tests of an engine, comparing its log with run_simulation's"""
+    def assert_same_log(self, build_topology: Callable[[], Topology], run_engine: Callable, **options) -> None:
+        sequential_sink = MemorySink()
+        simulation_length, _, event_list = build_topology().build()
+        run_simulation(simulation_length, event_list, sequential_sink)
+
+        engine_sink = MemorySink()
+        simulation_length, _, event_list = build_topology().build()
+        run_engine(simulation_length, event_list, engine_sink, **options)
+
+        self.assertEqual(engine_sink.get_lines(), sequential_sink.get_lines())
+
+    def assert_same_log_on_shapes(self, run_engine: Callable, alert_count: int, description_count: int) -> None:
+        for shape, generate in SHAPES.items():
+            for workers in [2, 3]:
+                with self.subTest(shape=shape, workers=workers):
+                    scenario = generate(40, 8 if shape != 'ring' else 60, alert_count=alert_count, cancel_ratio=0.5,
+                                        description_count=description_count, seed=workers)
+                    self.assert_same_log(lambda: to_topology(scenario), run_engine, workers=workers)
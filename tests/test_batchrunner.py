@@ -0,0 +1,63 @@
+import contextlib
+import io
+import unittest
+import tempfile
+from pathlib import Path
+from batchrunner import find_scenarios, main, run_batch, run_scenario
+
+
+class BatchRunnerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        (self.root / 'scenarios').mkdir()
+        (self.root / 'scenarios' / 'short.txt').write_text(
+            'LENGTH 300\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 100\nALERT 1 Trouble 0\n')
+        (self.root / 'scenarios' / 'long.txt').write_text(
+            'LENGTH 900\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 800\nALERT 1 Trouble 0\n')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_find_scenarios(self) -> None:
+        scenario_directory = self.root / 'scenarios'
+        self.assertEqual(find_scenarios([str(scenario_directory)]),
+                         [scenario_directory / 'long.txt', scenario_directory / 'short.txt'])
+        self.assertEqual(find_scenarios([str(scenario_directory / 's*.txt')]), [scenario_directory / 'short.txt'])
+
+    def test_run_batch_writes_one_log_per_scenario(self) -> None:
+        scenario_paths = find_scenarios([str(self.root / 'scenarios')]) + [self.root / 'missing.txt']
+        results = run_batch(scenario_paths, self.root / 'logs', workers=2)
+
+        self.assertEqual([result.error for result in results[:2]], [None, None])
+        self.assertIn('FileNotFoundError', results[2].error)
+        self.assertEqual((self.root / 'logs' / 'long.log').read_text(),
+                         '@0: #1 SENT ALERT TO #2: Trouble\n@800: #2 RECEIVED ALERT FROM #1: Trouble\n@900: END\n')
+        self.assertEqual((self.root / 'logs' / 'short.log').read_text(),
+                         '@0: #1 SENT ALERT TO #2: Trouble\n@100: #2 RECEIVED ALERT FROM #1: Trouble\n@300: END\n')
+
+    def test_simulation_length_does_not_leak_between_scenarios(self) -> None:
+        run_scenario(self.root / 'scenarios' / 'long.txt', self.root / 'long.log')
+        run_scenario(self.root / 'scenarios' / 'short.txt', self.root / 'short.log')
+
+        self.assertEqual((self.root / 'short.log').read_text(),
+                         '@0: #1 SENT ALERT TO #2: Trouble\n@100: #2 RECEIVED ALERT FROM #1: Trouble\n@300: END\n')
+
+    def test_invalid_scenario_fails_before_running(self) -> None:
+        scenario_path = self.root / 'scenarios' / 'invalid.txt'
+        scenario_path.write_text('LENGTH 100\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 -5\nLINKS 1 2 5 10\n')
+
+        for cache_directory in [None, self.root / 'cache']:
+            result = run_scenario(scenario_path, self.root / 'invalid.log', cache_directory)
+            self.assertEqual(result.error, 'ScenarioError: line 4: NEGATIVE DELAY IN PROPAGATE 1 2 -5\n'
+                                           'line 5: UNKNOWN KEYWORD: LINKS 1 2 5 10')
+            self.assertFalse((self.root / 'invalid.log').exists())
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main([str(scenario_path), '--output-dir', str(self.root / 'logs'), '--workers', '1']), 1)
+        self.assertIn(f'FAIL {scenario_path}', output.getvalue())
+        self.assertIn('0 succeeded, 1 failed', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
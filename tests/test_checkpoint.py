@@ -0,0 +1,80 @@
+import unittest
+import tempfile
+from pathlib import Path
+from checkpoint import save_checkpoint, load_checkpoint
+from devicesimulationmain import load_simulation
+from logsink import MemorySink
+from benchmarks.generators import random_graph, build_simulation
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = Path(self.directory.name) / 'run.ckpt'
+        self.scenario = random_graph(30, 40, degree=2, alert_count=4, cancel_ratio=0.5, description_count=2, seed=5)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _run_whole(self, simulation_length: int) -> list[str]:
+        simulation = build_simulation(self.scenario, MemorySink())
+        simulation.set_simulation_length(simulation_length)
+        simulation.run()
+        return simulation.get_log_sink().get_lines()
+
+    def test_resumed_run_matches_uninterrupted_run(self) -> None:
+        for checkpoint_time in [0, 17, 39, 40, 100]:
+            with self.subTest(checkpoint_time=checkpoint_time):
+                prefix_sink = MemorySink()
+                simulation = build_simulation(self.scenario, prefix_sink)
+                simulation.run(until=checkpoint_time)
+                save_checkpoint(simulation, self.checkpoint_path)
+
+                suffix_sink = MemorySink()
+                load_checkpoint(self.checkpoint_path, suffix_sink).run()
+
+                self.assertEqual(prefix_sink.get_lines() + suffix_sink.get_lines(), self._run_whole(40))
+
+    def test_extended_run_matches_longer_run(self) -> None:
+        prefix_sink = MemorySink()
+        simulation = build_simulation(self.scenario, prefix_sink)
+        simulation.run(until=38)
+        save_checkpoint(simulation, self.checkpoint_path)
+
+        suffix_sink = MemorySink()
+        load_checkpoint(self.checkpoint_path, suffix_sink, simulation_length=55).run()
+
+        self.assertEqual(prefix_sink.get_lines() + suffix_sink.get_lines(), self._run_whole(55))
+
+    def test_pending_topology_changes_survive_checkpoint(self) -> None:
+        scenario_path = Path(self.directory.name) / 'scenario.txt'
+        scenario_path.write_text('LENGTH 500\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 10\nPROPAGATE 2 1 10\n'
+                                 'ALERT 1 Loop 0\nDEVICE_DOWN 2 100\nDEVICE_UP 2 200\nDELAY 1 2 30 300\n'
+                                 'UNLINK 2 1 400\n')
+        whole_sink = MemorySink()
+        load_simulation(scenario_path, whole_sink).run()
+
+        for checkpoint_time in [50, 150, 250]:
+            with self.subTest(checkpoint_time=checkpoint_time):
+                log_sink = MemorySink()
+                simulation = load_simulation(scenario_path, log_sink)
+                simulation.run(until=checkpoint_time)
+                save_checkpoint(simulation, self.checkpoint_path)
+                load_checkpoint(self.checkpoint_path, log_sink).run()
+
+                self.assertEqual(log_sink.get_lines(), whole_sink.get_lines())
+
+    def test_run_can_be_split_several_times(self) -> None:
+        log_sink = MemorySink()
+        simulation = build_simulation(self.scenario, log_sink)
+        for checkpoint_time in [10, 20, 30]:
+            simulation.run(until=checkpoint_time)
+            save_checkpoint(simulation, self.checkpoint_path)
+            simulation = load_checkpoint(self.checkpoint_path, log_sink)
+        simulation.run()
+
+        self.assertEqual(log_sink.get_lines(), self._run_whole(40))
+
+
+if __name__ == '__main__':
+    unittest.main()
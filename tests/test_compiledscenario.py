@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+from compiledscenario import compile_scenario, load_compiled_simulation
+from devicesimulationmain import load_simulation
+from logsink import MemorySink
+from benchmarks.generators import SHAPES, write_scenario
+
+
+class CompiledScenarioTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _text_lines(self, scenario_path: Path) -> list[str]:
+        log_sink = MemorySink()
+        load_simulation(scenario_path, log_sink).run()
+        return log_sink.get_lines()
+
+    def test_compiled_run_matches_text_run(self) -> None:
+        for shape, generate in SHAPES.items():
+            with self.subTest(shape=shape):
+                scenario_path = self.root / f'{shape}.txt'
+                compiled_path = self.root / f'{shape}.bin'
+                write_scenario(generate(30, 8, alert_count=3, cancel_ratio=0.5, description_count=2, seed=2),
+                               scenario_path)
+                self.assertEqual(compile_scenario(scenario_path, compiled_path), [])
+
+                log_sink = MemorySink()
+                load_compiled_simulation(compiled_path, log_sink).run()
+                self.assertEqual(log_sink.get_lines(), self._text_lines(scenario_path))
+
+    def test_big_endian_host_reads_little_endian_arrays(self) -> None:
+        scenario_path = self.root / 'random.txt'
+        compiled_path = self.root / 'random.bin'
+        write_scenario(SHAPES['random'](30, 8, alert_count=3, cancel_ratio=0.5, seed=1), scenario_path)
+        compile_scenario(scenario_path, compiled_path)
+
+        log_sink = MemorySink()
+        with mock.patch('sys.byteorder', 'big'):
+            load_compiled_simulation(compiled_path, log_sink).run()
+        self.assertEqual(log_sink.get_lines(), self._text_lines(scenario_path))
+
+    def test_events_file_replaces_compiled_events(self) -> None:
+        scenario_path = self.root / 'scenario.txt'
+        scenario_path.write_text('LENGTH 600\nDEVICE 1\nDEVICE 2\nDEVICE 3\nPROPAGATE 1 2 100\nPROPAGATE 2 3 100\n'
+                                 'PROPAGATE 3 1 100\nDEVICE 3\nALERT 1 Trouble 0\n')
+        compiled_path = self.root / 'scenario.bin'
+        self.assertEqual(compile_scenario(scenario_path, compiled_path), ['DUPLICATE DEVICE #3'])
+
+        events_path = self.root / 'events.txt'
+        events_path.write_text('LENGTH 450\nCANCEL 3 Fire 250\nALERT 2 Fire 0\nALERT 1 Flood 50\n')
+        log_sink = MemorySink()
+        load_compiled_simulation(compiled_path, log_sink, events_path).run()
+
+        text_path = self.root / 'combined.txt'
+        text_path.write_text('LENGTH 450\nDEVICE 1\nDEVICE 2\nDEVICE 3\nPROPAGATE 1 2 100\nPROPAGATE 2 3 100\n'
+                             'PROPAGATE 3 1 100\nCANCEL 3 Fire 250\nALERT 2 Fire 0\nALERT 1 Flood 50\n')
+        self.assertEqual(log_sink.get_lines(), self._text_lines(text_path))
+
+    def test_topology_changes_are_compiled(self) -> None:
+        scenario_path = self.root / 'scenario.txt'
+        scenario_path.write_text('LENGTH 500\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 10\nPROPAGATE 2 1 10\n'
+                                 'ALERT 1 Loop 0\nDEVICE_DOWN 2 100\nDEVICE_UP 2 200\nDELAY 1 2 30 300\n'
+                                 'UNLINK 2 1 400\nLINK 2 1 5 450\n')
+        compiled_path = self.root / 'scenario.bin'
+        compile_scenario(scenario_path, compiled_path)
+
+        log_sink = MemorySink()
+        load_compiled_simulation(compiled_path, log_sink).run()
+        self.assertEqual(log_sink.get_lines(), self._text_lines(scenario_path))
+
+    def test_rejects_other_files(self) -> None:
+        other_path = self.root / 'scenario.txt'
+        other_path.write_text('LENGTH 600\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 100\nALERT 1 Trouble 0\n' * 4)
+
+        with self.assertRaises(ValueError):
+            load_compiled_simulation(other_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+from descriptionengine import run_description_simulation
+from benchmarks.generators import SHAPES, to_topology
+from enginecomparison import EngineComparisonTest, TOPOLOGY_CHANGE_SCENARIO, scenario_topology
+
+
+class DescriptionEngineTest(EngineComparisonTest):
+    def test_matches_sequential_engine(self) -> None:
+        self.assert_same_log_on_shapes(run_description_simulation, alert_count=6, description_count=4)
+
+    def test_ties_across_descriptions_keep_sequential_order(self) -> None:
+        #Every message arrives at the same times, and the cancellations tie with the alerts they follow
+        scenario = ('LENGTH 40\nDEVICE 1\nDEVICE 2\nDEVICE 3\n'
+                    'PROPAGATE 1 2 5\nPROPAGATE 1 3 5\nPROPAGATE 2 3 0\nPROPAGATE 3 1 5\n'
+                    'CANCEL 2 Red 5\nALERT 1 Blue 0\nALERT 1 Red 0\nALERT 3 Green 0\nCANCEL 1 Blue 10\n'
+                    'ALERT 2 Green 5\n')
+        self.assert_same_log(lambda: scenario_topology(scenario), run_description_simulation, workers=3)
+
+    def test_matches_sequential_engine_with_topology_changes(self) -> None:
+        self.assert_same_log(lambda: scenario_topology(TOPOLOGY_CHANGE_SCENARIO), run_description_simulation,
+                             workers=2)
+
+    def test_single_description_falls_back_to_sequential_engine(self) -> None:
+        scenario = SHAPES['ring'](10, 100, alert_count=2, seed=1)
+        with mock.patch('descriptionengine.ProcessPoolExecutor') as pool:
+            self.assert_same_log(lambda: to_topology(scenario), run_description_simulation, workers=4)
+        pool.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
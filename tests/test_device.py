@@ -13,7 +13,7 @@ class DeviceClassTest(unittest.TestCase):
 
     def test_device_simulation_length(self) -> None:
         test_device = Device(7, 999)
-        self.assertEqual(Device.simulation_length, 999)
+        self.assertEqual(test_device.get_simulation_length(), 999)
 
     def test_one_recipient_add(self) -> None:
         test_device = Device(3, 999)
@@ -32,6 +32,19 @@ class DeviceClassTest(unittest.TestCase):
         test_device.add_recipient(receiver_device_three, 650)
         self.assertEqual(test_device.get_recipients(), [(receiver_device_one, 450), (receiver_device_two, 550), (receiver_device_three, 650)])
 
+    def test_remove_and_redelay_recipients_keep_order(self) -> None:
+        test_device = Device(1, 999)
+        receivers = [Device(device_id, 999) for device_id in range(2, 5)]
+        for receiver in receivers:
+            test_device.add_recipient(receiver, 100)
+        test_device.add_recipient(receivers[0], 200)
+
+        self.assertEqual(test_device.set_recipient_delay(receivers[1], 50), 1)
+        self.assertEqual(test_device.remove_recipient(receivers[0]), 2)
+        self.assertEqual(test_device.remove_recipient(receivers[0]), 0)
+        test_device.add_recipient(receivers[0], 300)
+        self.assertEqual(test_device.get_recipients(), [(receivers[1], 50), (receivers[2], 100), (receivers[0], 300)])
+
     def test_receive_message(self) -> None:
         sender_device = Device(1, 999)
         test_device = Device(2, 999)
@@ -141,6 +154,25 @@ class DeviceClassTest(unittest.TestCase):
 
         self.assertEqual(len(event_queue), 1)
 
+    def test_alert_at_cancel_time_still_sent(self) -> None:
+        event_queue = []
+        self.device1.add_cancelled_description("Cancel Task", 4)
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.device1.process_events(Event(None, self.device1, "ALERT", "Cancel Task", 4, 'S'), event_queue)
+            self.device1.process_events(Event(None, self.device1, "ALERT", "Cancel Task", 5, 'S'), event_queue)
+        self.assertEqual(output.getvalue(), "@4: #1 SENT ALERT TO #2: Cancel Task\n")
+        self.assertEqual(len(event_queue), 1)
+
+    def test_earliest_cancel_time_kept(self) -> None:
+        self.device1.add_cancelled_description("Cancel Task", 6)
+        self.device1.add_cancelled_description("Cancel Task", 3)
+        self.device1.add_cancelled_description("Cancel Task", 8)
+
+        self.assertEqual(self.device1.get_cancel_time("Cancel Task"), 3)
+        self.assertEqual(self.device1.get_cancel_time("Other Task"), None)
+        self.assertEqual(self.device1.get_cancelled_descriptions(), [("Cancel Task", 3)])
+
     def test_event_outside_simulation_length(self) -> None:
         event_queue = []
         event = Event(self.device1, self.device1, "ALERT", "Late Event", 9, 'S')
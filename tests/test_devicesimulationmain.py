@@ -2,10 +2,13 @@ import unittest
 from device import Device
 from event import Event
 import tempfile
-from devicesimulationmain import parse_input_file, run_simulation
+from devicesimulationmain import main, parse_input_file, run_simulation
 from pathlib import Path
 import io
 import contextlib
+import subprocess
+import sys
+from unittest import mock
 
 
 class SimulationTest(unittest.TestCase):
@@ -98,10 +101,93 @@ class SimulationTest(unittest.TestCase):
 
 
     def test_file_not_found(self) -> None:
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(FileNotFoundError):
+            parse_input_file(Path("non_existent_file.txt"))
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["non_existent_file.txt"]), 1)
+        self.assertEqual(output.getvalue(), "FILE NOT FOUND\n")
+
+    def test_main_refuses_invalid_scenario(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            scenario_path = Path(directory) / 'scenario.txt'
+            scenario_path.write_text('LENGTH 100\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 -5\nALERT 1 Trouble 0\n')
+            with contextlib.redirect_stdout(io.StringIO()) as output, \
+                    contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(main([str(scenario_path), '--check-only']), 1)
+                self.assertEqual(main([str(scenario_path)]), 1)
+            self.assertEqual(output.getvalue(), "")
+            self.assertEqual(errors.getvalue(), "line 4: NEGATIVE DELAY IN PROPAGATE 1 2 -5\n" * 2)
+
+            #Near misses of the topology change keywords are refused before the run, not by TopologyChange
+            scenario_path.write_text('LENGTH 100\nDEVICE 1\nDEVICE 2\nLINKS 1 2 5 10\nDELAYED 1 2 5 10\n'
+                                     'DEVICE_DOWNX 2 10\n')
+            with contextlib.redirect_stdout(io.StringIO()) as output, \
+                    contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(main([str(scenario_path), '--check-only']), 1)
+                self.assertEqual(main([str(scenario_path)]), 1)
+            self.assertEqual(output.getvalue(), "")
+            self.assertEqual(errors.getvalue(), ("line 4: UNKNOWN KEYWORD: LINKS 1 2 5 10\n"
+                                                 "line 5: UNKNOWN KEYWORD: DELAYED 1 2 5 10\n"
+                                                 "line 6: UNKNOWN KEYWORD: DEVICE_DOWNX 2 10\n") * 2)
+
+            scenario_path.write_text('LENGTH 100\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 5\nALERT 1 Trouble 0\n')
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main([str(scenario_path), '--check-only']), 0)
+            self.assertEqual(output.getvalue(), "")
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main([str(scenario_path)]), 0)
+            self.assertEqual(output.getvalue(), "@0: #1 SENT ALERT TO #2: Trouble\n"
+                                                "@5: #2 RECEIVED ALERT FROM #1: Trouble\n@100: END\n")
+
+    def test_command_line_options(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            (root / 'first.txt').write_text('LENGTH 100\nDEVICE 1\nDEVICE 2\nPROPAGATE 1 2 5\nALERT 1 Trouble 0\n'
+                                            'ALERT 1 Other 0\nCANCEL 2 Trouble 50\n')
+            (root / 'second.txt').write_text('LENGTH 30\nDEVICE 1\nDEVICE 2\nPROPAGATE 2 1 5\nALERT 2 Trouble 1\n')
+            scenario_paths = [str(root / 'first.txt'), str(root / 'second.txt')]
+            first_log = ("@0: #1 SENT ALERT TO #2: Trouble\n@0: #1 SENT ALERT TO #2: Other\n"
+                         "@5: #2 RECEIVED ALERT FROM #1: Trouble\n@5: #2 RECEIVED ALERT FROM #1: Other\n@100: END\n")
+            second_log = "@1: #2 SENT ALERT TO #1: Trouble\n@6: #1 RECEIVED ALERT FROM #2: Trouble\n@30: END\n"
+
             with contextlib.redirect_stdout(io.StringIO()) as output:
-                parse_input_file(Path("non_existent_file.txt"))
-            self.assertEqual(output.getvalue(), "FILE NOT FOUND\n")
+                self.assertEqual(main(scenario_paths), 0)
+            self.assertEqual(output.getvalue(), first_log + second_log)
+
+            self.assertEqual(main([scenario_paths[0], '-o', str(root / 'first.log'), '--engine', 'description',
+                                   '--workers', '2']), 0)
+            self.assertEqual((root / 'first.log').read_text(), first_log)
+
+            self.assertEqual(main(scenario_paths + ['--output', str(root / 'logs')]), 0)
+            self.assertEqual((root / 'logs' / 'second.log').read_text(), second_log)
+
+            self.assertEqual(main([scenario_paths[0], '-o', str(root / 'coalesced.log'), '--coalesce']), 0)
+            self.assertEqual((root / 'coalesced.log').read_text(), first_log)
+
+            with contextlib.redirect_stdout(io.StringIO()) as output, \
+                    contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(main(scenario_paths + ['--quiet', '--profile']), 0)
+            self.assertEqual(output.getvalue(), f'{scenario_paths[0]}: 4 events\n{scenario_paths[1]}: 2 events\n')
+            self.assertIn('events: 2 over 2 ticks', errors.getvalue())
+
+    def test_optional_engines_are_imported_only_when_selected(self) -> None:
+        result = subprocess.run([sys.executable, '-c', 'import sys, devicesimulationmain; '
+                                 'print(sorted({"numpy", "numpyengine", "multiprocessing", "profiler"} '
+                                 '& set(sys.modules)))'],
+                                capture_output=True, text=True, cwd=Path(__file__).parent.parent)
+        self.assertEqual(result.stdout, '[]\n')
+
+    def test_engine_with_missing_dependency_is_refused(self) -> None:
+        #A None entry in sys.modules makes importing numpy fail as if it were not installed
+        with mock.patch.dict(sys.modules, {'numpy': None}), \
+                contextlib.redirect_stderr(io.StringIO()) as errors:
+            sys.modules.pop('numpyengine', None)
+            with self.assertRaises(SystemExit) as raised:
+                main(['scenario.txt', '--engine', 'numpy'])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn('the numpy engine needs numpy, which could not be imported', errors.getvalue())
+        self.assertNotIn('Traceback', errors.getvalue())
 
     def test_run_simulation(self):
         device1 = Device(1, 500)
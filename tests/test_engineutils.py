@@ -0,0 +1,46 @@
+import unittest
+from device import Device
+from engineutils import collect_devices, decode_event, encode_event, merge_pops, start_key
+from event import Event
+from logsink import MemorySink
+from simulation import Simulation
+from topologychange import TopologyChange
+
+
+class EngineUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        simulation = Simulation(100)
+        self.devices = [Device(device_id, simulation) for device_id in [3, 1, 2, 4]]
+        self.devices[0].add_recipient(self.devices[2], 5)
+        self.devices[2].add_recipient(self.devices[1], 5)
+
+    def test_collects_reachable_devices_in_declaration_order(self) -> None:
+        event_list = [Event(None, self.devices[0], 'ALERT', 'Trouble', 0, 'S')]
+
+        self.assertEqual(collect_devices(event_list), self.devices[:3])
+
+    def test_events_survive_encoding(self) -> None:
+        index_by_device = {device: index for index, device in enumerate(self.devices)}
+        event = Event(self.devices[0], self.devices[2], 'CANCELLATION', 'Trouble', 7, 'R')
+        change = TopologyChange('DEVICE_DOWN', self.devices[3], None, None, 9)
+
+        decoded_event = decode_event(encode_event(event, index_by_device), 7, self.devices.__getitem__)
+        decoded_change = decode_event(encode_event(change, index_by_device), 9, self.devices.__getitem__)
+        self.assertEqual(decoded_event.format_log_line(), event.format_log_line())
+        self.assertEqual((decoded_change.get_event_type(), decoded_change.get_device(), decoded_change.get_time()),
+                         ('DEVICE_DOWN', self.devices[3], 9))
+
+    def test_merge_resolves_parents_to_global_positions(self) -> None:
+        event_list = [Event(None, self.devices[0], 'ALERT', 'A', 0, 'S'),
+                      Event(None, self.devices[1], 'ALERT', 'B', 0, 'S')]
+        #Worker 0 popped start event A and its child at 5; worker 1 popped start event B and its child at 5
+        pops = [[start_key(event_list[0], 0, 2), (5, 0, 0, 0)], [start_key(event_list[1], 1, 2), (5, 0, 0, 0)]]
+        blocks = [['a0', 'a5'], ['b0', 'b5']]
+        log_sink = MemorySink()
+
+        self.assertEqual(merge_pops(pops, blocks, log_sink), [[0, 2], [1, 3]])
+        self.assertEqual(log_sink.get_lines(), ['a0', 'b0', 'a5', 'b5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from device import Device
-from event import Event
+from event import Event, PHASE_SEND
 import contextlib
 import io
 
@@ -16,6 +16,12 @@ class EventClassTest(unittest.TestCase):
         self.assertEqual(test_event.get_time(), 0)
         self.assertEqual(test_event.get_phase(), 'S')
 
+    def test_compact_layout(self) -> None:
+        test_event = Event(None, Device(1, 500), 'ALERT', 'Trouble', 0, 'R')
+        self.assertFalse(hasattr(test_event, '__dict__'))
+        self.assertEqual(test_event.get_phase(), 'R')
+        self.assertEqual(Event(None, None, 'ALERT', 'Trouble', 0, PHASE_SEND).get_phase(), 'S')
+
     def test_log_receive(self) -> None:
         test_sender_device = Device(2, 500)
         test_receiver_device = Device(3, 500)
@@ -0,0 +1,34 @@
+import unittest
+import tempfile
+from pathlib import Path
+from devicesimulationmain import load_simulation
+from logsink import MemorySink
+from benchmarks.generators import SHAPES, build_simulation, write_scenario
+
+
+class GeneratorsTest(unittest.TestCase):
+    def test_written_and_in_memory_scenarios_match(self) -> None:
+        for shape, generate in SHAPES.items():
+            with self.subTest(shape=shape):
+                scenario = generate(30, 8, alert_count=3, cancel_ratio=0.5, seed=7)
+                self.assertEqual(len(scenario.device_ids), 30)
+                self.assertTrue(scenario.rules)
+
+                with tempfile.TemporaryDirectory() as directory:
+                    scenario_path = Path(directory) / f'{shape}.txt'
+                    write_scenario(scenario, scenario_path)
+                    parsed_sink = MemorySink()
+                    load_simulation(scenario_path, parsed_sink).run()
+
+                memory_sink = MemorySink()
+                build_simulation(scenario, memory_sink).run()
+                self.assertEqual(memory_sink.get_lines(), parsed_sink.get_lines())
+
+    def test_generators_are_deterministic(self) -> None:
+        for shape, generate in SHAPES.items():
+            with self.subTest(shape=shape):
+                self.assertEqual(generate(50, 100, alert_count=4, seed=3), generate(50, 100, alert_count=4, seed=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
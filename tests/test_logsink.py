@@ -0,0 +1,68 @@
+import unittest
+import io
+import contextlib
+import tempfile
+from pathlib import Path
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+from logsink import StdoutSink, BufferedTextSink, FileSink, NullSink, CountingSink, MemorySink
+
+
+class LogSinkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.device1 = Device(1, 500)
+        self.device2 = Device(2, 500)
+        self.device1.add_recipient(self.device2, 100)
+        self.expected_lines = ["@0: #1 SENT ALERT TO #2: Danger",
+                               "@100: #2 RECEIVED ALERT FROM #1: Danger",
+                               "@500: END"]
+
+    def test_memory_sink_collects_run(self) -> None:
+        log_sink = MemorySink()
+        run_simulation(500, [Event(None, self.device1, 'ALERT', 'Danger', 0, 'S')], log_sink)
+
+        self.assertEqual(log_sink.get_lines(), self.expected_lines)
+        self.assertEqual(log_sink.getvalue(), "\n".join(self.expected_lines) + "\n")
+
+    def test_stdout_sink_matches_print(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            run_simulation(500, [Event(None, self.device1, 'ALERT', 'Danger', 0, 'S')], StdoutSink())
+
+        self.assertEqual(output.getvalue(), "\n".join(self.expected_lines) + "\n")
+
+    def test_buffered_sink_flushes_in_batches(self) -> None:
+        stream = io.StringIO()
+        log_sink = BufferedTextSink(stream, flush_size=2)
+
+        log_sink.write("one")
+        self.assertEqual(stream.getvalue(), "")
+        log_sink.write("two")
+        self.assertEqual(stream.getvalue(), "one\ntwo\n")
+        log_sink.write("three")
+        log_sink.flush()
+        self.assertEqual(stream.getvalue(), "one\ntwo\nthree\n")
+
+    def test_file_sink_writes_log(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = Path(directory) / "simulation.log"
+            with FileSink(log_path, flush_size=1) as log_sink:
+                run_simulation(500, [Event(None, self.device1, 'ALERT', 'Danger', 0, 'S')], log_sink)
+
+            self.assertEqual(log_path.read_text(), "\n".join(self.expected_lines) + "\n")
+
+    def test_null_sink_discards(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            run_simulation(500, [Event(None, self.device1, 'ALERT', 'Danger', 0, 'S')], NullSink())
+
+        self.assertEqual(output.getvalue(), "")
+
+    def test_counting_sink_counts_event_lines(self) -> None:
+        log_sink = CountingSink()
+        run_simulation(500, [Event(None, self.device1, 'ALERT', 'Danger', 0, 'S')], log_sink)
+
+        self.assertEqual(log_sink.get_event_count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
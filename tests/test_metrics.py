@@ -0,0 +1,87 @@
+import unittest
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+from devicesimulationmain import main, run_simulation
+from metrics import MetricsSink
+from scenarioreader import iter_scenario_records
+from topology import Topology
+
+SCENARIO = ('LENGTH 100\nDEVICE 1\nDEVICE 2\nDEVICE 3\nDEVICE 4\n'
+            'PROPAGATE 1 2 5\nPROPAGATE 2 3 5\nPROPAGATE 3 1 5\nPROPAGATE 1 3 20\n'
+            'ALERT 1 Trouble 0\nCANCEL 2 Trouble 12\nALERT 3 Other 30\nCANCEL 4 Other 40\n')
+
+
+class MetricsSinkTest(unittest.TestCase):
+    def run_metrics(self) -> MetricsSink:
+        topology = Topology()
+        for record in iter_scenario_records(io.StringIO(SCENARIO)):
+            topology.add_record(record)
+        simulation_length, _, event_list = topology.build()
+        metrics = MetricsSink()
+        run_simulation(simulation_length, event_list, metrics)
+        return metrics
+
+    def test_aggregates(self) -> None:
+        metrics = self.run_metrics()
+
+        self.assertEqual(metrics.get_message_counts(), {'ALERT': 56, 'CANCELLATION': 4})
+        self.assertEqual(metrics.get_first_alert_times(), {1: 0, 2: 5, 3: 10})
+        #A device that started a message already has it, so copies coming back round the cycle are duplicates
+        self.assertEqual(metrics.get_duplicate_receipts(), {1: 12, 2: 12, 3: 17})
+        #Device 4 has no links, so cancelling Other there withdraws it from none of the devices it reached
+        self.assertEqual(metrics.get_cancellation_coverage(), {
+            'Trouble': {'start': 12, 'covered': 3, 'alerted': 3, 'complete': 22},
+            'Other': {'start': 40, 'covered': 0, 'alerted': 3, 'complete': None},
+        })
+
+    def test_start_events_at_devices_without_links(self) -> None:
+        topology = Topology()
+        scenario = ('LENGTH 50\nDEVICE 1\nDEVICE 2\nDEVICE 3\nPROPAGATE 1 2 5\nPROPAGATE 2 3 5\n'
+                    'ALERT 1 X 0\nCANCEL 3 X 20\nCANCEL 2 Y 1\n')
+        for record in iter_scenario_records(io.StringIO(scenario)):
+            topology.add_record(record)
+        simulation_length, _, event_list = topology.build()
+        metrics = MetricsSink()
+        run_simulation(simulation_length, event_list, metrics)
+
+        #Y was never alerted, so its cancellation has nothing to cover
+        self.assertEqual(metrics.get_cancellation_coverage(), {
+            'X': {'start': 20, 'covered': 1, 'alerted': 3, 'complete': None},
+        })
+        metrics.write_block('@0: #1 SENT ALERT TO #2: X\n@5: #2 RECEIVED ALERT FROM #1: X')
+        self.assertEqual(metrics.get_message_counts(), {'ALERT': 2, 'CANCELLATION': 1})
+
+    def test_reports(self) -> None:
+        metrics = self.run_metrics()
+        report = metrics.to_dict()
+
+        self.assertEqual(report['simulation_length'], 100)
+        self.assertEqual(report['duplicate_receipts'], 41)
+        self.assertEqual(report['devices']['2'], {'first_alert': 5, 'duplicate_receipts': 12})
+        self.assertEqual(metrics.summary(top=1).split('\n'), [
+            'messages: ALERT 56, CANCELLATION 4',
+            'first alert: 3 devices, earliest 0, median 5, latest 10',
+            'duplicate receipts: 41',
+            '  #3: 17',
+            'cancellation        start  complete         covered',
+            'Other                  40         -       0 of 3',
+            'Trouble                12        22       3 of 3',
+        ])
+
+    def test_command_line_metrics(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            scenario_path = Path(directory) / 'scenario.txt'
+            scenario_path.write_text(SCENARIO)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(main([str(scenario_path), '--metrics', 'json']), 0)
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['scenario'], str(scenario_path))
+        self.assertEqual(report['messages'], {'ALERT': 56, 'CANCELLATION': 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
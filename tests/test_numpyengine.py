@@ -0,0 +1,61 @@
+import unittest
+import importlib.util
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+from logsink import MemorySink
+
+if importlib.util.find_spec('numpy'):
+    from numpyengine import run_numpy_simulation, build_csr
+
+
+@unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+class NumpyEngineTest(unittest.TestCase):
+    def _build_cycle(self) -> list[Event]:
+        devices = [Device(device_id, 40) for device_id in range(1, 5)]
+        devices[0].add_recipient(devices[1], 3)
+        devices[0].add_recipient(devices[2], 3)
+        devices[1].add_recipient(devices[3], 2)
+        devices[2].add_recipient(devices[3], 2)
+        devices[3].add_recipient(devices[0], 0)
+        devices[3].add_recipient(devices[3], 5)
+        return [Event(None, devices[0], 'ALERT', 'Storm', 0, 'S'),
+                Event(None, devices[3], 'ALERT', 'Flood', 5, 'S'),
+                Event(None, devices[1], 'ALERT', 'Late', 45, 'S')]
+
+    def test_build_csr(self) -> None:
+        devices = [Device(1, 10), Device(2, 10), Device(3, 10)]
+        devices[0].add_recipient(devices[2], 4)
+        devices[0].add_recipient(devices[1], 7)
+        devices[2].add_recipient(devices[0], 1)
+
+        offsets, receivers, delays = build_csr(devices)
+
+        self.assertEqual(offsets.tolist(), [0, 2, 2, 3])
+        self.assertEqual(receivers.tolist(), [2, 1, 0])
+        self.assertEqual(delays.tolist(), [4, 7, 1])
+
+    def test_matches_run_simulation(self) -> None:
+        expected_sink = MemorySink()
+        run_simulation(40, self._build_cycle(), expected_sink)
+        numpy_sink = MemorySink()
+        run_numpy_simulation(40, self._build_cycle(), numpy_sink)
+
+        self.assertEqual(numpy_sink.get_lines(), expected_sink.get_lines())
+
+    def test_falls_back_with_cancellations(self) -> None:
+        events = self._build_cycle()
+        events.append(Event(None, events[0].get_receiver(), 'CANCELLATION', 'Storm', 10, 'S'))
+        expected_sink = MemorySink()
+        run_simulation(40, events, expected_sink)
+
+        events = self._build_cycle()
+        events.append(Event(None, events[0].get_receiver(), 'CANCELLATION', 'Storm', 10, 'S'))
+        numpy_sink = MemorySink()
+        run_numpy_simulation(40, events, numpy_sink)
+
+        self.assertEqual(numpy_sink.get_lines(), expected_sink.get_lines())
+
+
+if __name__ == '__main__':
+    unittest.main()
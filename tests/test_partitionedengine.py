@@ -0,0 +1,24 @@
+import unittest
+from unittest import mock
+from partitionedengine import run_partitioned_simulation
+from benchmarks.generators import SHAPES, to_topology
+from enginecomparison import EngineComparisonTest, TOPOLOGY_CHANGE_SCENARIO, scenario_topology
+
+
+class PartitionedEngineTest(EngineComparisonTest):
+    def test_matches_sequential_engine(self) -> None:
+        self.assert_same_log_on_shapes(run_partitioned_simulation, alert_count=4, description_count=2)
+
+    def test_matches_sequential_engine_with_topology_changes(self) -> None:
+        self.assert_same_log(lambda: scenario_topology(TOPOLOGY_CHANGE_SCENARIO), run_partitioned_simulation,
+                             workers=2)
+
+    def test_single_worker_falls_back_to_sequential_engine(self) -> None:
+        scenario = SHAPES['ring'](10, 100, alert_count=2, seed=1)
+        with mock.patch('partitionedengine.Process') as process:
+            self.assert_same_log(lambda: to_topology(scenario), run_partitioned_simulation, workers=1)
+        process.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
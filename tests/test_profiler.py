@@ -0,0 +1,95 @@
+import unittest
+import json
+import tempfile
+from pathlib import Path
+from device import Device
+from event import Event
+from devicesimulationmain import run_simulation
+from logsink import MemorySink
+from profiler import SimulationProfiler
+from topologychange import TopologyChange
+
+
+class SimulationProfilerTest(unittest.TestCase):
+    def _event_list(self) -> list[Event]:
+        device1 = Device(1, 500)
+        device2 = Device(2, 500)
+        device3 = Device(3, 500)
+        device1.add_recipient(device2, 100)
+        device1.add_recipient(device3, 100)
+        device2.add_recipient(device3, 50)
+        device3.add_recipient(device1, 300)
+        return [Event(None, device1, 'ALERT', 'Danger', 0, 'S'),
+                Event(None, device3, 'CANCELLATION', 'Danger', 120, 'S')]
+
+    def test_profiled_log_matches_plain_run(self) -> None:
+        plain_sink = MemorySink()
+        run_simulation(500, self._event_list(), plain_sink)
+        profiled_sink = MemorySink()
+        run_simulation(500, self._event_list(), profiled_sink, SimulationProfiler())
+
+        self.assertEqual(profiled_sink.get_lines(), plain_sink.get_lines())
+
+    def test_counters(self) -> None:
+        profiler = SimulationProfiler()
+        run_simulation(500, self._event_list(), MemorySink(), profiler)
+
+        self.assertEqual(profiler.get_device_counters(), {
+            1: {'sent': 6, 'received': 2, 'suppressed': 0, 'dropped_offline': 0},
+            2: {'sent': 1, 'received': 1, 'suppressed': 0, 'dropped_offline': 0},
+            3: {'sent': 2, 'received': 2, 'suppressed': 1, 'dropped_offline': 0}})
+        self.assertEqual(profiler.get_events_per_tick(), {0: 1, 100: 2, 120: 1, 150: 1, 400: 1, 420: 1})
+        self.assertEqual(profiler.get_queue_sizes(), [3, 3, 3, 3, 2, 1, 0])
+        self.assertEqual(set(profiler.get_timings()), {'scheduling', 'processing', 'logging', 'total'})
+
+    def test_offline_drops_are_not_suppression(self) -> None:
+        event_list = self._event_list()
+        device2 = event_list[0].get_receiver().get_recipients()[0][0]
+        event_list.append(TopologyChange('DEVICE_DOWN', device2, None, None, 50))
+        profiler = SimulationProfiler()
+        run_simulation(500, event_list, MemorySink(), profiler)
+
+        self.assertEqual(profiler.get_device_counters()[2],
+                         {'sent': 0, 'received': 0, 'suppressed': 0, 'dropped_offline': 1})
+
+    def test_coalescing_leaves_counters_unchanged(self) -> None:
+        def event_list() -> list:
+            devices = {device_id: Device(device_id, 200) for device_id in range(1, 6)}
+            #Devices 4 and 5 each get every alert twice at the same time, through 2 and through 3
+            for sender, receiver, delay in [(1, 2, 10), (1, 3, 10), (2, 4, 5), (3, 4, 5), (2, 5, 5), (3, 5, 5),
+                                            (4, 1, 100), (5, 1, 100)]:
+                devices[sender].add_recipient(devices[receiver], delay)
+            return [Event(None, devices[1], 'ALERT', 'Danger', 0, 'S'),
+                    Event(None, devices[1], 'ALERT', 'Other', 0, 'S'),
+                    Event(None, devices[4], 'CANCELLATION', 'Danger', 12, 'S'),
+                    TopologyChange('DEVICE_DOWN', devices[5], None, None, 12)]
+
+        profilers = []
+        for coalesce in [False, True]:
+            profiler = SimulationProfiler()
+            run_simulation(200, event_list(), MemorySink(), profiler, coalesce=coalesce)
+            profilers.append(profiler)
+
+        plain, coalesced = profilers
+        self.assertEqual(coalesced.get_device_counters(), plain.get_device_counters())
+        self.assertEqual(coalesced.get_events_per_tick(), plain.get_events_per_tick())
+        counters = plain.get_device_counters()
+        self.assertEqual((counters[4]['suppressed'], counters[5]['dropped_offline']), (4, 10))
+
+    def test_json_dump_and_summary(self) -> None:
+        profiler = SimulationProfiler()
+        run_simulation(500, self._event_list(), MemorySink(), profiler)
+
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = Path(directory) / 'profile.json'
+            profiler.write_json(report_path)
+            report = json.loads(report_path.read_text())
+
+        self.assertEqual(report['events'], 7)
+        self.assertEqual(report['max_queue_size'], 3)
+        self.assertEqual(report['devices']['3']['suppressed'], 1)
+        self.assertIn('#1: sent 6, received 2, suppressed 0, dropped offline 0', profiler.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
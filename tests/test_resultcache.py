@@ -0,0 +1,134 @@
+import contextlib
+import gzip
+import io
+import os
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+from batchrunner import run_scenario
+from devicesimulationmain import parse_input_file, run_simulation
+from logsink import MemorySink
+from resultcache import ResultCache, run_cached, scenario_key
+
+SCENARIO = ('LENGTH 300\nDEVICE 1\nDEVICE 2\nDEVICE 3\nPROPAGATE 1 2 100\nPROPAGATE 1 3 100\nPROPAGATE 2 3 50\n'
+            'ALERT 1 Trouble 0\nCANCEL 2 Trouble 120\n')
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.cache = ResultCache(self.root / 'cache')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_scenario(self, name: str, text: str) -> Path:
+        path = self.root / name
+        path.write_text(text)
+        return path
+
+    def key(self, text: str) -> str:
+        return scenario_key(*parse_input_file(self.write_scenario('keyed.txt', text)))
+
+    def test_key_ignores_layout_but_not_content(self) -> None:
+        key = self.key(SCENARIO)
+        reordered = SCENARIO.replace('DEVICE 1\nDEVICE 2\n', 'DEVICE 2\nDEVICE 1\n')
+        self.assertEqual(self.key('# nightly copy\n' + reordered), key)
+        self.assertNotEqual(self.key(SCENARIO.replace('LENGTH 300', 'LENGTH 301')), key)
+        self.assertNotEqual(self.key(SCENARIO.replace('PROPAGATE 2 3 50', 'PROPAGATE 2 3 51')), key)
+        self.assertNotEqual(self.key(SCENARIO.replace('Trouble 120', 'Trouble 121')), key)
+        #Edge order decides the order of same-time sends, so it is part of the key
+        self.assertNotEqual(self.key(SCENARIO.replace('PROPAGATE 1 2 100\nPROPAGATE 1 3 100\n',
+                                                      'PROPAGATE 1 3 100\nPROPAGATE 1 2 100\n')), key)
+
+    def test_run_cached_matches_run_simulation(self) -> None:
+        scenario_path = self.write_scenario('scenario.txt', SCENARIO)
+        expected = MemorySink()
+        simulation_length, _, event_list = parse_input_file(scenario_path)
+        run_simulation(simulation_length, event_list, expected)
+
+        for expect_cached in [False, True]:
+            log_sink = MemorySink()
+            self.assertEqual(run_cached(scenario_path, self.cache, log_sink), expect_cached)
+            self.assertEqual(log_sink.getvalue(), expected.getvalue())
+
+    def test_failed_run_leaves_no_entry(self) -> None:
+        class FailingSink(MemorySink):
+            def write(self, line: str) -> None:
+                if len(self.get_lines()) == 2:
+                    raise RuntimeError('disk full')
+                super().write(line)
+
+        scenario_path = self.write_scenario('scenario.txt', SCENARIO)
+        with self.assertRaises(RuntimeError):
+            run_cached(scenario_path, self.cache, FailingSink())
+        self.assertEqual(list(self.cache.get_directory().iterdir()), [])
+
+    def test_long_logs_are_written_in_blocks(self) -> None:
+        log = '\n'.join(f'@{time}: #1 SENT ALERT TO #2: Trouble' for time in range(10000))
+        self.cache.put('long', log)
+        log_sink = MemorySink()
+
+        self.assertTrue(self.cache.write_to('long', log_sink))
+        self.assertEqual(log_sink.getvalue(), log + '\n')
+        self.assertEqual(self.cache.get('long'), log)
+        self.assertFalse(self.cache.write_to('missing', log_sink))
+
+    def test_entry_evicted_after_verification_is_still_written(self) -> None:
+        self.cache.put('a', 'first log')
+        path = self.cache.get_directory() / 'a.log.gz'
+
+        #Another process evicts the entry just after it was checked
+        def evict(entry_path: Path) -> None:
+            os.remove(entry_path)
+            raise FileNotFoundError(entry_path)
+
+        log_sink = MemorySink()
+        with mock.patch('resultcache.os.utime', evict):
+            self.assertTrue(self.cache.write_to('a', log_sink))
+        self.assertEqual(log_sink.get_lines(), ['first log'])
+        self.assertFalse(path.exists())
+
+    def test_corrupt_entry_is_a_miss(self) -> None:
+        self.cache.put('a', 'first log')
+        path = self.cache.get_directory() / 'a.log.gz'
+        with gzip.open(path, 'wb') as file:
+            file.write(b'0' * 64 + b'\nfirst log')
+        self.assertIsNone(self.cache.get('a'))
+        self.assertFalse(path.exists())
+
+        path.write_bytes(b'not gzip')
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        logs = {key: os.urandom(3000).hex() for key in 'abc'}
+        self.cache.put('a', logs['a'])
+        entry_size = self.cache.get_size()
+        cache = ResultCache(self.root / 'cache', max_bytes=entry_size * 2 + entry_size // 2)
+        cache.put('b', logs['b'])
+        #Entries are ordered by modification time, so make the order explicit rather than rely on the clock
+        os.utime(cache.get_directory() / 'a.log.gz', (1, 1))
+        os.utime(cache.get_directory() / 'b.log.gz', (2, 2))
+        self.assertEqual(cache.get('a'), logs['a'])
+        cache.put('c', logs['c'])
+
+        self.assertEqual(cache.get('a'), logs['a'])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), logs['c'])
+        self.assertLessEqual(cache.get_size(), entry_size * 2 + entry_size // 2)
+
+    def test_batch_runner_reports_cache_hits(self) -> None:
+        scenario_path = self.write_scenario('scenario.txt', SCENARIO)
+        with contextlib.redirect_stderr(io.StringIO()):
+            first = run_scenario(scenario_path, self.root / 'first.log', self.root / 'cache')
+            second = run_scenario(scenario_path, self.root / 'second.log', self.root / 'cache')
+
+        self.assertEqual((first.error, first.cached, second.error, second.cached), (None, False, None, True))
+        self.assertEqual((self.root / 'second.log').read_text(), (self.root / 'first.log').read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import io
+from scenarioreader import (iter_scenario_records, parse_scenario_line, LengthRecord, DeviceRecord, PropagateRecord,
+                            AlertRecord, CancelRecord, ChangeRecord, ScenarioSyntaxError)
+
+
+class ScenarioReaderTest(unittest.TestCase):
+    def test_yields_typed_records(self) -> None:
+        scenario = io.StringIO(
+            '# sample_input.txt\n'
+            'LENGTH 600\n'
+            '\n'
+            'DEVICE 1\n'
+            'DEVICE 2\n'
+            'PROPAGATE 1 2 750\n'
+            ' PROPAGATE 2 1 5\n'
+            'ALERT 1 Trouble 0\n'
+            'CANCEL 2 Trouble 300\n'
+        )
+
+        self.assertEqual(list(iter_scenario_records(scenario)), [
+            LengthRecord(600, 2),
+            DeviceRecord(1, 4),
+            DeviceRecord(2, 5),
+            PropagateRecord(1, 2, 750, 6),
+            AlertRecord(1, 'Trouble', 0, 8),
+            CancelRecord(2, 'Trouble', 300, 9),
+        ])
+
+    def test_yields_topology_changes(self) -> None:
+        scenario = io.StringIO('LINK 1 2 50 300\nUNLINK 1 2 400\nDELAY 2 1 20 500\nDEVICE_DOWN 3 600\n'
+                               'DEVICE_UP 3 700\nDEVICE 3\n')
+
+        self.assertEqual(list(iter_scenario_records(scenario)), [
+            ChangeRecord('LINK', 1, 2, 50, 300, 1),
+            ChangeRecord('UNLINK', 1, 2, None, 400, 2),
+            ChangeRecord('DELAY', 2, 1, 20, 500, 3),
+            ChangeRecord('DEVICE_DOWN', 3, None, None, 600, 4),
+            ChangeRecord('DEVICE_UP', 3, None, None, 700, 5),
+            DeviceRecord(3, 6),
+        ])
+
+    def test_reads_lazily(self) -> None:
+        records = iter_scenario_records(io.StringIO('LENGTH 10\nDEVICE x\n'))
+
+        self.assertEqual(next(records), LengthRecord(10, 1))
+        with self.assertRaises(ValueError):
+            next(records)
+
+    def test_keywords_match_whole_tokens(self) -> None:
+        for line in ['LINKS 1 2 5 10\n', 'DELAYED 1 2 5 10\n', 'DEVICE_DOWNX 2 10\n', 'UNLINKED 1 2 10\n',
+                     'DEVICES 1\n', 'LENGTHS 10\n', 'ALERTS 1 Trouble 0\n']:
+            with self.subTest(line=line):
+                self.assertIsNone(parse_scenario_line(line, 4))
+
+        self.assertEqual(list(iter_scenario_records(io.StringIO('LINKS 1 2 5 10\nLINK 1 2 5 10\n'))),
+                         [ChangeRecord('LINK', 1, 2, 5, 10, 2)])
+
+    def test_lines_of_other_whitespace_are_blank(self) -> None:
+        for line in ['\t\n', '\f\n', '\t \f']:
+            with self.subTest(line=line):
+                self.assertIsNone(parse_scenario_line(line, 2))
+
+        self.assertEqual(list(iter_scenario_records(io.StringIO('LENGTH 10\n\t\nDEVICE 1\n'))),
+                         [LengthRecord(10, 1), DeviceRecord(1, 3)])
+
+    def test_malformed_line_reports_its_line_number(self) -> None:
+        records = iter_scenario_records(io.StringIO('LENGTH 10\nDEVICE 1\nPROPAGATE 1 2\n'))
+
+        with self.assertRaises(ScenarioSyntaxError) as raised:
+            list(records)
+        self.assertEqual(raised.exception.line_number, 3)
+        self.assertEqual(str(raised.exception), 'line 3: MALFORMED LINE: PROPAGATE 1 2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import io
+from scenariovalidator import ScenarioProblem, ScenarioError, format_problem, validate_scenario
+
+
+class ScenarioValidatorTest(unittest.TestCase):
+    def test_valid_scenario_has_no_problems(self) -> None:
+        scenario = io.StringIO('# devices may be declared after they are used\nALERT 1 Trouble 0\nLENGTH 600\n'
+                               'PROPAGATE 1 2 750\n PROPAGATE 2 1 -5\nDEVICE 1\nDEVICE 2\nLINK 2 1 5 100\n'
+                               'DEVICE_DOWN 2 599\n\n')
+
+        self.assertEqual(validate_scenario(scenario), [])
+
+    def test_reports_every_problem_with_its_line(self) -> None:
+        scenario = io.StringIO(
+            'ALERT 1 Early 700\n'
+            'LENGTH 600\n'
+            'DEVICE 1\n'
+            'DEVICE 1\n'
+            'DEVICE two\n'
+            'PROPAGATE 1 3 10\n'
+            'PROPAGATE 1 1 -2\n'
+            'ALERT 1 Trouble\n'
+            'CANCEL 1 Trouble 600\n'
+            'ALERT 1 Trouble -1\n'
+            'DELAY 1 1 -3 599\n'
+            'UNLINK 4 1 10\n'
+            'BROADCAST 1\n'
+            'LENGTH 500\n'
+        )
+
+        self.assertEqual(validate_scenario(scenario), [
+            ScenarioProblem(1, 'ALERT 1 Early 700 IS AT OR AFTER LENGTH 600'),
+            ScenarioProblem(4, 'DUPLICATE DEVICE #1 (FIRST DECLARED ON LINE 3)'),
+            ScenarioProblem(5, 'MALFORMED LINE: DEVICE two'),
+            ScenarioProblem(6, 'UNKNOWN DEVICE #3 IN PROPAGATE 1 3 10'),
+            ScenarioProblem(7, 'NEGATIVE DELAY IN PROPAGATE 1 1 -2'),
+            ScenarioProblem(8, 'MALFORMED LINE: ALERT 1 Trouble'),
+            ScenarioProblem(9, 'CANCEL 1 Trouble 600 IS AT OR AFTER LENGTH 600'),
+            ScenarioProblem(10, 'NEGATIVE TIME IN ALERT 1 Trouble -1'),
+            ScenarioProblem(11, 'NEGATIVE DELAY IN DELAY 1 1 -3 599'),
+            ScenarioProblem(12, 'UNKNOWN DEVICE #4 IN UNLINK 4 1 10'),
+            ScenarioProblem(13, 'UNKNOWN KEYWORD: BROADCAST 1'),
+            ScenarioProblem(14, 'LENGTH ALREADY SET ON LINE 2'),
+        ])
+
+    def test_lines_of_other_whitespace_are_blank(self) -> None:
+        scenario = io.StringIO('LENGTH 100\n\t\nDEVICE 1\n\f\nALERT 1 Trouble 0\n')
+
+        self.assertEqual(validate_scenario(scenario), [])
+
+    def test_missing_length(self) -> None:
+        problems = validate_scenario(io.StringIO('DEVICE 1\nALERT 1 Trouble 10\n'))
+
+        self.assertEqual(problems, [ScenarioProblem(None, 'MISSING LENGTH')])
+        self.assertEqual(str(ScenarioError(problems + [ScenarioProblem(3, 'UNKNOWN KEYWORD: X')])),
+                         'MISSING LENGTH\nline 3: UNKNOWN KEYWORD: X')
+        self.assertEqual(format_problem(ScenarioProblem(3, 'UNKNOWN KEYWORD: X')), 'line 3: UNKNOWN KEYWORD: X')
+
+
+if __name__ == '__main__':
+    unittest.main()
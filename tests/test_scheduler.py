@@ -0,0 +1,127 @@
+import unittest
+import io
+import tempfile
+from pathlib import Path
+from checkpoint import save_checkpoint, load_checkpoint
+from device import Device
+from event import Event
+from logsink import MemorySink
+from scenarioreader import iter_scenario_records
+from scheduler import EventScheduler, CoalescingScheduler
+from simulation import Simulation
+from topology import Topology
+from benchmarks.generators import dense_cycle, build_simulation
+
+
+class EventSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.device1 = Device(1, 100)
+        self.device2 = Device(2, 100)
+
+    def test_orders_by_time(self) -> None:
+        late_event = Event(None, self.device1, 'ALERT', 'Late', 20, 'S')
+        early_event = Event(None, self.device2, 'ALERT', 'Early', 5, 'S')
+        event_queue = EventScheduler([late_event, early_event])
+
+        self.assertEqual(event_queue.peek_time(), 5)
+        self.assertIs(event_queue.pop(), early_event)
+        self.assertIs(event_queue.pop(), late_event)
+        self.assertEqual(len(event_queue), 0)
+
+    def test_alert_before_cancellation_at_same_time(self) -> None:
+        cancellation_event = Event(None, self.device1, 'CANCELLATION', 'Trouble', 10, 'S')
+        alert_event = Event(None, self.device2, 'ALERT', 'Trouble', 10, 'S')
+        event_queue = EventScheduler([cancellation_event, alert_event])
+
+        self.assertIs(event_queue.pop(), alert_event)
+        self.assertIs(event_queue.pop(), cancellation_event)
+
+    def test_insertion_order_breaks_ties(self) -> None:
+        events = [Event(None, self.device1, 'ALERT', str(i), 10, 'S') for i in range(5)]
+        event_queue = EventScheduler(events[:3])
+        event_queue.append(events[3])
+        event_queue.push(events[4])
+
+        self.assertEqual([event_queue.pop() for _ in range(5)], events)
+        self.assertFalse(event_queue)
+
+
+#Device 4 gets Trouble from #2 and #3 at 3, with Other from #5 queued between the two copies
+SCENARIO = ('LENGTH 12\nDEVICE 1\nDEVICE 2\nDEVICE 3\nDEVICE 4\nDEVICE 5\nDEVICE 6\n'
+            'PROPAGATE 1 2 1\nPROPAGATE 1 3 2\nPROPAGATE 2 4 2\nPROPAGATE 3 4 1\nPROPAGATE 5 4 1\n'
+            'PROPAGATE 4 6 0\nPROPAGATE 4 5 3\nPROPAGATE 6 4 4\nPROPAGATE 5 1 2\n'
+            'ALERT 1 Trouble 0\nALERT 5 Other 2\nCANCEL 3 Other 5\nLINK 6 1 1 3\nDEVICE_DOWN 2 7\n')
+
+
+class CoalescingSchedulerTest(unittest.TestCase):
+    def _build(self, log_sink: MemorySink, coalesce: bool) -> Simulation:
+        topology = Topology()
+        for record in iter_scenario_records(io.StringIO(SCENARIO)):
+            topology.add_record(record)
+        simulation = topology.build_simulation(log_sink)
+        simulation.set_coalescing(coalesce)
+        return simulation
+
+    def test_identical_deliveries_share_an_entry(self) -> None:
+        device1 = Device(1, 100)
+        device2 = Device(2, 100)
+        copies = [Event(device1, device2, 'ALERT', 'Trouble', 10, 'R') for _ in range(3)]
+        other = Event(device1, device2, 'ALERT', 'Other', 10, 'R')
+        cancellations = [Event(device1, device2, 'CANCELLATION', 'Trouble', 10, 'R') for _ in range(2)]
+        event_queue = CoalescingScheduler(copies[:2] + [other] + copies[2:] + cancellations)
+
+        self.assertEqual(len(event_queue), 4)
+        self.assertEqual(event_queue.get_copy_count(), 6)
+        self.assertEqual(sorted(event_queue.get_sequenced_events(), key=lambda entry: entry[0]),
+                         list(enumerate(copies[:2] + [other] + copies[2:] + cancellations)))
+        #Copies come out at their own positions, with other deliveries in between
+        popped = [event_queue.pop() for _ in range(4)]
+        self.assertIs(popped[0], popped[1])
+        self.assertIs(popped[3], popped[0])
+        self.assertNotEqual(popped[2], popped[0])
+
+    def test_log_matches_event_scheduler(self) -> None:
+        expected = MemorySink()
+        self._build(expected, False).run()
+        log_sink = MemorySink()
+        simulation = self._build(log_sink, True)
+        simulation.run()
+
+        self.assertIsInstance(simulation.get_event_queue(), CoalescingScheduler)
+        self.assertEqual(log_sink.get_lines(), expected.get_lines())
+        self.assertEqual([line for line in expected.get_lines() if line.startswith('@3: #4 RECEIVED')], [
+            '@3: #4 RECEIVED ALERT FROM #2: Trouble',
+            '@3: #4 RECEIVED ALERT FROM #5: Other',
+            '@3: #4 RECEIVED ALERT FROM #3: Trouble'])
+
+    def test_log_matches_on_dense_cycles(self) -> None:
+        for seed in range(3):
+            scenario = dense_cycle(30, 6, alert_count=3, cancel_ratio=0.5, description_count=2, seed=seed)
+            logs = []
+            for coalesce in [False, True]:
+                log_sink = MemorySink()
+                simulation = build_simulation(scenario, log_sink)
+                simulation.set_coalescing(coalesce)
+                simulation.run()
+                logs.append(log_sink.get_lines())
+            self.assertEqual(logs[1], logs[0], f'seed {seed}')
+
+    def test_checkpoint_of_coalescing_run_resumes(self) -> None:
+        expected = MemorySink()
+        self._build(expected, False).run()
+        prefix_sink = MemorySink()
+        simulation = self._build(prefix_sink, True)
+        simulation.run(until=3)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = Path(directory) / 'run.ckpt'
+            save_checkpoint(simulation, checkpoint_path)
+            suffix_sink = MemorySink()
+            resumed = load_checkpoint(checkpoint_path, suffix_sink)
+        resumed.set_coalescing(True)
+        resumed.run()
+
+        self.assertEqual(prefix_sink.get_lines() + suffix_sink.get_lines(), expected.get_lines())
+
+
+if __name__ == '__main__':
+    unittest.main()
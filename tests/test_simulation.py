@@ -0,0 +1,57 @@
+import unittest
+import threading
+from device import Device
+from event import Event
+from logsink import MemorySink
+from simulation import Simulation
+
+
+class SimulationTest(unittest.TestCase):
+    def _build(self, simulation_length: int) -> Simulation:
+        simulation = Simulation(simulation_length, MemorySink())
+        device1 = Device(1, simulation)
+        device2 = Device(2, simulation)
+        device1.add_recipient(device2, 100)
+        device2.add_recipient(device1, 100)
+        simulation.schedule(Event(None, device1, 'ALERT', 'Trouble', 0, 'S'))
+        return simulation
+
+    def test_devices_belong_to_their_simulation(self) -> None:
+        simulation = self._build(250)
+
+        self.assertEqual([device.get_device_id() for device in simulation.get_devices()], [1, 2])
+        self.assertTrue(all(device.get_simulation() is simulation for device in simulation.get_devices()))
+        self.assertEqual(simulation.get_devices()[0].get_simulation_length(), 250)
+
+    def test_simulations_keep_their_own_length(self) -> None:
+        short_simulation = self._build(150)
+        long_simulation = self._build(250)
+        short_simulation.run()
+        long_simulation.run()
+
+        self.assertEqual(short_simulation.get_log_sink().get_lines(), [
+            '@0: #1 SENT ALERT TO #2: Trouble',
+            '@100: #2 RECEIVED ALERT FROM #1: Trouble',
+            '@100: #2 SENT ALERT TO #1: Trouble',
+            '@150: END'])
+        self.assertEqual(long_simulation.get_log_sink().get_lines()[-3:], [
+            '@200: #1 RECEIVED ALERT FROM #2: Trouble',
+            '@200: #1 SENT ALERT TO #2: Trouble',
+            '@250: END'])
+
+    def test_simulations_run_side_by_side_in_threads(self) -> None:
+        simulations = [self._build(simulation_length) for simulation_length in [1000, 3000] * 4]
+        threads = [threading.Thread(target=simulation.run) for simulation in simulations]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for simulation in simulations:
+            lines = simulation.get_log_sink().get_lines()
+            self.assertEqual(lines[-1], f'@{simulation.get_simulation_length()}: END')
+            self.assertEqual(len(lines), 2 * (simulation.get_simulation_length() // 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
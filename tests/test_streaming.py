@@ -0,0 +1,59 @@
+import unittest
+import asyncio
+from logsink import MemorySink
+from streaming import LogRecord, iter_records, aiter_records, write_records
+from benchmarks.generators import random_graph, build_simulation
+
+
+class StreamingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scenario = random_graph(30, 30, degree=2, alert_count=3, cancel_ratio=0.5, seed=4)
+        self.expected_sink = MemorySink()
+        build_simulation(self.scenario, self.expected_sink).run()
+
+    def test_records_match_log(self) -> None:
+        records = list(iter_records(build_simulation(self.scenario)))
+
+        self.assertTrue(all(isinstance(record, LogRecord) for record in records))
+        self.assertEqual(len(records), len(self.expected_sink.get_lines()) - 1)
+        first_line = self.expected_sink.get_lines()[0]
+        self.assertEqual(first_line, f'@{records[0].time}: #{records[0].sender_id} SENT {records[0].event_type} '
+                                     f'TO #{records[0].receiver_id}: {records[0].description}')
+
+    def test_write_records_matches_run(self) -> None:
+        log_sink = MemorySink()
+        write_records(build_simulation(self.scenario), log_sink)
+
+        self.assertEqual(log_sink.get_lines(), self.expected_sink.get_lines())
+
+    def test_stream_is_lazy(self) -> None:
+        simulation = build_simulation(self.scenario)
+        pending = len(simulation.get_event_queue())
+        records = iter_records(simulation)
+        next(records)
+
+        self.assertGreaterEqual(len(simulation.get_event_queue()), pending - 1)
+        self.assertTrue(simulation.get_event_queue())
+
+    def test_async_stream_yields_to_other_tasks(self) -> None:
+        async def consume() -> (list[LogRecord], int):
+            ticks = 0
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticker_task = asyncio.create_task(ticker())
+            records = [record async for record in aiter_records(build_simulation(self.scenario), yield_every=5)]
+            ticker_task.cancel()
+            return records, ticks
+
+        records, ticks = asyncio.run(consume())
+        self.assertEqual(records, list(iter_records(build_simulation(self.scenario))))
+        self.assertGreater(ticks, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from topology import Topology
+
+
+class TopologyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.topology = Topology()
+        self.topology.set_simulation_length(600)
+        for device_id in [3, 1, 2]:
+            self.topology.add_device(device_id)
+
+    def test_recipient_order_follows_rule_order(self) -> None:
+        self.topology.add_rule(1, 2, 750)
+        self.topology.add_rule(1, 3, 100)
+        self.topology.add_rule(1, 2, 5)
+
+        simulation_length, devices, _ = self.topology.build()
+        recipients = [(receiver.get_device_id(), delay) for receiver, delay in devices[1].get_recipients()]
+
+        self.assertEqual(simulation_length, 600)
+        self.assertEqual([device.get_device_id() for device in devices], [3, 1, 2])
+        self.assertEqual(recipients, [(2, 750), (3, 100), (2, 5)])
+        self.assertEqual(self.topology.get_problems(), [])
+
+    def test_rules_may_come_before_devices(self) -> None:
+        topology = Topology()
+        topology.add_rule(1, 2, 10)
+        topology.add_device(1)
+        topology.add_device(2)
+
+        _, devices, _ = topology.build()
+
+        self.assertEqual(devices[0].get_recipients(), [(devices[1], 10)])
+
+    def test_start_events_grouped_by_device_order(self) -> None:
+        self.topology.add_start_event(2, 'ALERT', 'First', 0)
+        self.topology.add_start_event(3, 'CANCELLATION', 'Second', 0)
+        self.topology.add_start_event(2, 'ALERT', 'Third', 0)
+
+        _, _, events = self.topology.build()
+
+        self.assertEqual([event.get_description() for event in events], ['Second', 'First', 'Third'])
+        self.assertEqual([event.get_receiver().get_device_id() for event in events], [3, 2, 2])
+
+    def test_unknown_devices_are_reported(self) -> None:
+        self.topology.add_rule(1, 9, 10)
+        self.topology.add_rule(8, 1, 10)
+        self.topology.add_start_event(7, 'CANCELLATION', 'Trouble', 0)
+        self.topology.add_device(3)
+
+        _, devices, events = self.topology.build()
+
+        self.assertEqual(devices[1].get_recipients(), [])
+        self.assertEqual(events, [])
+        self.assertEqual(self.topology.get_problems(), ['DUPLICATE DEVICE #3',
+                                                        'UNKNOWN DEVICE #9 IN PROPAGATE 1 9 10',
+                                                        'UNKNOWN DEVICE #8 IN PROPAGATE 8 1 10',
+                                                        'UNKNOWN DEVICE #7 IN CANCEL 7 Trouble 0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
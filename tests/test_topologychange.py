@@ -0,0 +1,60 @@
+import unittest
+import io
+from devicesimulationmain import run_simulation
+from logsink import MemorySink
+from scenarioreader import iter_scenario_records
+from topology import Topology
+
+
+class TopologyChangeTest(unittest.TestCase):
+    def _run(self, scenario: str) -> (list[str], list[str]):
+        topology = Topology()
+        for record in iter_scenario_records(io.StringIO(scenario)):
+            topology.add_record(record)
+        simulation_length, _, event_list = topology.build()
+        log_sink = MemorySink()
+        run_simulation(simulation_length, event_list, log_sink)
+        return log_sink.get_lines(), topology.get_problems()
+
+    def test_changes_apply_in_time_order(self) -> None:
+        lines, problems = self._run(
+            'LENGTH 800\nDEVICE 1\nDEVICE 2\nDEVICE 3\nPROPAGATE 1 2 100\nPROPAGATE 2 3 100\n'
+            'ALERT 1 A 0\n'
+            'DELAY 1 2 50 250\nALERT 1 B 300\n'
+            'UNLINK 2 3 400\n'
+            'ALERT 1 C 500\nLINK 1 3 10 500\n'
+            'DEVICE_DOWN 3 600\nALERT 1 D 600\n'
+            'DEVICE_UP 3 700\nALERT 1 E 700\n')
+
+        self.assertEqual(problems, [])
+        self.assertEqual(lines, [
+            '@0: #1 SENT ALERT TO #2: A',
+            '@100: #2 RECEIVED ALERT FROM #1: A',
+            '@100: #2 SENT ALERT TO #3: A',
+            '@200: #3 RECEIVED ALERT FROM #2: A',
+            '@300: #1 SENT ALERT TO #2: B',
+            '@350: #2 RECEIVED ALERT FROM #1: B',
+            '@350: #2 SENT ALERT TO #3: B',
+            '@450: #3 RECEIVED ALERT FROM #2: B',
+            '@500: #1 SENT ALERT TO #2: C',
+            '@500: #1 SENT ALERT TO #3: C',
+            '@510: #3 RECEIVED ALERT FROM #1: C',
+            '@550: #2 RECEIVED ALERT FROM #1: C',
+            '@600: #1 SENT ALERT TO #2: D',
+            '@600: #1 SENT ALERT TO #3: D',
+            '@650: #2 RECEIVED ALERT FROM #1: D',
+            '@700: #1 SENT ALERT TO #2: E',
+            '@700: #1 SENT ALERT TO #3: E',
+            '@710: #3 RECEIVED ALERT FROM #1: E',
+            '@750: #2 RECEIVED ALERT FROM #1: E',
+            '@800: END'])
+
+    def test_unknown_devices_are_problems(self) -> None:
+        _, problems = self._run('LENGTH 100\nDEVICE 1\nLINK 1 9 5 10\nDEVICE_DOWN 8 20\nUNLINK 7 1 30\n')
+
+        self.assertEqual(problems, ['UNKNOWN DEVICE #9 IN LINK 1 9 5 10', 'UNKNOWN DEVICE #8 IN DEVICE_DOWN 8 20',
+                                    'UNKNOWN DEVICE #7 IN UNLINK 7 1 30'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+from device import Device
+from event import Event, PHASE_SEND
+from logsink import LogSink
+from simulation import Simulation
+from scenarioreader import LengthRecord, DeviceRecord, PropagateRecord, AlertRecord, CancelRecord, ChangeRecord
+from topologychange import TopologyChange
+
+class Topology:
+    """Collects devices, propagation rules and start events, then builds the device graph in one linear pass"""
+    def __init__(self):
+        self._simulation_length = 0
+        self._device_ids = []
+        self._rules = []
+        self._start_events = []
+        self._changes = []
+        self._problems = []
+
+    def get_simulation_length(self) -> int:
+        """Gets simulation length"""
+        return self._simulation_length
+
+    def get_problems(self) -> list[str]:
+        """Gets the problems found while building, such as references to unknown devices"""
+        return self._problems
+
+    def set_simulation_length(self, simulation_length: int) -> None:
+        """Sets simulation length"""
+        self._simulation_length = simulation_length
+
+    def add_device(self, device_id: int) -> None:
+        """Adds a device id in declaration order"""
+        self._device_ids.append(device_id)
+
+    def add_rule(self, sender_id: int, receiver_id: int, delay: int) -> None:
+        """Adds a propagation rule from sender to receiver with the given delay"""
+        self._rules.append((sender_id, receiver_id, delay))
+
+    def add_start_event(self, device_id: int, event_type: str, description: str, time: int) -> None:
+        """Adds an ALERT or CANCELLATION that starts at the given device"""
+        #Interned so every event descending from this one shares a single copy of each string
+        self._start_events.append((device_id, sys.intern(event_type), sys.intern(description), time))
+
+    def add_change(self, change_type: str, device_id: int, receiver_id: int or None, delay: int or None,
+                   time: int) -> None:
+        """Adds a timed topology change, such as a LINK or a DEVICE_DOWN"""
+        self._changes.append((change_type, device_id, receiver_id, delay, time))
+
+    def add_record(self, record: tuple) -> None:
+        """Adds a record yielded by iter_scenario_records"""
+        if isinstance(record, PropagateRecord):
+            self.add_rule(record.sender_id, record.receiver_id, record.delay)
+        elif isinstance(record, AlertRecord):
+            self.add_start_event(record.device_id, 'ALERT', record.description, record.time)
+        elif isinstance(record, CancelRecord):
+            self.add_start_event(record.device_id, 'CANCELLATION', record.description, record.time)
+        elif isinstance(record, DeviceRecord):
+            self.add_device(record.device_id)
+        elif isinstance(record, LengthRecord):
+            self.set_simulation_length(record.simulation_length)
+        elif isinstance(record, ChangeRecord):
+            self.add_change(record.change_type, record.device_id, record.receiver_id, record.delay, record.time)
+
+    def build(self) -> (int, list[Device], list[Event]):
+        """Builds the devices and start events, followed by any topology changes, recording a problem for every
+        unknown device reference"""
+        simulation, event_list = self._build_simulation()
+        return self._simulation_length, simulation.get_devices(), event_list
+
+    def build_simulation(self, log_sink: LogSink = None) -> Simulation:
+        """Builds a Simulation holding the devices, with the start events already scheduled"""
+        simulation, event_list = self._build_simulation(log_sink)
+        for event in event_list:
+            simulation.schedule(event)
+        return simulation
+
+    def _build_simulation(self, log_sink: LogSink = None) -> (Simulation, list[Event]):
+        simulation = Simulation(self._simulation_length, log_sink)
+        devices_by_id = {}
+        for device_id in self._device_ids:
+            if device_id in devices_by_id:
+                self._problems.append(f'DUPLICATE DEVICE #{device_id}')
+            else:
+                devices_by_id[device_id] = Device(device_id, simulation)
+
+        for sender_id, receiver_id, delay in self._rules:
+            sender = devices_by_id.get(sender_id)
+            receiver = devices_by_id.get(receiver_id)
+            if sender is not None and receiver is not None:
+                sender.add_recipient(receiver, delay)
+            else:
+                unknown_id = sender_id if sender is None else receiver_id
+                self._problems.append(f'UNKNOWN DEVICE #{unknown_id} IN PROPAGATE {sender_id} {receiver_id} {delay}')
+
+        #Start events are grouped by device in declaration order, then kept in file order within a device
+        events_by_device_id = {device_id: [] for device_id in devices_by_id}
+        for device_id, event_type, description, time in self._start_events:
+            if device_id in events_by_device_id:
+                events_by_device_id[device_id].append(
+                    Event(None, devices_by_id[device_id], event_type, description, time, PHASE_SEND))
+            else:
+                keyword = 'ALERT' if event_type == 'ALERT' else 'CANCEL'
+                self._problems.append(f'UNKNOWN DEVICE #{device_id} IN {keyword} {device_id} {description} {time}')
+
+        event_list = [event for events in events_by_device_id.values() for event in events]
+
+        for change_type, device_id, receiver_id, delay, time in self._changes:
+            device = devices_by_id.get(device_id)
+            receiver = devices_by_id.get(receiver_id) if receiver_id is not None else None
+            if device is None or (receiver_id is not None and receiver is None):
+                unknown_id = device_id if device is None else receiver_id
+                arguments = [value for value in (device_id, receiver_id, delay, time) if value is not None]
+                self._problems.append(f'UNKNOWN DEVICE #{unknown_id} IN {change_type} ' +
+                                      ' '.join(str(argument) for argument in arguments))
+            else:
+                event_list.append(TopologyChange(change_type, device, receiver, delay, time))
+        return simulation, event_list
@@ -0,0 +1,59 @@
+"""Timed changes to the device graph, scheduled alongside alerts and cancellations.
+
+    LINK 1 2 50 300        at time 300, add an edge from device 1 to device 2 with delay 50
+    UNLINK 1 2 400         at time 400, remove every edge from device 1 to device 2
+    DELAY 1 2 20 500       at time 500, change the delay of the edges from device 1 to device 2 to 20
+    DEVICE_DOWN 3 600      at time 600, take device 3 offline
+    DEVICE_UP 3 700        at time 700, bring device 3 back online
+
+A change applies before any message due at the same time. Messages already in flight keep the delay they
+were sent with, and an offline device drops every message delivered to it without logging it.
+"""
+from device import Device
+from logsink import LogSink
+
+CHANGE_TYPES = ('LINK', 'UNLINK', 'DELAY', 'DEVICE_DOWN', 'DEVICE_UP')
+
+class TopologyChange:
+    __slots__ = ('_change_type', '_device', '_receiver', '_delay', '_time')
+
+    def __init__(self, change_type: str, device: Device, receiver: Device or None, delay: int or None, time: int):
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f'unknown topology change {change_type!r}')
+        self._change_type = change_type
+        self._device = device
+        self._receiver = receiver
+        self._delay = delay
+        self._time = time
+
+    def get_event_type(self) -> str:
+        """Gets the change type, one of CHANGE_TYPES"""
+        return self._change_type
+
+    def get_device(self) -> Device:
+        """Gets the device the change applies to: the sender of an edge, or the device going down or up"""
+        return self._device
+
+    def get_receiver(self) -> Device or None:
+        """Gets the receiving device of the edge, or None for DEVICE_DOWN and DEVICE_UP"""
+        return self._receiver
+
+    def get_delay(self) -> int or None:
+        """Gets the delay for LINK and DELAY, or None"""
+        return self._delay
+
+    def get_time(self) -> int:
+        """Gets time"""
+        return self._time
+
+    def execute(self, event_queue: list = None, log_sink: LogSink = None) -> None:
+        """Applies the change to the device graph; it queues nothing and writes no log line"""
+        change_type = self._change_type
+        if change_type == 'LINK':
+            self._device.add_recipient(self._receiver, self._delay)
+        elif change_type == 'UNLINK':
+            self._device.remove_recipient(self._receiver)
+        elif change_type == 'DELAY':
+            self._device.set_recipient_delay(self._receiver, self._delay)
+        else:
+            self._device.set_online(change_type == 'DEVICE_UP')